@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import User, Auction, Bid, CurrencyRate, UserNotification
+from .models import User, Auction, Bid, ProxyBid, CurrencyRate, ScrapPrice, UserNotification
 
 # تنظیمات کلی admin
 admin.site.site_header = "پنل مدیریت پلتفرم مزایده و مناقصه"
@@ -64,6 +64,13 @@ class BidAdmin(admin.ModelAdmin):
         return obj.auction.status
     auction_status.short_description = 'وضعیت مزایده'
 
+@admin.register(ProxyBid)
+class ProxyBidAdmin(admin.ModelAdmin):
+    list_display = ('auction', 'bidder', 'max_amount', 'created_at', 'updated_at')
+    search_fields = ('auction__title', 'bidder__username', 'bidder__email')
+    ordering = ('-updated_at',)
+    readonly_fields = ('created_at', 'updated_at')
+
 @admin.register(CurrencyRate)
 class CurrencyRateAdmin(admin.ModelAdmin):
     list_display = ('name', 'code', 'rate', 'change', 'last_updated')
@@ -79,6 +86,14 @@ class CurrencyRateAdmin(admin.ModelAdmin):
     
     readonly_fields = ('last_updated',)
 
+@admin.register(ScrapPrice)
+class ScrapPriceAdmin(admin.ModelAdmin):
+    list_display = ('name', 'board', 'retail', 'wholesale', 'position', 'updated_at')
+    list_filter = ('board',)
+    search_fields = ('name',)
+    ordering = ('board', 'position')
+    list_editable = ('retail', 'wholesale', 'position')
+
 @admin.register(UserNotification)
 class UserNotificationAdmin(admin.ModelAdmin):
     list_display = ('user', 'type', 'message_preview', 'read', 'created_at')
@@ -0,0 +1,273 @@
+import heapq
+from decimal import Decimal
+from typing import Any, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from rest_framework import status
+
+from . import caching, notifications, participation, rollups
+from .events import bid_events, notification_event, publish_many
+from .models import Auction, Bid, ProxyBid
+
+
+class BidRejected(Exception):
+    """پیشنهاد توسط موتور مزایده پذیرفته نشد"""
+
+    def __init__(self, code: str, message: str, http_status: int,
+                 current_price: Optional[Decimal] = None) -> None:
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.http_status = http_status
+        self.current_price = current_price
+
+    def as_response_data(self) -> dict:
+        data: dict = {'error': self.message, 'code': self.code}
+        if self.current_price is not None:
+            data['current_price'] = str(self.current_price)
+        return data
+
+
+def bid_increment() -> Decimal:
+    return Decimal(str(getattr(settings, 'BID_INCREMENT', 1)))
+
+
+def _check_open(row, amount: Optional[Decimal], now, bidder_id: Any = None) -> Optional[BidRejected]:
+    """اگر مزایده پیشنهاد را نپذیرد علت آن را برمی‌گرداند"""
+    if row is None:
+        return BidRejected('not_found', 'مزایده یافت نشد', status.HTTP_404_NOT_FOUND)
+    if bidder_id is not None and row['creator_id'] == bidder_id:
+        return BidRejected('own_auction', 'You cannot bid on your own auction', status.HTTP_403_FORBIDDEN)
+    if row['status'] != 'active' or row['end_date'] <= now:
+        return BidRejected('not_active', 'This auction is not active', status.HTTP_400_BAD_REQUEST)
+    if amount is not None and amount <= row['current_price']:
+        return BidRejected(
+            'outbid',
+            'Bid amount must be higher than current price',
+            status.HTTP_409_CONFLICT,
+            current_price=row['current_price'],
+        )
+    return None
+
+
+def _rejection(auction_id: Any, bidder_id: Any, amount: Decimal, now) -> BidRejected:
+    """علت رد شدن به‌روزرسانی شرطی را مشخص می‌کند"""
+    row = Auction.objects.filter(pk=auction_id).values(  # type: ignore
+        'status', 'end_date', 'current_price', 'creator_id'
+    ).first()
+    rejected = _check_open(row, amount, now, bidder_id)
+    if rejected is None:
+        # قیمت بین به‌روزرسانی و خواندن دوباره تغییر کرده است
+        rejected = BidRejected(
+            'outbid', 'Bid amount must be higher than current price',
+            status.HTTP_409_CONFLICT, current_price=row['current_price'],
+        )
+    return rejected
+
+
+def _lock_auction(auction_id: Any):
+    # UPDATE بدون تغییر، قفل نوشتن را پیش از هر خواندنی می‌گیرد: روی PostgreSQL قفل ردیف
+    # مزایده و روی SQLite قفل پایگاه داده (مانند BEGIN IMMEDIATE، فقط برای همین تراکنش)
+    Auction.objects.filter(pk=auction_id).update(current_price=F('current_price'))  # type: ignore
+    return Auction.objects.filter(pk=auction_id).values(  # type: ignore
+        'id', 'status', 'end_date', 'current_price', 'title', 'creator_id', 'condition', 'category'
+    ).first()
+
+
+def _leader(auction_id: Any) -> Optional[int]:
+    return Bid.objects.filter(auction_id=auction_id).order_by(  # type: ignore
+        '-amount', 'created_at'
+    ).values_list('bidder_id', flat=True).first()
+
+
+def _proxy_max(auction_id: Any, bidder_id: Any) -> Optional[Decimal]:
+    return ProxyBid.objects.filter(  # type: ignore
+        auction_id=auction_id, bidder_id=bidder_id
+    ).values_list('max_amount', flat=True).first()
+
+
+def _contenders(auction_id: Any, floor: Decimal, exclude_bidder: Any) -> List[Tuple[Decimal, Any, int]]:
+    """سقف‌های برابر یا بالاتر از floor؛ ترتیب (سقف نزولی، ثبت صعودی) همان ترتیب برنده شدن است"""
+    return list(
+        ProxyBid.objects.filter(  # type: ignore
+            auction_id=auction_id, max_amount__gte=floor
+        ).exclude(bidder_id=exclude_bidder).order_by(
+            '-max_amount', 'created_at', 'id'
+        ).values_list('max_amount', 'created_at', 'bidder_id')
+    )
+
+
+def _own_contender(auction_id: Any, bidder_id: Any, amount: Decimal, now) -> Tuple[Decimal, Any, int]:
+    """پیشنهاددهنده به عنوان یکی از رقبا: سقف خودش (اگر از مبلغ بیشتر باشد) یا همین پیشنهاد"""
+    proxy = ProxyBid.objects.filter(  # type: ignore
+        auction_id=auction_id, bidder_id=bidder_id, max_amount__gte=amount
+    ).values_list('max_amount', 'created_at').first()
+    if proxy is None:
+        return amount, now, bidder_id
+    return proxy[0], proxy[1], bidder_id
+
+
+def resolve_proxies(price: Decimal, leader_id: Optional[int], leader_max: Decimal,
+                    contenders: List[Tuple[Decimal, Any, int]],
+                    increment: Decimal) -> Tuple[List[Tuple[int, Decimal]], Optional[int], Decimal]:
+    """
+    رقابت سقف‌های پنهان را در یک مرحله حل می‌کند.
+
+    contenders فهرست (max_amount, created_at, bidder_id) سقف‌های رقیب است و در یک
+    max-heap قرار می‌گیرد. برنده با کمترین مبلغ لازم (یک گام بالاتر از نفر دوم،
+    حداکثر تا سقف خودش) پیشتاز می‌شود. در تساوی سقف‌ها، دارنده فعلی قیمت و سپس
+    سقف قدیمی‌تر برنده است.
+
+    خروجی: پیشنهادهای قابل مشاهده (bidder_id, amount) به ترتیب صعودی، پیشتاز و قیمت جدید.
+    """
+    heap = [(-max_amount, created_at, bidder_id) for max_amount, created_at, bidder_id in contenders]
+    if not heap:
+        return [], leader_id, price
+    heapq.heapify(heap)
+    negative_max, _, top_bidder = heapq.heappop(heap)
+    top_max = -negative_max
+
+    if leader_id is not None and leader_max >= top_max:
+        new_price = min(leader_max, top_max + increment)
+        rows = [(top_bidder, top_max)] if top_max < new_price else []
+        rows.append((leader_id, new_price))
+        return rows, leader_id, new_price
+
+    runner_up, runner_up_max = leader_id, (leader_max if leader_id is not None else price)
+    if heap and -heap[0][0] > runner_up_max:
+        runner_up, runner_up_max = heap[0][2], -heap[0][0]
+    new_price = min(top_max, runner_up_max + increment)
+    rows = []
+    if runner_up is not None and price < runner_up_max < new_price:
+        rows.append((runner_up, runner_up_max))
+    rows.append((top_bidder, new_price))
+    return rows, top_bidder, new_price
+
+
+def _record(auction, rows: List[Tuple[int, Decimal]], new_price: Decimal, previous_leader: Optional[int],
+            new_leader: Optional[int], manual: Optional[Bid] = None) -> List[Bid]:
+    """نوشتن پیشنهادهای قابل مشاهده، اعلان‌ها و رویدادهای زنده"""
+    bids = Bid.objects.bulk_create([  # type: ignore
+        Bid(auction_id=auction['id'], bidder_id=bidder_id, amount=amount) for bidder_id, amount in rows
+    ])
+    all_bids = ([manual] if manual else []) + bids
+
+    outbid = {bid.bidder_id for bid in all_bids}
+    if previous_leader is not None:
+        outbid.add(previous_leader)
+    outbid.discard(new_leader)
+
+    # ایجاد اعلان برای سازنده مزایده و کاربرانی که پیشنهادشان رد شد؛
+    # رویدادهای پیاپی همان مزایده در یک اعلان خلاصه تجمیع می‌شوند
+    new_notifications = notifications.create_for_auction(auction, new_price, [
+        (auction['creator_id'], 'new_bid', f'New bid of {new_price} on your auction {auction["title"]}'),
+    ] + [
+        (user_id, 'outbid', f'پیشنهاد بالاتری ({new_price}) برای مزایده "{auction["title"]}" ثبت شد')
+        for user_id in sorted(outbid)
+    ])
+    rollups.record_bids(auction, len(all_bids))
+    participation.record_bids(auction, all_bids)
+    # قیمت با UPDATE و پیشنهادها با bulk_create نوشته می‌شوند؛ سیگنال ثبت پیشنهاد دستی هم
+    # نسخه را بالا نمی‌برد، پس نسخه برای هر پیشنهاد یک بار و بیرون از قفل مزایده بالا می‌رود
+    caching.invalidate_on_commit(caching.AUCTIONS)
+    publish_many(
+        bid_events(all_bids, auction['id'], new_price)
+        + [notification_event(notification) for notification in new_notifications]
+    )
+    return all_bids
+
+
+def place_bid(auction_id: Any, bidder, amount: Decimal) -> Bid:
+    """
+    ثبت پیشنهاد با یک به‌روزرسانی شرطی و اتمیک روی قیمت فعلی.
+
+    قیمت فقط وقتی تغییر می‌کند که مزایده فعال باشد و مبلغ از قیمت ذخیره‌شده
+    بیشتر باشد؛ در غیر این صورت BidRejected برگردانده می‌شود. اگر سقف پنهان
+    برابر یا بالاتری از کاربر دیگری ثبت شده باشد، پاسخ خودکار آن در همین تراکنش
+    ثبت می‌شود. اگر سقف قدیمی‌تری دقیقاً برابر مبلغ باشد، آن سقف با همین مبلغ
+    پیشتاز می‌شود و پیشنهاد با کد outbid رد می‌شود.
+    """
+    now = timezone.now()
+    rejected = None
+    with transaction.atomic():
+        # UPDATE شرطی اولین دستور تراکنش است و قفل نوشتن (ردیف مزایده در PostgreSQL،
+        # پایگاه داده در SQLite) را تا پایان آن نگه می‌دارد؛ سقف‌ها پس از آن خوانده
+        # می‌شوند تا سقف ثبت‌شده هم‌زمان از دست نرود
+        updated = Auction.objects.filter(  # type: ignore
+            pk=auction_id,
+            status='active',
+            end_date__gt=now,
+            current_price__lt=amount,
+        ).exclude(creator_id=bidder.pk).update(current_price=amount, updated_at=now)
+        if not updated:
+            raise _rejection(auction_id, bidder.pk, amount, now)
+        auction = Auction.objects.filter(pk=auction_id).values(  # type: ignore
+            'id', 'title', 'creator_id', 'condition', 'category'
+        ).get()
+
+        contenders = _contenders(auction_id, amount, bidder.pk)
+        if not contenders:
+            bid = Bid.objects.create(auction_id=auction_id, bidder=bidder, amount=amount)  # type: ignore
+            _record(auction, [], amount, None, bidder.pk, manual=bid)
+            return bid
+
+        previous_leader = _leader(auction_id)
+        contenders.append(_own_contender(auction_id, bidder.pk, amount, now))
+        rows, new_leader, new_price = resolve_proxies(amount, None, amount, contenders, bid_increment())
+        # ردیف هم‌مبلغ خود پیشنهاددهنده همان پیشنهاد دستی است
+        rows = [row for row in rows if row != (bidder.pk, amount)]
+        if new_leader != bidder.pk and new_price == amount:
+            # سقف قدیمی‌تر برابر مبلغ: پیشنهاد هم‌مبلغ ثبت نمی‌شود
+            bid = None
+            rejected = BidRejected(
+                'outbid', 'Bid amount must be higher than current price',
+                status.HTTP_409_CONFLICT, current_price=new_price,
+            )
+        else:
+            bid = Bid.objects.create(auction_id=auction_id, bidder=bidder, amount=amount)  # type: ignore
+        Auction.objects.filter(pk=auction_id).update(current_price=new_price, updated_at=now)  # type: ignore
+        _record(auction, rows, new_price, previous_leader, new_leader, manual=bid)
+    if rejected:
+        raise rejected
+    return bid
+
+
+def register_proxy_bid(auction_id: Any, bidder, max_amount: Decimal) -> Tuple[ProxyBid, Decimal, bool]:
+    """
+    ثبت یا افزایش سقف پنهان یک کاربر و حل رقابت آن با سقف‌های دیگر.
+
+    فقط پیشنهادهای حاصل (حداکثر دو ردیف Bid) و یک به‌روزرسانی current_price
+    نوشته می‌شود. خروجی: سقف ثبت‌شده، قیمت فعلی و پیشتاز بودن این کاربر.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        auction = _lock_auction(auction_id)
+        leader_id = _leader(auction_id) if auction else None
+        is_leader = leader_id is not None and leader_id == bidder.pk
+
+        # پیشتاز فعلی فقط سقف خود را تغییر می‌دهد؛ سقف او نباید از قیمت فعلی کمتر باشد
+        rejected = _check_open(auction, None if is_leader else max_amount, now, bidder.pk)
+        if rejected is None and is_leader and max_amount < auction['current_price']:
+            rejected = _check_open(auction, max_amount, now)
+        if rejected:
+            raise rejected
+
+        proxy, _ = ProxyBid.objects.update_or_create(  # type: ignore
+            auction_id=auction_id, bidder=bidder, defaults={'max_amount': max_amount}
+        )
+        price = auction['current_price']
+        if is_leader:
+            return proxy, price, True
+
+        leader_max = price
+        if leader_id is not None:
+            leader_max = max(price, _proxy_max(auction_id, leader_id) or price)
+        contenders = _contenders(auction_id, price, leader_id)
+        rows, new_leader, new_price = resolve_proxies(price, leader_id, leader_max, contenders, bid_increment())
+        if rows:
+            Auction.objects.filter(pk=auction_id).update(current_price=new_price, updated_at=now)  # type: ignore
+            _record(auction, rows, new_price, leader_id, new_leader)
+    return proxy, new_price, new_leader == bidder.pk
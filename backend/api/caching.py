@@ -0,0 +1,227 @@
+import hashlib
+import time
+from typing import Any, Callable, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import CacheVersion
+
+# فضای نام کش هر گروه endpoint؛ نوشتن روی مدل‌های مرتبط نسخه آن را بالا می‌برد
+AUCTIONS = 'auctions'
+CURRENCIES = 'currencies'
+PRICE_BOARD = 'price_board'
+
+_PREFIX = 'respcache'
+# زمان انتظار درخواست‌های هم‌زمان برای پر شدن کلید خالی توسط درخواست دیگر
+_LOCK_TIMEOUT = 10
+_WAIT_TIMEOUT = 2.0
+_WAIT_STEP = 0.05
+
+
+def stamp(namespace: str) -> Tuple[int, Optional[int]]:
+    """
+    نسخه و زمان آخرین تغییر (ثانیه یونیکس) یک فضای نام با یک کوئری روی کلید اصلی.
+
+    نسخه در پایگاه داده است نه در کش، چون کش پیش‌فرض (LocMemCache) برای هر پروسه
+    جداست و نوشتن زمان‌بند یا ingest در پروسه دیگر به پروسه‌های وب نمی‌رسید.
+    فضای نامی که هنوز نوشته نشده نسخه 0 و زمان تغییر نامعلوم دارد.
+    """
+    row = CacheVersion.objects.filter(namespace=namespace).values_list('version', 'modified').first()  # type: ignore
+    if row is None:
+        return 0, None
+    return row[0], int(row[1].timestamp())
+
+
+def version(namespace: str) -> int:
+    return stamp(namespace)[0]
+
+
+def _request_stamp(namespace: str, request) -> Tuple[int, Optional[int]]:
+    # اعتبارسنج‌ها و کش پاسخ یک درخواست نسخه را یک بار می‌خوانند
+    stamps = request.__dict__.setdefault('_cache_stamps', {})
+    if namespace not in stamps:
+        stamps[namespace] = stamp(namespace)
+    return stamps[namespace]
+
+
+def _bump(namespace: str) -> None:
+    now = timezone.now()
+
+    def update() -> int:
+        return CacheVersion.objects.filter(namespace=namespace).update(  # type: ignore
+            version=F('version') + 1, modified=now
+        )
+
+    # همان الگوی rollups.apply؛ نسخه اولیه از زمان فعلی تا ETag های یک پایگاه داده
+    # بازسازی‌شده با ETag های قبلی یکسان نشوند
+    if not update():
+        CacheVersion.objects.bulk_create(  # type: ignore
+            [CacheVersion(namespace=namespace, version=time.time_ns(), modified=now)], ignore_conflicts=True
+        )
+        update()
+
+
+def invalidate(*namespaces: str) -> None:
+    """
+    بی‌اعتبار کردن کش در تراکنش جاری؛ نسخه جدید همراه با خود داده commit می‌شود
+    و پیش از commit برای درخواست‌های دیگر دیده نمی‌شود.
+    """
+    with transaction.atomic():
+        for namespace in namespaces:
+            _bump(namespace)
+
+
+def invalidate_on_commit(*namespaces: str) -> None:
+    """
+    بی‌اعتبار کردن کش پس از commit تراکنش جاری.
+
+    برای نوشتن‌های پرتکرار مانند ثبت پیشنهاد: ردیف نسخه بین همه مزایده‌ها مشترک است
+    و به‌روزرسانی آن درون تراکنش قفل‌دار، همه پیشنهادها را پشت یک ردیف صف می‌کرد.
+    تا اجرای callback درخواست‌ها ممکن است پاسخ کش‌شده قبلی را ببینند.
+    """
+    transaction.on_commit(lambda: invalidate(*namespaces))
+
+
+def _entry_key(namespace: str, request) -> str:
+    # آدرس کامل (میزبان و پارامترها) چون لینک‌های صفحه‌بندی در پاسخ وجود دارند
+    digest = hashlib.sha1(request.build_absolute_uri().encode('utf-8')).hexdigest()
+    return f'{_PREFIX}:{namespace}:{digest}'
+
+
+def _store(key: str, current_version: int, data: Any) -> None:
+    fresh = settings.RESPONSE_CACHE_TTL
+    entry = {'version': current_version, 'fresh_until': time.time() + fresh, 'data': data}
+    cache.set(key, entry, timeout=fresh + settings.RESPONSE_CACHE_STALE_TTL)
+
+
+def _is_fresh(entry, current_version: int) -> bool:
+    return entry['version'] == current_version and entry['fresh_until'] > time.time()
+
+
+def cached(namespace: str, request, compute: Callable[[], Any]) -> Tuple[Any, bool]:
+    """
+    خواندن از کش با بازسازی تنها توسط یک درخواست (جلوگیری از thundering herd).
+
+    ورودی تازه مستقیم برگردانده می‌شود. اگر ورودی کهنه یا متعلق به نسخه قبلی
+    باشد، فقط درخواستی که قفل را بگیرد داده را دوباره می‌سازد و بقیه نسخه کهنه را
+    دریافت می‌کنند (stale-while-revalidate). اگر هیچ ورودی‌ای وجود نداشته باشد،
+    بقیه درخواست‌ها مدت کوتاهی منتظر پر شدن کلید می‌مانند.
+
+    خروجی: (داده، آیا داده متعلق به نسخه فعلی است)
+    """
+    key = _entry_key(namespace, request)
+    lock_key = f'{key}:lock'
+    current_version = _request_stamp(namespace, request)[0]
+    entry = cache.get(key)
+    if entry is not None and _is_fresh(entry, current_version):
+        return entry['data'], True
+
+    if cache.add(lock_key, 1, timeout=_LOCK_TIMEOUT):
+        try:
+            data = compute()
+            _store(key, current_version, data)
+            return data, True
+        finally:
+            cache.delete(lock_key)
+
+    if entry is not None:
+        return entry['data'], entry['version'] == current_version
+
+    deadline = time.monotonic() + _WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(_WAIT_STEP)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry['data'], entry['version'] == current_version
+    return compute(), True
+
+
+def make_etag(token: Any, request) -> str:
+    """ETag قوی از نسخه داده، آدرس کامل درخواست و فرمت خروجی"""
+    renderer = getattr(request, 'accepted_renderer', None)
+    source = f'{token}|{request.build_absolute_uri()}|{getattr(renderer, "format", "")}'
+    return quote_etag(hashlib.sha1(source.encode('utf-8')).hexdigest())
+
+
+def is_not_modified(request, etag: str, last_modified: Optional[int]) -> bool:
+    # طبق RFC 9110 در صورت وجود If-None-Match، سرآیند If-Modified-Since نادیده گرفته می‌شود
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        tags = parse_etags(if_none_match)
+        return '*' in tags or etag in tags or f'W/{etag}' in tags
+    if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+    return bool(last_modified and if_modified_since and last_modified <= if_modified_since)
+
+
+def _set_validators(response, etag: str, last_modified: Optional[int]) -> None:
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified)
+    # پاسخ‌ها همیشه باید با سرور اعتبارسنجی شوند
+    response['Cache-Control'] = 'no-cache'
+
+
+def conditional_response(request, validators: Tuple[Any, Optional[int]], respond: Callable[[], Any]):
+    """
+    پاسخ 304 در صورت تطابق اعتبارسنج‌ها (نسخه، زمان آخرین تغییر)؛ در غیر این
+    صورت پاسخ respond() همراه با ETag و Last-Modified.
+    """
+    token, last_modified = validators
+    etag = make_etag(token, request)
+    if is_not_modified(request, etag, last_modified):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = respond()
+    if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED) and \
+            not getattr(response, 'stale', False):
+        _set_validators(response, etag, last_modified)
+    return response
+
+
+class ConditionalListMixin:
+    """
+    پشتیبانی از GET شرطی (ETag / Last-Modified) برای list.
+
+    اعتبارسنج‌ها پیش از اجرای کوئری‌ست و سریالایزر محاسبه می‌شوند و در صورت
+    تطابق پاسخ 304 بدون بدنه برگردانده می‌شود.
+    """
+    cache_namespace = ''
+    # پارامترهایی که نتیجه را به زمان فعلی وابسته می‌کنند؛ برای آن‌ها اعتبارسنج ارسال نمی‌شود
+    time_dependent_params: Tuple[str, ...] = ()
+
+    def list_validators(self, request) -> Optional[Tuple[Any, Optional[int]]]:
+        """(نسخه، زمان آخرین تغییر) یا None برای غیرفعال کردن GET شرطی"""
+        if any(param in request.query_params for param in self.time_dependent_params):
+            return None
+        return _request_stamp(self.cache_namespace, request)
+
+    def list(self, request, *args, **kwargs):
+        validators = self.list_validators(request)
+        if validators is None:
+            return super().list(request, *args, **kwargs)
+        return conditional_response(request, validators, lambda: super(ConditionalListMixin, self).list(
+            request, *args, **kwargs
+        ))
+
+
+class CachedListMixin:
+    """کش پاسخ list برای درخواست‌های ناشناس؛ cache_namespace در view تعیین می‌شود"""
+    cache_namespace = ''
+
+    def list(self, request, *args, **kwargs):
+        if request.user and request.user.is_authenticated:
+            return super().list(request, *args, **kwargs)
+        data, current = cached(self.cache_namespace, request, lambda: super(CachedListMixin, self).list(
+            request, *args, **kwargs
+        ).data)
+        response = Response(data)
+        # پاسخ کهنه نباید با ETag نسخه فعلی ارسال شود
+        response.stale = not current
+        return response
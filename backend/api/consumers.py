@@ -0,0 +1,100 @@
+import re
+
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from django.conf import settings
+
+from .events import CATALOG_STREAM, event_message, user_stream
+from .models import Auction, LiveEvent
+from .permissions import visible_auctions
+
+AUCTION_STREAM_RE = re.compile(r'^auction\.(\d+)$')
+
+
+class LiveEventConsumer(AsyncJsonWebsocketConsumer):
+    """
+    کانال زنده پیشنهادها، تغییر قیمت، وضعیت مزایده‌ها و اعلان‌ها.
+
+    کلاینت با پیام {"action": "subscribe", "stream": "auction.12", "last_event_id": 40}
+    مشترک می‌شود و رویدادهای از دست رفته پس از last_event_id دوباره ارسال می‌شوند.
+    """
+
+    async def connect(self):
+        self.streams = set()
+        await self.accept()
+
+    async def disconnect(self, code):
+        for stream in self.streams:
+            await self.channel_layer.group_discard(stream, self.channel_name)
+
+    async def receive_json(self, content, **kwargs):
+        action = content.get('action')
+        stream = content.get('stream')
+
+        if not await self._can_subscribe(stream):
+            await self.send_json({'type': 'error', 'stream': stream, 'detail': 'استریم نامعتبر است'})
+            return
+
+        if action == 'subscribe':
+            await self.channel_layer.group_add(stream, self.channel_name)
+            self.streams.add(stream)
+            last_event_id = content.get('last_event_id')
+            if last_event_id is not None:
+                await self._replay(stream, last_event_id)
+            await self.send_json({'type': 'subscribed', 'stream': stream})
+        elif action == 'unsubscribe':
+            await self.channel_layer.group_discard(stream, self.channel_name)
+            self.streams.discard(stream)
+            await self.send_json({'type': 'unsubscribed', 'stream': stream})
+        else:
+            await self.send_json({'type': 'error', 'detail': 'عملیات نامعتبر است'})
+
+    async def live_event(self, event):
+        await self.send_json(self._client_message(event))
+
+    async def _can_subscribe(self, stream):
+        if not isinstance(stream, str):
+            return False
+        if stream == CATALOG_STREAM:
+            return True
+        user = self.scope.get('user')
+        match = AUCTION_STREAM_RE.match(stream)
+        if match:
+            # همان قاعده نمایش endpoint جزئیات مزایده
+            return await self._can_view_auction(user, int(match.group(1)))
+        return bool(user and user.is_authenticated and stream == user_stream(user.pk))
+
+    @database_sync_to_async
+    def _can_view_auction(self, user, auction_id):
+        return visible_auctions(Auction.objects.filter(pk=auction_id), user).exists()  # type: ignore
+
+    async def _replay(self, stream, last_event_id):
+        try:
+            last_event_id = int(last_event_id)
+        except (TypeError, ValueError):
+            await self.send_json({'type': 'error', 'stream': stream, 'detail': 'last_event_id نامعتبر است'})
+            return
+
+        missed = await self._missed_events(stream, last_event_id)
+        if missed is None:
+            # فاصله بیش از حد مجاز است؛ کلاینت باید داده را دوباره از API بخواند
+            await self.send_json({'type': 'resync', 'stream': stream})
+            return
+        for event in missed:
+            await self.send_json(event)
+
+    @database_sync_to_async
+    def _missed_events(self, stream, last_event_id):
+        limit = getattr(settings, 'LIVE_EVENT_REPLAY_LIMIT', 500)
+        events = list(
+            LiveEvent.objects.filter(stream=stream, id__gt=last_event_id).order_by('id')[:limit + 1]  # type: ignore
+        )
+        if len(events) > limit:
+            return None
+        return [self._client_message(event_message(event)) for event in events]
+
+    @staticmethod
+    def _client_message(event):
+        message = dict(event)
+        message['type'] = 'event'
+        return message
@@ -0,0 +1,111 @@
+from typing import Any, Dict, Iterable, List
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+
+from .models import LiveEvent
+
+# نام استریم‌ها: کاتالوگ عمومی، هر مزایده و هر کاربر
+CATALOG_STREAM = 'auctions'
+
+
+def auction_stream(auction_id: Any) -> str:
+    return f'auction.{auction_id}'
+
+
+def user_stream(user_id: Any) -> str:
+    return f'user.{user_id}'
+
+
+def event_message(event: LiveEvent) -> Dict[str, Any]:
+    return {
+        'type': 'live.event',
+        'id': event.pk,
+        'stream': event.stream,
+        'event': event.type,
+        'payload': event.payload,
+        'created_at': event.created_at.isoformat(),
+    }
+
+
+def _broadcast(events: List[LiveEvent]) -> None:
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+
+    async def send_all():
+        for event in events:
+            await channel_layer.group_send(event.stream, event_message(event))
+
+    # یک بار گذر به حلقه async برای کل دسته رویدادها
+    async_to_sync(send_all)()
+
+
+def publish_many(events: Iterable[LiveEvent]) -> None:
+    """
+    ذخیره رویدادها در جدول LiveEvent و ارسال آن‌ها پس از commit تراکنش.
+
+    ذخیره در پایگاه داده امکان ادامه از آخرین شناسه را برای کلاینت‌هایی که
+    قطع و وصل شده‌اند فراهم می‌کند.
+    """
+    saved = LiveEvent.objects.bulk_create(list(events))  # type: ignore
+    if saved:
+        transaction.on_commit(lambda: _broadcast(saved), robust=True)
+
+
+def publish(stream: str, event_type: str, payload: Dict[str, Any]) -> None:
+    publish_many([LiveEvent(stream=stream, type=event_type, payload=payload)])
+
+
+def bid_events(bids: Iterable[Any], auction_id: Any, current_price) -> List[LiveEvent]:
+    events = [
+        LiveEvent(stream=auction_stream(auction_id), type='bid', payload={
+            'auction': auction_id,
+            'bid': bid.pk,
+            'bidder': bid.bidder_id,
+            'amount': str(bid.amount),
+            'current_price': str(current_price),
+            'created_at': bid.created_at.isoformat(),
+        })
+        for bid in bids
+    ]
+    events.append(LiveEvent(stream=CATALOG_STREAM, type='price', payload={
+        'auction': auction_id, 'current_price': str(current_price),
+    }))
+    return events
+
+
+def publish_bids(bids: Iterable[Any], auction_id: Any, current_price) -> None:
+    publish_many(bid_events(bids, auction_id, current_price))
+
+
+def publish_status_changes(auction_ids: Iterable[Any], new_status: str) -> None:
+    events = []
+    for auction_id in auction_ids:
+        payload = {'auction': auction_id, 'status': new_status}
+        events.append(LiveEvent(stream=auction_stream(auction_id), type='status', payload=payload))
+        events.append(LiveEvent(stream=CATALOG_STREAM, type='status', payload=payload))
+    publish_many(events)
+
+
+def notification_event(notification) -> LiveEvent:
+    return LiveEvent(stream=user_stream(notification.user_id), type='notification', payload={
+        'id': notification.pk,
+        'type': notification.type,
+        'message': notification.message,
+        'read': notification.read,
+        'auction': notification.auction_id,
+        'count': notification.count,
+        'created_at': notification.created_at.isoformat(),
+        'last_event_at': notification.last_event_at.isoformat() if notification.last_event_at else None,
+    })
+
+
+def publish_notification(notification) -> None:
+    publish_many([notification_event(notification)])
+
+
+def publish_notifications(notifications: Iterable[Any]) -> None:
+    """برای اعلان‌هایی که با bulk_create ساخته شده‌اند و سیگنال post_save ندارند"""
+    publish_many(notification_event(notification) for notification in notifications)
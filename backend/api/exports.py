@@ -0,0 +1,154 @@
+import csv
+import io
+import zlib
+from typing import Any, Dict, Iterable, Iterator, List
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from rest_framework import serializers
+
+from .fastjson import (
+    AuctionRowSerializer, BidRowSerializer, CurrencyRateRowSerializer, UserNotificationRowSerializer, dumps
+)
+from .models import Auction, Bid, CurrencyRate, User, UserNotification
+from .serializers import (
+    AuctionSerializer, BidSerializer, CurrencyRateSerializer, UserNotificationSerializer, UserSerializer
+)
+
+# نوع مدل → (کوئری‌ست، سریالایزر DRF، سریالایزر سریع روی ()values یا None)
+EXPORTS = {
+    'users': (lambda: User.objects.all(), UserSerializer, None),
+    'auctions': (lambda: Auction.objects.all(), AuctionSerializer, AuctionRowSerializer),  # type: ignore
+    'bids': (lambda: Bid.objects.all(), BidSerializer, BidRowSerializer),  # type: ignore
+    'notifications': (lambda: UserNotification.objects.all(),  # type: ignore
+                      UserNotificationSerializer, UserNotificationRowSerializer),
+    'currencies': (lambda: CurrencyRate.objects.all(),  # type: ignore
+                   CurrencyRateSerializer, CurrencyRateRowSerializer),
+}
+
+FORMATS = {
+    'json': 'application/json',
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+def iter_chunks(queryset, chunk_size: int) -> Iterator[List[Any]]:
+    """
+    خواندن کوئری‌ست در دسته‌های chunk_size تایی با صفحه‌بندی keyset روی pk.
+
+    هر دسته یک کوئری کوتاه جداگانه است، بنابراین هیچ cursor بازی در طول
+    ارسال پاسخ (که ممکن است کند باشد) نگه داشته نمی‌شود.
+    """
+    queryset = queryset.order_by('pk')
+    last_pk = None
+    while True:
+        page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        chunk = list(page[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        if len(chunk) < chunk_size:
+            return
+        last = chunk[-1]
+        last_pk = last['id'] if isinstance(last, dict) else last.pk
+
+
+def csv_columns(serializer_class) -> List[str]:
+    """ستون‌های CSV؛ سریالایزرهای تو در تو به صورت creator.username باز می‌شوند"""
+    columns = []
+    for name, field in serializer_class().fields.items():
+        if isinstance(field, serializers.BaseSerializer) and hasattr(field, 'fields'):
+            columns += [f'{name}.{child}' for child in field.fields]
+        else:
+            columns.append(name)
+    return columns
+
+
+def flatten(row: Dict[str, Any]) -> Dict[str, Any]:
+    flat = {}
+    for key, value in row.items():
+        if isinstance(value, dict):
+            for child, child_value in value.items():
+                flat[f'{key}.{child}'] = child_value
+        else:
+            flat[key] = value
+    return flat
+
+
+def serialized_chunks(model_type: str, chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+    """
+    ردیف‌های سریال‌شده به تفکیک دسته. در صورت وجود، سریالایزر سریع روی ()values
+    استفاده می‌شود که خروجی یکسانی با سریالایزر DRF دارد.
+    """
+    queryset_factory, serializer_class, row_serializer_class = EXPORTS[model_type]
+    if row_serializer_class is None:
+        return (serializer_class(chunk, many=True).data for chunk in iter_chunks(queryset_factory(), chunk_size))
+    row_serializer = row_serializer_class()
+    return (
+        row_serializer.serialize(chunk)
+        for chunk in iter_chunks(row_serializer_class.values(queryset_factory()), chunk_size)
+    )
+
+
+def encode(model_type: str, fmt: str, chunk_size: int, exported_at: str) -> Iterator[bytes]:
+    """تولید خروجی به صورت تکه‌تکه؛ هر تکه معادل یک دسته از ردیف‌هاست"""
+    chunks = serialized_chunks(model_type, chunk_size)
+
+    if fmt == 'ndjson':
+        for rows in chunks:
+            yield b''.join(dumps(row) + b'\n' for row in rows)
+    elif fmt == 'csv':
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=csv_columns(EXPORTS[model_type][1]), extrasaction='ignore')
+        writer.writeheader()
+        for rows in chunks:
+            writer.writerows(flatten(row) for row in rows)
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode('utf-8')
+    else:
+        # همان ساختار قبلی {data, count, exported_at}؛ count پس از پایان داده‌ها نوشته می‌شود
+        count = 0
+        yield b'{"data":['
+        for rows in chunks:
+            if rows:
+                # آرایه هر دسته یک‌جا کدگذاری و کروشه‌هایش حذف می‌شود
+                yield (b',' if count else b'') + dumps(list(rows))[1:-1]
+            count += len(rows)
+        yield b'],"count":' + str(count).encode('ascii') + b',"exported_at":' + dumps(exported_at) + b'}'
+
+
+def gzip_stream(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_stream(model_type: str, fmt: str, exported_at: str, compress: bool = False,
+                  chunk_size: int = 0) -> Iterator[bytes]:
+    chunks = encode(model_type, fmt, chunk_size or settings.EXPORT_CHUNK_SIZE, exported_at)
+    return gzip_stream(chunks) if compress else chunks
+
+
+def streaming_content(chunks: Iterator[bytes], asynchronous: bool):
+    """
+    زیر ASGI، StreamingHttpResponse یک iterator همگام را پیش از ارسال کامل در
+    حافظه جمع می‌کند؛ بنابراین هر تکه جداگانه در thread همگام خوانده می‌شود.
+    """
+    if not asynchronous:
+        return chunks
+
+    async def iterate():
+        while True:
+            chunk = await sync_to_async(next)(chunks, None)
+            if chunk is None:
+                return
+            yield chunk
+
+    return iterate()
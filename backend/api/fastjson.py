@@ -0,0 +1,223 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from django.db import models
+from django.utils import timezone
+from rest_framework.utils.encoders import JSONEncoder
+
+from .models import Auction, Bid, CurrencyRate, UserNotification
+
+try:
+    import orjson
+except ImportError:  # orjson در requirements.txt است؛ در نبود آن از json استاندارد استفاده می‌شود
+    orjson = None
+
+_fallback = JSONEncoder()
+
+
+def _default(value):
+    """انواعی که JSON استاندارد نمی‌شناسد، با همان قالب خروجی DRF"""
+    if isinstance(value, Decimal):
+        return format(value, 'f')
+    if isinstance(value, datetime):
+        return _datetime(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    # سایر انواع (UUID، رشته‌های lazy، ...) مانند JSONRenderer
+    return _fallback.default(value)
+
+
+def dumps(data: Any) -> bytes:
+    """
+    تبدیل سریع داده به JSON فشرده (UTF-8، بدون escape حروف فارسی) مانند JSONRenderer.
+
+    در صورت نصب بودن orjson از آن استفاده می‌شود؛ datetime ها از مسیر _default
+    عبور می‌کنند تا قالب آن‌ها (پسوند Z برای UTC) با DRF یکسان بماند.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=_default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+    return json.dumps(data, default=_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _datetime(value: Optional[datetime], tz=None) -> Optional[str]:
+    if not value:
+        return None
+    if timezone.is_aware(value):
+        value = value.astimezone(tz or timezone.get_current_timezone())
+    text = value.isoformat()
+    return text[:-6] + 'Z' if text.endswith('+00:00') else text
+
+
+def _decimal_converter(field: models.DecimalField, context) -> Callable[[Any], Optional[str]]:
+    exponent = Decimal('.1') ** field.decimal_places
+
+    def convert(value):
+        if value is None:
+            return None
+        if not isinstance(value, Decimal):
+            value = Decimal(str(value).strip())
+        return format(value.quantize(exponent), 'f')
+    return convert
+
+
+def _datetime_converter(field, context) -> Callable[[Any], Optional[str]]:
+    # منطقه زمانی یک بار برای هر نمونه سریالایزر خوانده می‌شود، نه برای هر مقدار
+    tz = timezone.get_current_timezone()
+    return lambda value: _datetime(value, tz)
+
+
+def _file_converter(field: models.FileField, context) -> Callable[[Any], Optional[str]]:
+    storage = field.storage
+    request = (context or {}).get('request')
+
+    def convert(name):
+        if not name:
+            return None
+        url = storage.url(name)
+        return request.build_absolute_uri(url) if request is not None else url
+    return convert
+
+
+# نوع فیلد مدل → سازنده تابع تبدیل (سایر فیلدها بدون تغییر کپی می‌شوند)
+_CONVERTERS = (
+    (models.DecimalField, _decimal_converter),
+    (models.DateTimeField, _datetime_converter),
+    (models.FileField, _file_converter),
+)
+
+
+def _converter_factory(field):
+    for field_class, factory in _CONVERTERS:
+        if isinstance(field, field_class):
+            return factory
+    return None
+
+
+# برنامه تبدیل هر فیلد: (کلید خروجی، ستون ()values، شماره تابع تبدیل یا None، فرزندان)
+# فرزندان برای روابط تو در تو فهرست (کلید، ستون، شماره تابع تبدیل) است و برای سایر فیلدها None
+FieldPlan = Tuple[str, str, Optional[int], Optional[Tuple[Tuple[str, str, Optional[int]], ...]]]
+
+
+class RowSerializer:
+    """
+    سریالایزر فقط‌خواندنی روی ردیف‌های ()values.
+
+    خروجی با سریالایزر DRF متناظر یکسان است، اما نگاشت فیلدها یک بار هنگام
+    تعریف کلاس به فهرستی از (کلید، ستون، تابع تبدیل) تبدیل می‌شود و برای هر
+    ردیف هیچ نمونه مدل، فیلد سریالایزر یا بررسی نوعی ساخته نمی‌شود.
+    nested: نام فیلد رابطه → فیلدهای مدل مرتبط (مثل PublicUserSerializer)
+    """
+    model: Any = None
+    fields: Tuple[str, ...] = ()
+    nested: Dict[str, Tuple[str, ...]] = {}
+
+    _columns: Tuple[str, ...] = ()
+    _factories: Tuple[Any, ...] = ()
+    _plan: Tuple[FieldPlan, ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.model is not None:
+            cls._compile()
+
+    @classmethod
+    def _compile(cls):
+        columns: List[str] = []
+        factories: List[Any] = []
+
+        def converter(field, column) -> Optional[int]:
+            columns.append(column)
+            factory = _converter_factory(field)
+            if factory is None:
+                return None
+            factories.append((field, factory))
+            return len(factories) - 1
+
+        plan: List[FieldPlan] = []
+        for name in cls.fields:
+            field = cls.model._meta.get_field(name)
+            if name in cls.nested:
+                related = field.related_model
+                key = f'{name}__{related._meta.pk.name}'
+                children = tuple(
+                    (child, f'{name}__{child}', converter(related._meta.get_field(child), f'{name}__{child}'))
+                    for child in cls.nested[name]
+                )
+                if key not in columns:
+                    columns.append(key)
+                plan.append((name, key, None, children))
+            else:
+                # برای ForeignKey مقدار ()values همان کلید اصلی است، مانند PrimaryKeyRelatedField
+                plan.append((name, name, converter(field, name), None))
+
+        cls._plan = tuple(plan)
+        cls._columns = tuple(columns)
+        cls._factories = tuple(factories)
+
+    def __init__(self, context: Optional[Dict[str, Any]] = None):
+        converters = [factory(field, context) for field, factory in self._factories]
+
+        def resolve(index: Optional[int]):
+            return None if index is None else converters[index]
+
+        # شماره‌ها یک بار با توابع تبدیل همین نمونه (منطقه زمانی، request) جایگزین می‌شوند
+        self._fields = tuple(
+            (key, column, resolve(index), None if children is None else tuple(
+                (child, child_column, resolve(child_index)) for child, child_column, child_index in children
+            ))
+            for key, column, index, children in self._plan
+        )
+
+    @classmethod
+    def values(cls, queryset):
+        """کوئری‌ست ()values با همه ستون‌های لازم (روابط تو در تو با JOIN خوانده می‌شوند)"""
+        return queryset.values(*cls._columns)
+
+    def to_representation(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        data: Dict[str, Any] = {}
+        for key, column, convert, children in self._fields:
+            if children is not None:
+                if row[column] is None:
+                    data[key] = None
+                else:
+                    data[key] = {
+                        child: row[child_column] if child_convert is None else child_convert(row[child_column])
+                        for child, child_column, child_convert in children
+                    }
+            else:
+                data[key] = row[column] if convert is None else convert(row[column])
+        return data
+
+    def serialize(self, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        to_representation = self.to_representation
+        return [to_representation(row) for row in rows]
+
+
+PUBLIC_USER_FIELDS = ('id', 'username', 'first_name', 'last_name', 'company', 'profile_image')
+
+
+class AuctionRowSerializer(RowSerializer):
+    model = Auction
+    fields = ('id', 'title', 'description', 'start_date', 'end_date', 'status',
+              'starting_price', 'current_price', 'category', 'condition', 'location',
+              'creator', 'winner', 'created_at', 'updated_at')
+    nested = {'creator': PUBLIC_USER_FIELDS, 'winner': PUBLIC_USER_FIELDS}
+
+
+class BidRowSerializer(RowSerializer):
+    model = Bid
+    fields = ('id', 'auction', 'bidder', 'amount', 'created_at')
+    nested = {'bidder': PUBLIC_USER_FIELDS}
+
+
+class CurrencyRateRowSerializer(RowSerializer):
+    model = CurrencyRate
+    fields = ('id', 'name', 'code', 'rate', 'change', 'last_updated')
+
+
+class UserNotificationRowSerializer(RowSerializer):
+    model = UserNotification
+    fields = ('id', 'user', 'type', 'message', 'read', 'auction', 'count', 'created_at', 'last_event_at')
+
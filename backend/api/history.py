@@ -0,0 +1,195 @@
+import sys
+from array import array
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import DecimalField, F, Value
+from django.db.models.functions import Greatest, Least
+from django.utils import timezone
+
+from .models import CurrencyRateCandle, CurrencyRateSeries
+
+RESOLUTIONS = [code for code, _ in CurrencyRateCandle.RESOLUTIONS]
+
+# طول هر بازه؛ ترتیب از ریز به درشت (انتخاب خودکار وضوح)
+_STEPS = {
+    'minute': timedelta(minutes=1),
+    'hour': timedelta(hours=1),
+    'day': timedelta(days=1),
+}
+
+# نرخ‌ها با چهار رقم اعشار ذخیره می‌شوند (همان decimal_places مدل CurrencyRate)
+_SCALE = 10_000
+
+# تیک: (currency_id, rate, at)
+Tick = Tuple[Any, Decimal, datetime]
+
+
+def _encode(values: Iterable[int]) -> bytes:
+    # ترتیب بایت ثابت (little-endian) تا داده روی هر معماری یکسان خوانده شود
+    packed = array('q', values)
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _decode(data: Any) -> array:
+    packed = array('q')
+    packed.frombytes(bytes(data))
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return packed
+
+
+def _unpack(row) -> Iterable[Tuple[datetime, Decimal]]:
+    """تیک‌های یک ردیف تاریخچه خام به صورت (زمان، نرخ)"""
+    for millis, scaled in zip(_decode(row.times), _decode(row.rates)):
+        yield datetime.fromtimestamp(millis / 1000, tz=timezone.get_current_timezone()), Decimal(scaled) / _SCALE
+
+
+def bucket(at: datetime, resolution: str) -> datetime:
+    """ابتدای بازه‌ای که زمان at در آن قرار دارد (روز بر اساس منطقه زمانی پروژه)"""
+    at = timezone.localtime(at)
+    if resolution == 'minute':
+        return at.replace(second=0, microsecond=0)
+    if resolution == 'hour':
+        return at.replace(minute=0, second=0, microsecond=0)
+    return at.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _append(ticks: List[Tick], series_model) -> None:
+    per_day: Dict[Tuple[Any, Any], List[Tick]] = {}
+    for tick in ticks:
+        per_day.setdefault((tick[0], timezone.localdate(tick[2])), []).append(tick)
+    # ردیف‌های ناموجود ابتدا خالی ساخته می‌شوند تا افزودن هم‌زمان تیکی را گم نکند
+    series_model.objects.bulk_create([
+        series_model(currency_id=currency_id, day=day) for currency_id, day in per_day
+    ], ignore_conflicts=True)
+    rows = series_model.objects.select_for_update().filter(
+        currency_id__in={currency_id for currency_id, _ in per_day}, day__in={day for _, day in per_day}
+    )
+    changed = []
+    for row in rows:
+        day_ticks = per_day.get((row.currency_id, row.day))
+        if not day_ticks:
+            continue
+        row.times = bytes(row.times) + _encode(int(at.timestamp() * 1000) for _, _, at in day_ticks)
+        row.rates = bytes(row.rates) + _encode(int((rate * _SCALE).to_integral_value()) for _, rate, _ in day_ticks)
+        row.count += len(day_ticks)
+        changed.append(row)
+    series_model.objects.bulk_update(changed, ['times', 'rates', 'count'])
+
+
+def _apply_candles(ticks: List[Tick], candle_model) -> None:
+    # کلید: (currency_id, resolution, start) → [open, high, low, close, count]
+    candles: Dict[Tuple[Any, str, datetime], List[Any]] = {}
+    for currency_id, rate, at in ticks:
+        for resolution in RESOLUTIONS:
+            key = (currency_id, resolution, bucket(at, resolution))
+            candle = candles.get(key)
+            if candle is None:
+                candles[key] = [rate, rate, rate, rate, 1]
+            else:
+                candle[1] = max(candle[1], rate)
+                candle[2] = min(candle[2], rate)
+                candle[3] = rate
+                candle[4] += 1
+
+    def update(key) -> int:
+        currency_id, resolution, start = key
+        _, high, low, close, count = candles[key]
+        decimal = DecimalField(max_digits=15, decimal_places=4)
+        return candle_model.objects.filter(currency_id=currency_id, resolution=resolution, start=start).update(
+            high=Greatest(F('high'), Value(high, output_field=decimal)),
+            low=Least(F('low'), Value(low, output_field=decimal)),
+            close=close, ticks=F('ticks') + count,
+        )
+
+    # همان الگوی rollups.apply: UPDATE، درج ردیف‌های ناموجود با ignore_conflicts و UPDATE دوباره
+    missing = [key for key in candles if not update(key)]
+    if missing:
+        # ticks و close در UPDATE بعدی اعمال می‌شوند
+        candle_model.objects.bulk_create([
+            candle_model(currency_id=key[0], resolution=key[1], start=key[2],
+                         open=candles[key][0], high=candles[key][1], low=candles[key][2], close=candles[key][0])
+            for key in missing
+        ], ignore_conflicts=True)
+        for key in missing:
+            update(key)
+
+
+def record(ticks: Iterable[Tick], series_model=CurrencyRateSeries, candle_model=CurrencyRateCandle) -> int:
+    """
+    ثبت تیک‌های نرخ: افزودن به تاریخچه خام و به‌روزرسانی خلاصه‌های دقیقه/ساعت/روز.
+
+    تیک‌ها باید به ترتیب زمان باشند (close آخرین نرخ هر بازه است). مدل‌ها
+    می‌توانند مدل تاریخی migration باشند.
+    """
+    ticks = [(currency_id, Decimal(rate), at) for currency_id, rate, at in ticks]
+    if not ticks:
+        return 0
+    with transaction.atomic():
+        _append(ticks, series_model)
+        _apply_candles(ticks, candle_model)
+    return len(ticks)
+
+
+def raw_ticks(currency_id: Any, start: datetime, end: datetime) -> List[Tuple[datetime, Decimal]]:
+    """تیک‌های خام یک ارز در بازه [start, end)؛ برای بازسازی و بررسی، نه برای API"""
+    result = []
+    rows = CurrencyRateSeries.objects.filter(  # type: ignore
+        currency_id=currency_id, day__gte=timezone.localdate(start), day__lte=timezone.localdate(end)
+    ).order_by('day')
+    for row in rows:
+        result.extend((at, rate) for at, rate in _unpack(row) if start <= at < end)
+    return result
+
+
+def points(start: datetime, end: datetime, resolution: str) -> int:
+    """حداکثر تعداد بازه‌های یک وضوح در [start, end)"""
+    return max(int((end - start) / _STEPS[resolution]), 0) + 1
+
+
+def choose_resolution(start: datetime, end: datetime) -> str:
+    """ریزترین وضوحی که تعداد نقاط بازه از CURRENCY_HISTORY_MAX_POINTS بیشتر نشود"""
+    for resolution in RESOLUTIONS:
+        if points(start, end, resolution) <= settings.CURRENCY_HISTORY_MAX_POINTS:
+            return resolution
+    return RESOLUTIONS[-1]
+
+
+def candles(currency_id: Any, resolution: str, start: datetime, end: datetime):
+    """خلاصه‌های بازه از ایندکس (currency, resolution, start)، بدون خواندن تیک‌های خام"""
+    return CurrencyRateCandle.objects.filter(  # type: ignore
+        currency_id=currency_id, resolution=resolution,
+        start__gte=bucket(start, resolution), start__lt=end,
+    ).order_by('start')
+
+
+def rebuild(series_model=CurrencyRateSeries, candle_model=CurrencyRateCandle, batch_size: int = 1000) -> int:
+    """بازسازی کامل خلاصه‌ها از تاریخچه خام؛ مدل‌ها می‌توانند مدل تاریخی migration باشند"""
+    ticks: List[Tick] = []
+    for row in series_model.objects.order_by('currency_id', 'day').iterator():
+        ticks.extend((row.currency_id, rate, at) for at, rate in _unpack(row))
+    ticks.sort(key=lambda tick: (tick[0], tick[2]))
+
+    rows: Dict[Tuple[Any, str, datetime], Any] = {}
+    for currency_id, rate, at in ticks:
+        for resolution in RESOLUTIONS:
+            key = (currency_id, resolution, bucket(at, resolution))
+            candle = rows.get(key)
+            if candle is None:
+                rows[key] = candle_model(currency_id=currency_id, resolution=resolution, start=key[2],
+                                         open=rate, high=rate, low=rate, close=rate, ticks=1)
+            else:
+                candle.high = max(candle.high, rate)
+                candle.low = min(candle.low, rate)
+                candle.close = rate
+                candle.ticks += 1
+    with transaction.atomic():
+        candle_model.objects.all().delete()
+        candle_model.objects.bulk_create(list(rows.values()), batch_size=batch_size)
+    return len(rows)
@@ -0,0 +1,156 @@
+import csv
+import io
+import json
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from typing import Any, Dict, List
+from urllib.request import urlopen
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from . import caching, history
+from .models import CurrencyRate
+
+# دقت ستون‌های rate و change مدل CurrencyRate
+_QUANTUM = Decimal('0.0001')
+
+
+class FeedError(ValueError):
+    """فایل نرخ‌ها قابل خواندن نیست یا ردیف نامعتبر دارد"""
+
+
+def decimal_value(value: Any, line: int, field: str, quantum: Decimal = _QUANTUM) -> Decimal:
+    try:
+        number = Decimal(str(value).replace(',', '').strip()).quantize(quantum, rounding=ROUND_HALF_UP)
+    except (InvalidOperation, ValueError):
+        raise FeedError(f'ردیف {line}: مقدار {field} نامعتبر است')
+    # quantize برای NaN خطا نمی‌دهد؛ نرخ و قیمت صفر یا منفی هم معنا ندارد
+    if not number.is_finite() or number <= 0:
+        raise FeedError(f'ردیف {line}: مقدار {field} باید عددی مثبت باشد')
+    return number
+
+
+def _max_length(field: str) -> int:
+    return CurrencyRate._meta.get_field(field).max_length  # type: ignore
+
+
+def feed_rows(text: str, key: str = 'quotes') -> List[Any]:
+    """ردیف‌های فایل: JSON (فهرست یا {key: [...]}) یا CSV با سرآیند"""
+    stripped = text.lstrip('\ufeff').lstrip()
+    if stripped[:1] not in ('[', '{'):
+        return list(csv.DictReader(io.StringIO(stripped)))
+    try:
+        data = json.loads(stripped)
+    except ValueError as e:
+        raise FeedError(f'JSON نامعتبر: {e}')
+    result = data.get(key) if isinstance(data, dict) else data
+    if not isinstance(result, list):
+        raise FeedError(f'فهرست ردیف‌ها ({key}) پیدا نشد')
+    return result
+
+
+def parse(text: str) -> List[Dict[str, Any]]:
+    """
+    خواندن نرخ‌ها از JSON (فهرست یا {"quotes": [...]}) یا CSV با سرآیند.
+
+    هر ردیف code و rate دارد و name اختیاری است. خروجی به ازای هر کد یک ردیف
+    است (ردیف آخر هر کد معتبر است).
+    """
+    return parse_rows(feed_rows(text))
+
+
+def parse_rows(rows: List[Any]) -> List[Dict[str, Any]]:
+    quotes: Dict[str, Dict[str, Any]] = {}
+    for line, row in enumerate(rows, start=1):
+        if not isinstance(row, dict):
+            raise FeedError(f'ردیف {line}: قالب نامعتبر است')
+        code = str(row.get('code') or '').strip().upper()
+        if not code or len(code) > _max_length('code'):
+            raise FeedError(f'ردیف {line}: کد نامعتبر است')
+        if row.get('rate') in (None, ''):
+            raise FeedError(f'ردیف {line}: نرخ ارسال نشده است')
+        quotes[code] = {
+            'code': code,
+            'name': str(row.get('name') or '').strip()[:_max_length('name')] or None,
+            'rate': decimal_value(row['rate'], line, 'rate'),
+        }
+    return list(quotes.values())
+
+
+def read(source: str) -> str:
+    """متن فایل از مسیر محلی یا آدرس HTTP"""
+    try:
+        if source.startswith(('http://', 'https://')):
+            with urlopen(source, timeout=settings.CURRENCY_FEED_TIMEOUT) as response:
+                return response.read().decode(response.headers.get_content_charset() or 'utf-8')
+        with open(source, encoding='utf-8') as feed:
+            return feed.read()
+    except (OSError, UnicodeDecodeError) as e:
+        raise FeedError(f'خواندن {source} ممکن نشد: {e}')
+
+
+def load(source: str) -> List[Dict[str, Any]]:
+    return parse(read(source))
+
+
+def percent_change(old: Decimal, new: Decimal) -> Decimal:
+    """درصد تغییر نرخ نسبت به مقدار قبلی"""
+    if not old:
+        return Decimal('0')
+    return ((new - old) / old * 100).quantize(_QUANTUM, rounding=ROUND_HALF_UP)
+
+
+def ingest(quotes: List[Dict[str, Any]], dry_run: bool = False, now=None) -> Dict[str, int]:
+    """
+    اعمال یک دسته نرخ روی CurrencyRate.
+
+    ردیف‌ها بر اساس code با نرخ‌های فعلی مقایسه می‌شوند و فقط ردیف‌های تغییرکرده
+    (نرخ یا نام) در یک تراکنش با bulk_update / bulk_create نوشته می‌شوند. change
+    درصد تغییر نسبت به نرخ قبلی است. سیگنال‌های هر ردیف اجرا نمی‌شوند؛ تاریخچه
+    نرخ یک بار برای همه تیک‌ها و کش ارزها یک بار برای کل دسته به‌روز می‌شود.
+    """
+    now = now or timezone.now()
+    summary = {'total': len(quotes), 'created': 0, 'updated': 0, 'unchanged': 0}
+    with transaction.atomic():
+        existing: Dict[str, CurrencyRate] = {}
+        # کد یکتا نیست؛ در صورت تکرار قدیمی‌ترین ردیف به‌روز می‌شود
+        for currency in CurrencyRate.objects.filter(  # type: ignore
+            code__in=[quote['code'] for quote in quotes]
+        ).order_by('-id'):
+            existing[currency.code] = currency
+
+        updated: List[CurrencyRate] = []
+        created: List[CurrencyRate] = []
+        # ردیف‌هایی که نرخشان تغییر کرده (تیک تاریخچه)؛ تغییر نام تیک ندارد
+        repriced: List[CurrencyRate] = []
+        for quote in quotes:
+            currency = existing.get(quote['code'])
+            if currency is None:
+                created.append(CurrencyRate(
+                    code=quote['code'], name=quote['name'] or quote['code'], rate=quote['rate'],
+                    change=Decimal('0'), last_updated=now,
+                ))
+                continue
+            name = quote['name'] or currency.name
+            if currency.rate == quote['rate'] and currency.name == name:
+                summary['unchanged'] += 1
+                continue
+            if currency.rate != quote['rate']:
+                currency.change = percent_change(currency.rate, quote['rate'])
+                currency.rate = quote['rate']
+                repriced.append(currency)
+            currency.name = name
+            currency.last_updated = now
+            updated.append(currency)
+
+        summary['created'] = len(created)
+        summary['updated'] = len(updated)
+        if dry_run or not (created or updated):
+            return summary
+
+        CurrencyRate.objects.bulk_update(updated, ['name', 'rate', 'change', 'last_updated'])  # type: ignore
+        created = CurrencyRate.objects.bulk_create(created)  # type: ignore
+        history.record([(currency.pk, currency.rate, now) for currency in repriced + created])
+        caching.invalidate(caching.CURRENCIES)
+    return summary
@@ -0,0 +1,203 @@
+import heapq
+import itertools
+import time
+from datetime import timedelta
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+from django.db import transaction
+from django.db.models import F, OuterRef, Subquery
+from django.utils import timezone
+
+from . import caching, notifications, participation, rollups
+from .events import publish_notifications, publish_status_changes
+from .models import Auction, Bid, UserNotification
+
+OPEN = 'open'
+CLOSE = 'close'
+
+
+def _listing_name(row) -> str:
+    return 'مناقصه' if row['condition'] == 'tender' else 'مزایده'
+
+
+def open_auctions(auction_ids: Iterable[Any], now=None) -> List[Any]:
+    """مزایده‌های زمان‌بندی‌شده‌ای که زمان شروعشان رسیده را فعال می‌کند"""
+    now = now or timezone.now()
+    with transaction.atomic():
+        rows = list(
+            Auction.objects.filter(  # type: ignore
+                id__in=list(auction_ids), status='scheduled', start_date__lte=now
+            ).values('id', 'title', 'creator_id', 'condition', 'category', 'status', 'created_at')
+        )
+        opened = [row['id'] for row in rows]
+        if not opened:
+            return []
+        Auction.objects.filter(id__in=opened, status='scheduled').update(  # type: ignore
+            status='active', updated_at=now
+        )
+        rollups.record_status_change(rows, 'active')
+        participation.record_status_change(opened, 'active')
+        caching.invalidate(caching.AUCTIONS)
+        new_notifications = UserNotification.objects.bulk_create([  # type: ignore
+            UserNotification(
+                user_id=row['creator_id'],
+                auction_id=row['id'],
+                type='auction_start',
+                message=f'{_listing_name(row)} "{row["title"]}" شروع شد',
+                read=False,
+            )
+            for row in rows
+        ])
+        notifications.record_created(new_notifications)
+        publish_status_changes(opened, 'active')
+        publish_notifications(new_notifications)
+    return opened
+
+
+def close_auctions(auction_ids: Iterable[Any], now=None) -> List[Any]:
+    """
+    مزایده‌هایی که زمان پایانشان گذشته را می‌بندد و برنده را از بالاترین پیشنهاد تعیین می‌کند.
+
+    مانند bidding._lock_auction، ابتدا یک UPDATE شرطی بدون تغییر قفل نوشتن مزایده‌های
+    سررسیده را می‌گیرد تا پیشنهاد، لغو یا تمدید هم‌زمان بین خواندن بالاترین پیشنهاد
+    و بستن مزایده نوشته نشود. بالاترین پیشنهاد هر مزایده با یک زیرکوئری در همان
+    کوئری انتخاب خوانده می‌شود؛ هر مزایده با UPDATE شرطی بسته می‌شود و مزایده‌ای که
+    دیگر فعال و سررسیده نیست کنار گذاشته می‌شود. اعلان‌ها دسته‌ای نوشته می‌شوند.
+    """
+    now = now or timezone.now()
+    top_bid = Bid.objects.filter(auction=OuterRef('pk')).order_by('-amount', 'created_at')  # type: ignore
+    with transaction.atomic():
+        due = Auction.objects.filter(id__in=list(auction_ids), status='active', end_date__lte=now)  # type: ignore
+        if not due.update(current_price=F('current_price')):
+            return []
+        rows = list(
+            due.annotate(
+                top_bidder_id=Subquery(top_bid.values('bidder_id')[:1]),
+                top_amount=Subquery(top_bid.values('amount')[:1]),
+            ).values('id', 'title', 'creator_id', 'condition', 'category', 'status', 'created_at',
+                     'top_bidder_id', 'top_amount')
+        )
+        rows = [
+            row for row in rows
+            if Auction.objects.filter(pk=row['id'], status='active', end_date__lte=now).update(  # type: ignore
+                status='completed', winner_id=row['top_bidder_id'], updated_at=now
+            )
+        ]
+        if not rows:
+            return []
+
+        rollups.record_status_change(rows, 'completed')
+        participation.record_status_change([row['id'] for row in rows], 'completed')
+        participation.record_winners({row['id']: row['top_bidder_id'] for row in rows}, 'completed', now)
+        caching.invalidate(caching.AUCTIONS)
+
+        new_notifications = []
+        for row in rows:
+            name = _listing_name(row)
+            if row['top_bidder_id']:
+                new_notifications.append(UserNotification(
+                    user_id=row['top_bidder_id'],
+                    auction_id=row['id'],
+                    type='won_auction',
+                    message=f'شما برنده {name} "{row["title"]}" با مبلغ {row["top_amount"]} شدید',
+                    read=False,
+                ))
+                creator_message = f'{name} "{row["title"]}" با بالاترین پیشنهاد {row["top_amount"]} به پایان رسید'
+            else:
+                creator_message = f'{name} "{row["title"]}" بدون پیشنهاد به پایان رسید'
+            new_notifications.append(UserNotification(
+                user_id=row['creator_id'],
+                auction_id=row['id'],
+                type='auction_end',
+                message=creator_message,
+                read=False,
+            ))
+        new_notifications = UserNotification.objects.bulk_create(new_notifications, batch_size=500)  # type: ignore
+        notifications.record_created(new_notifications)
+
+        closed = [row['id'] for row in rows]
+        publish_status_changes(closed, 'completed')
+        publish_notifications(new_notifications)
+    return closed
+
+
+class LifecycleScheduler:
+    """
+    زمان‌بند چرخه عمر مزایده‌ها بر پایه min-heap روی start_date/end_date.
+
+    هر refresh ثانیه، مزایده‌هایی که تا پایان افق زمانی شروع یا تمام می‌شوند با
+    دو کوئری بازه‌ای خوانده می‌شوند؛ بین دو بار پر کردن هیچ کوئری نظرسنجی اجرا
+    نمی‌شود. موارد سررسیده به‌صورت دسته‌ای باز یا بسته می‌شوند و چون شرط‌ها
+    دوباره در SQL بررسی می‌شوند، ورودی‌های قدیمی heap بی‌اثر هستند.
+    """
+
+    def __init__(self, horizon: timedelta = timedelta(minutes=1),
+                 refresh: timedelta = timedelta(seconds=5), batch_size: int = 500) -> None:
+        self.horizon = horizon
+        self.refresh = refresh
+        self.batch_size = batch_size
+        self._heap: List[Tuple[Any, int, str, Any]] = []
+        self._queued: Set[Tuple[str, Any]] = set()
+        self._counter = itertools.count()
+        self.next_refill = None
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, due_at, kind: str, auction_id: Any) -> None:
+        if (kind, auction_id) in self._queued:
+            return
+        self._queued.add((kind, auction_id))
+        heapq.heappush(self._heap, (due_at, next(self._counter), kind, auction_id))
+
+    def refill(self, now=None) -> None:
+        now = now or timezone.now()
+        until = now + self.horizon
+        for auction_id, start_date in Auction.objects.filter(  # type: ignore
+            status='scheduled', start_date__lte=until
+        ).values_list('id', 'start_date'):
+            self.push(start_date, OPEN, auction_id)
+        for auction_id, end_date in Auction.objects.filter(  # type: ignore
+            status='active', end_date__lte=until
+        ).values_list('id', 'end_date'):
+            self.push(end_date, CLOSE, auction_id)
+        self.next_refill = now + self.refresh
+
+    def run_due(self, now=None) -> Tuple[List[Any], List[Any]]:
+        """همه موارد سررسیده را از heap برمی‌دارد و دسته‌ای اجرا می‌کند"""
+        now = now or timezone.now()
+        due: Dict[str, List[Any]] = {OPEN: [], CLOSE: []}
+        while self._heap and self._heap[0][0] <= now:
+            _, _, kind, auction_id = heapq.heappop(self._heap)
+            self._queued.discard((kind, auction_id))
+            due[kind].append(auction_id)
+
+        opened: List[Any] = []
+        closed: List[Any] = []
+        for start in range(0, len(due[OPEN]), self.batch_size):
+            opened += open_auctions(due[OPEN][start:start + self.batch_size], now)
+        for start in range(0, len(due[CLOSE]), self.batch_size):
+            closed += close_auctions(due[CLOSE][start:start + self.batch_size], now)
+        return opened, closed
+
+    def tick(self, now=None) -> Tuple[List[Any], List[Any]]:
+        now = now or timezone.now()
+        if self.next_refill is None or now >= self.next_refill:
+            self.refill(now)
+        return self.run_due(now)
+
+    def seconds_until_next(self, now=None, max_sleep: float = 1.0) -> float:
+        now = now or timezone.now()
+        wake_at = self.next_refill
+        if self._heap and (wake_at is None or self._heap[0][0] < wake_at):
+            wake_at = self._heap[0][0]
+        if wake_at is None:
+            return max_sleep
+        return max(0.0, min(max_sleep, (wake_at - now).total_seconds()))
+
+    def run_forever(self, max_sleep: float = 1.0, on_tick=None) -> None:
+        while True:
+            opened, closed = self.tick()
+            if on_tick and (opened or closed):
+                on_tick(opened, closed)
+            time.sleep(self.seconds_until_next(max_sleep=max_sleep))
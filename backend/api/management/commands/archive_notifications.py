@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.retention import archive
+
+
+class Command(BaseCommand):
+    help = 'انتقال دسته‌ای اعلان‌های خوانده‌شده قدیمی به بایگانی فشرده'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.NOTIFICATION_RETENTION_DAYS)
+        parser.add_argument('--batch-size', type=int, default=settings.NOTIFICATION_ARCHIVE_BATCH_SIZE)
+        parser.add_argument('--pause', type=float, default=0.0,
+                            help='مکث بین دسته‌ها (ثانیه) تا نوشتن‌های دیگر قفل را بگیرند')
+        parser.add_argument('--max-batches', type=int, default=None)
+
+    def handle(self, *args, **options):
+        archived = archive(options['days'], options['batch_size'], options['pause'], options['max_batches'])
+        self.stdout.write(f'{archived} اعلان بایگانی شد')
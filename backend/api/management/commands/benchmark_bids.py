@@ -0,0 +1,83 @@
+import itertools
+import threading
+import time
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from api.bidding import BidRejected, place_bid
+from api.models import Auction, User
+
+
+class Command(BaseCommand):
+    help = 'اندازه‌گیری توان عملیاتی ثبت پیشنهاد روی یک مزایده پرترافیک'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 64])
+        parser.add_argument('--bids', type=int, default=2000,
+                            help='تعداد کل تلاش‌ها برای هر سطح هم‌زمانی')
+
+    def handle(self, *args, **options):
+        tag = uuid.uuid4().hex[:8]
+        seller = User.objects.create_user(
+            username=f'bench-seller-{tag}', email=f'bench-seller-{tag}@example.com', password=None
+        )
+        try:
+            self.stdout.write(f'{"bidders":>8} {"attempts":>9} {"accepted":>9} {"conflicts":>10} {"bids/sec":>10}')
+            for workers in options['concurrency']:
+                attempts, accepted, conflicts, elapsed = self._run(seller, tag, workers, options['bids'])
+                self.stdout.write(
+                    f'{workers:>8} {attempts:>9} {accepted:>9} {conflicts:>10} {accepted / elapsed:>10.1f}'
+                )
+        finally:
+            # حذف آبشاری مزایده‌ها، پیشنهادها و اعلان‌های آزمایشی
+            User.objects.filter(username__startswith='bench-', username__contains=tag).delete()
+
+    def _run(self, seller, tag, workers, total):
+        now = timezone.now()
+        auction = Auction.objects.create(  # type: ignore
+            title=f'benchmark {tag}', description='benchmark', status='active',
+            start_date=now, end_date=now + timedelta(days=1),
+            starting_price=Decimal('0'), current_price=Decimal('0'), creator=seller,
+        )
+        bidders = [
+            User.objects.create_user(
+                username=f'bench-bidder-{tag}-{workers}-{i}',
+                email=f'bench-bidder-{tag}-{workers}-{i}@example.com', password=None,
+            )
+            for i in range(workers)
+        ]
+        amounts = itertools.count(1)
+        lock = threading.Lock()
+        counters = {'accepted': 0, 'conflicts': 0}
+        per_worker = max(1, total // workers)
+
+        def worker(bidder):
+            accepted = conflicts = 0
+            try:
+                for _ in range(per_worker):
+                    with lock:
+                        amount = Decimal(next(amounts))
+                    try:
+                        place_bid(auction.pk, bidder, amount)
+                        accepted += 1
+                    except BidRejected:
+                        conflicts += 1
+            finally:
+                connection.close()
+            with lock:
+                counters['accepted'] += accepted
+                counters['conflicts'] += conflicts
+
+        threads = [threading.Thread(target=worker, args=(b,)) for b in bidders]
+        started = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - started
+        return per_worker * workers, counters['accepted'], counters['conflicts'], elapsed
@@ -0,0 +1,91 @@
+import time
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from api.fastjson import (
+    AuctionRowSerializer, BidRowSerializer, CurrencyRateRowSerializer, UserNotificationRowSerializer, dumps, orjson
+)
+from api.models import Auction, Bid, CurrencyRate, User, UserNotification
+from api.serializers import AuctionSerializer, BidSerializer, CurrencyRateSerializer, UserNotificationSerializer
+
+# نوع مدل → (کوئری‌ست برای سریالایزر DRF، سریالایزر DRF، سریالایزر سریع)
+TARGETS = {
+    'auctions': (lambda: Auction.objects.select_related('creator', 'winner'),  # type: ignore
+                 AuctionSerializer, AuctionRowSerializer),
+    'bids': (lambda: Bid.objects.select_related('bidder'), BidSerializer, BidRowSerializer),  # type: ignore
+    'notifications': (lambda: UserNotification.objects.all(),  # type: ignore
+                      UserNotificationSerializer, UserNotificationRowSerializer),
+    'currencies': (lambda: CurrencyRate.objects.all(),  # type: ignore
+                   CurrencyRateSerializer, CurrencyRateRowSerializer),
+}
+
+
+class Command(BaseCommand):
+    help = 'مقایسه سریالایزرهای DRF با مسیر سریع ()values + کدگذار JSON سریع'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 100000])
+        parser.add_argument('--models', nargs='+', choices=sorted(TARGETS), default=sorted(TARGETS))
+        parser.add_argument('--repeat', type=int, default=3, help='بهترین زمان از چند اجرا')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'کدگذار: {"orjson" if orjson is not None else "json"}')
+        self.stdout.write(f'{"model":<14} {"rows":>8} {"drf (s)":>9} {"fast (s)":>9} {"speedup":>8}')
+        # داده‌های آزمایشی داخل یک تراکنش ساخته و در پایان rollback می‌شوند
+        with transaction.atomic():
+            self._seed(max(options['rows']))
+            for model_type in options['models']:
+                queryset_factory, serializer_class, row_serializer_class = TARGETS[model_type]
+                for rows in options['rows']:
+                    drf = self._best(options['repeat'], lambda: JSONRenderer().render(
+                        serializer_class(queryset_factory().order_by('pk')[:rows], many=True).data
+                    ))
+                    fast = self._best(options['repeat'], lambda: dumps(row_serializer_class().serialize(
+                        row_serializer_class.values(queryset_factory().order_by('pk')[:rows])
+                    )))
+                    self.stdout.write(f'{model_type:<14} {rows:>8} {drf:>9.3f} {fast:>9.3f} {drf / fast:>7.1f}x')
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def _best(repeat, run):
+        timings = []
+        for _ in range(max(1, repeat)):
+            started = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    def _seed(self, count):
+        tag = uuid.uuid4().hex[:8]
+        now = timezone.now()
+        users = User.objects.bulk_create([
+            User(username=f'bench-{tag}-{i}', email=f'bench-{tag}-{i}@example.com', company='شرکت نمونه')
+            for i in range(100)
+        ])
+        auctions = Auction.objects.bulk_create([  # type: ignore
+            Auction(
+                title=f'مزایده آزمایشی {i}', description='توضیحات آزمایشی ' * 5, status='completed',
+                start_date=now - timedelta(days=2), end_date=now - timedelta(days=1),
+                starting_price=Decimal('1000'), current_price=Decimal('2500.50'),
+                category='metal', condition='used', location='تهران',
+                creator=users[i % 100], winner=users[(i + 1) % 100] if i % 2 else None,
+            )
+            for i in range(count)
+        ], batch_size=2000)
+        Bid.objects.bulk_create([  # type: ignore
+            Bid(auction=auctions[i], bidder=users[i % 100], amount=Decimal('2500.50')) for i in range(count)
+        ], batch_size=2000)
+        UserNotification.objects.bulk_create([  # type: ignore
+            UserNotification(user=users[i % 100], type='new_bid', message=f'پیشنهاد جدید {i}', read=bool(i % 2))
+            for i in range(count)
+        ], batch_size=2000)
+        CurrencyRate.objects.bulk_create([  # type: ignore
+            CurrencyRate(name=f'ارز {i}', code=f'C{i}'[:10], rate=Decimal('58000.1234'), change=Decimal('-0.5'))
+            for i in range(count)
+        ], batch_size=2000)
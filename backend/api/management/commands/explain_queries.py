@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.queryplan import ENDPOINTS, QueryPlanError, report
+
+
+class Command(BaseCommand):
+    help = 'گزارش طرح اجرای (EXPLAIN QUERY PLAN) کوئری‌های مسیرهای API و پیمایش‌های کامل جدول'
+
+    def add_arguments(self, parser):
+        parser.add_argument('endpoints', nargs='*', help='مسیرها؛ پیش‌فرض همه مسیرهای پرمصرف')
+        parser.add_argument('--all', action='store_true', help='نمایش طرح همه کوئری‌ها، نه فقط موارد مشکوک')
+        parser.add_argument('--fail', action='store_true', help='خروج با خطا در صورت وجود پیمایش کامل')
+
+    def handle(self, *args, **options):
+        try:
+            rows = report(options['endpoints'] or ENDPOINTS)
+        except QueryPlanError as e:
+            raise CommandError(str(e))
+
+        flagged = 0
+        endpoint = None
+        for row in rows:
+            if row['full_scans']:
+                flagged += 1
+            elif not options['all']:
+                continue
+            if row['endpoint'] != endpoint:
+                endpoint = row['endpoint']
+                self.stdout.write(self.style.MIGRATE_HEADING(f'{endpoint} [{row["status"]}]'))
+            if row['full_scans']:
+                self.stdout.write(self.style.ERROR(f'  FULL SCAN: {", ".join(row["full_scans"])}'))
+            self.stdout.write(f'  {row["sql"]}')
+            for line in row['plan']:
+                self.stdout.write(f'    {line}')
+
+        self.stdout.write(f'{len(rows)} کوئری بررسی شد؛ {flagged} کوئری با پیمایش کامل')
+        if flagged and options['fail']:
+            raise CommandError('کوئری با پیمایش کامل جدول پیدا شد')
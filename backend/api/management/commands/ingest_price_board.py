@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api.ingest import FeedError
+from api.priceboard import ingest, load
+
+
+class Command(BaseCommand):
+    help = 'به‌روزرسانی گروهی تابلوی قیمت ضایعات از فایل (JSON یا CSV، مسیر محلی یا آدرس HTTP)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('source', nargs='?', default=settings.PRICE_BOARD_FEED_SOURCE,
+                            help='مسیر یا آدرس فایل؛ پیش‌فرض PRICE_BOARD_FEED_SOURCE')
+        parser.add_argument('--dry-run', action='store_true', help='فقط گزارش تغییرات، بدون نوشتن')
+
+    def handle(self, *args, **options):
+        if not options['source']:
+            raise CommandError('منبع فایل قیمت‌ها مشخص نشده است')
+        try:
+            summary = ingest(load(options['source']), dry_run=options['dry_run'])
+        except FeedError as e:
+            raise CommandError(str(e))
+        self.stdout.write(
+            f'{summary["total"]} قیمت: {summary["created"]} جدید، {summary["updated"]} تغییرکرده، '
+            f'{summary["unchanged"]} بدون تغییر'
+        )
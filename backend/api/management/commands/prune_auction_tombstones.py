@@ -0,0 +1,19 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.models import AuctionTombstone
+
+
+class Command(BaseCommand):
+    help = 'حذف نشانه‌های حذف مزایده قدیمی‌تر از بازه همگام‌سازی تغییرات'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.DELTA_SYNC_TOMBSTONE_DAYS)
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        deleted, _ = AuctionTombstone.objects.filter(deleted_at__lt=cutoff).delete()  # type: ignore
+        self.stdout.write(f'{deleted} نشانه حذف پاک شد')
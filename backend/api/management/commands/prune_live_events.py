@@ -0,0 +1,19 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.models import LiveEvent
+
+
+class Command(BaseCommand):
+    help = 'حذف رویدادهای قدیمی کانال زنده'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=settings.LIVE_EVENT_RETENTION_HOURS)
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['hours'])
+        deleted, _ = LiveEvent.objects.filter(created_at__lt=cutoff).delete()  # type: ignore
+        self.stdout.write(f'{deleted} رویداد حذف شد')
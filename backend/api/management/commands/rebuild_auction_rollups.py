@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+
+from api.rollups import rebuild
+
+
+class Command(BaseCommand):
+    help = 'بازسازی جدول خلاصه روزانه آگهی‌ها و شمارنده‌های روزانه داشبورد'
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'{rebuild()} ردیف خلاصه ساخته شد')
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+
+from api.history import rebuild
+
+
+class Command(BaseCommand):
+    help = 'بازسازی خلاصه‌های OHLC نرخ ارزها (دقیقه/ساعت/روز) از تاریخچه خام'
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'{rebuild()} خلاصه ساخته شد')
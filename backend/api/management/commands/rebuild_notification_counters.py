@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+
+from api.notifications import rebuild_counters
+
+
+class Command(BaseCommand):
+    help = 'بازسازی شمارنده اعلان‌های خوانده‌نشده کاربران از جدول اعلان‌ها'
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'{rebuild_counters()} شمارنده ساخته شد')
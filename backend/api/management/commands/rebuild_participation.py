@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+
+from api.participation import rebuild
+
+
+class Command(BaseCommand):
+    help = 'بازسازی نمایه مشارکت کاربران در مزایده‌ها (صفحه مزایده‌های من)'
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'{rebuild()} ردیف مشارکت ساخته شد')
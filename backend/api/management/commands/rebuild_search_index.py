@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from api.models import Auction
+from api.search import is_supported, rebuild
+
+
+class Command(BaseCommand):
+    help = 'بازسازی نمایه جستجوی متنی مزایده‌ها (FTS5)'
+
+    def handle(self, *args, **options):
+        if not is_supported():
+            self.stdout.write('نمایه FTS5 فقط روی SQLite استفاده می‌شود')
+            return
+        self.stdout.write(f'{rebuild(Auction)} مزایده نمایه شد')
@@ -0,0 +1,33 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from api.lifecycle import LifecycleScheduler
+
+
+class Command(BaseCommand):
+    help = 'فعال‌سازی، بستن و تعیین برنده مزایده‌ها در زمان مقرر'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--horizon', type=int, default=60,
+                            help='بازه پیش‌خوانی مزایده‌ها از پایگاه داده (ثانیه)')
+        parser.add_argument('--refresh', type=int, default=5,
+                            help='فاصله بین دو بار خواندن از پایگاه داده (ثانیه)')
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--once', action='store_true',
+                            help='فقط یک بار موارد سررسیده را اجرا کن و خارج شو')
+
+    def handle(self, *args, **options):
+        scheduler = LifecycleScheduler(
+            horizon=timedelta(seconds=options['horizon']),
+            refresh=timedelta(seconds=options['refresh']),
+            batch_size=options['batch_size'],
+        )
+        if options['once']:
+            self._report(*scheduler.tick())
+            return
+        self.stdout.write('زمان‌بند چرخه عمر مزایده‌ها اجرا شد')
+        scheduler.run_forever(on_tick=self._report)
+
+    def _report(self, opened, closed):
+        self.stdout.write(f'{len(opened)} مزایده فعال شد، {len(closed)} مزایده بسته شد')
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from api import notifications
+
+
+class Command(BaseCommand):
+    help = 'پخش دسته‌ای اعلان‌های صف (ادمین‌ها، پیشنهاددهندگان مزایده و فهرست‌های بزرگ)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None,
+                            help='تعداد گیرندگان هر دسته؛ پیش‌فرض NOTIFICATION_BATCH_SIZE')
+        parser.add_argument('--poll', type=float, default=1.0,
+                            help='فاصله بررسی صف وقتی کاری در آن نیست (ثانیه)')
+        parser.add_argument('--once', action='store_true',
+                            help='فقط یک بار صف را خالی کن و خارج شو')
+
+    def handle(self, *args, **options):
+        if options['once']:
+            self._report(notifications.drain(options['batch_size']))
+            return
+        self.stdout.write('پخش‌کننده اعلان‌ها اجرا شد')
+        notifications.run_forever(options['batch_size'], options['poll'], on_batch=self._report)
+
+    def _report(self, created):
+        self.stdout.write(f'{created} اعلان ساخته شد')
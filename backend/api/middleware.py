@@ -0,0 +1,30 @@
+from urllib.parse import parse_qs
+
+from channels.db import database_sync_to_async
+from channels.middleware import BaseMiddleware
+from django.contrib.auth.models import AnonymousUser
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+
+@database_sync_to_async
+def _user_from_token(raw_token):
+    authentication = JWTAuthentication()
+    try:
+        validated = authentication.get_validated_token(raw_token)
+        return authentication.get_user(validated)
+    except (InvalidToken, TokenError):
+        return AnonymousUser()
+
+
+class JWTAuthMiddleware(BaseMiddleware):
+    """
+    احراز هویت اتصال وب‌سوکت با توکن JWT از پارامتر ?token=
+    (مرورگرها امکان ارسال هدر Authorization در وب‌سوکت را ندارند)
+    """
+
+    async def __call__(self, scope, receive, send):
+        params = parse_qs(scope.get('query_string', b'').decode())
+        token = params.get('token', [None])[0]
+        scope['user'] = await _user_from_token(token) if token else AnonymousUser()
+        return await super().__call__(scope, receive, send)
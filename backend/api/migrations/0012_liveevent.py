@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_alter_user_is_admin'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LiveEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('stream', models.CharField(max_length=64)),
+                ('type', models.CharField(max_length=30)),
+                ('payload', models.JSONField(default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['stream', 'id'], name='liveevent_stream_id_idx'), models.Index(fields=['created_at'], name='liveevent_created_at_idx')],
+            },
+        ),
+    ]
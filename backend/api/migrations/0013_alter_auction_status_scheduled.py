@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_liveevent'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='auction',
+            name='status',
+            field=models.CharField(choices=[('pending_review', 'در حال بررسی'), ('scheduled', 'زمان\u200cبندی شده'), ('active', 'فعال'), ('inactive', 'غیرفعال'), ('completed', 'تکمیل شده'), ('cancelled', 'لغو شده'), ('rejected', 'رد شده')], default='pending_review', max_length=20),
+        ),
+    ]
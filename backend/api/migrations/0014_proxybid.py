@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:11
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_alter_auction_status_scheduled'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProxyBid',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('max_amount', models.DecimalField(decimal_places=2, max_digits=15)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('auction', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='proxy_bids', to='api.auction')),
+                ('bidder', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='proxy_bids', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['auction', 'max_amount'], name='proxybid_auction_max_idx')],
+                'constraints': [models.UniqueConstraint(fields=('auction', 'bidder'), name='unique_proxy_bid_per_bidder')],
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_proxybid'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='auction',
+            index=models.Index(fields=['created_at', 'id'], name='auction_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auction',
+            index=models.Index(fields=['status', 'created_at'], name='auction_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auction',
+            index=models.Index(fields=['status', 'end_date'], name='auction_status_end_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auction',
+            index=models.Index(fields=['category', 'created_at'], name='auction_category_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auction',
+            index=models.Index(fields=['condition', 'created_at'], name='auction_condition_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auction',
+            index=models.Index(fields=['location', 'created_at'], name='auction_location_created_idx'),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:17
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def _listing_type(condition):
+    return condition if condition in ('tender', 'inquiry') else 'auction'
+
+
+def backfill_rollups(apps, schema_editor):
+    Auction = apps.get_model('api', 'Auction')
+    Bid = apps.get_model('api', 'Bid')
+    AuctionDailyRollup = apps.get_model('api', 'AuctionDailyRollup')
+
+    rows = {}
+    for row in Auction.objects.annotate(day=TruncDate('created_at')).values(
+        'day', 'condition', 'category', 'status'
+    ).annotate(total=Count('id')).order_by():
+        key = (row['day'], _listing_type(row['condition']), row['category'] or '', row['status'])
+        rows.setdefault(key, [0, 0])[0] += row['total']
+    for row in Bid.objects.annotate(day=TruncDate('created_at')).values(
+        'day', 'auction__condition', 'auction__category', 'auction__status'
+    ).annotate(total=Count('id')).order_by():
+        # پیشنهادها مانند rollups.rebuild با وضعیت فعلی مزایده ثبت می‌شوند
+        key = (row['day'], _listing_type(row['auction__condition']), row['auction__category'] or '',
+               row['auction__status'])
+        rows.setdefault(key, [0, 0])[1] += row['total']
+
+    AuctionDailyRollup.objects.bulk_create([
+        AuctionDailyRollup(day=day, listing_type=kind, category=category, status=status,
+                           auctions=auctions, bids=bids)
+        for (day, kind, category, status), (auctions, bids) in rows.items()
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0015_auction_catalog_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuctionDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('listing_type', models.CharField(choices=[('tender', 'مناقصه'), ('auction', 'مزایده'), ('inquiry', 'استعلام')], max_length=10)),
+                ('category', models.CharField(blank=True, default='', max_length=100)),
+                ('status', models.CharField(choices=[('pending_review', 'در حال بررسی'), ('scheduled', 'زمان\u200cبندی شده'), ('active', 'فعال'), ('inactive', 'غیرفعال'), ('completed', 'تکمیل شده'), ('cancelled', 'لغو شده'), ('rejected', 'رد شده')], max_length=20)),
+                ('auctions', models.IntegerField(default=0)),
+                ('bids', models.IntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('day', 'listing_type', 'category', 'status'), name='unique_auction_daily_rollup')],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
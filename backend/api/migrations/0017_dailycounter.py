@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:18
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def backfill_user_counters(apps, schema_editor):
+    User = apps.get_model('api', 'User')
+    DailyCounter = apps.get_model('api', 'DailyCounter')
+    DailyCounter.objects.bulk_create([
+        DailyCounter(day=row['day'], metric='users', value=row['total'])
+        for row in User.objects.annotate(day=TruncDate('created_at')).values('day').annotate(
+            total=Count('id')
+        ).order_by()
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_auctiondailyrollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('metric', models.CharField(choices=[('users', 'کاربران جدید')], max_length=30)),
+                ('value', models.IntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('day', 'metric'), name='unique_daily_counter')],
+            },
+        ),
+        migrations.RunPython(backfill_user_counters, migrations.RunPython.noop),
+    ]
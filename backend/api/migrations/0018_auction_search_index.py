@@ -0,0 +1,71 @@
+import re
+
+from django.db import migrations
+
+# این migration به کد api.search وابسته نیست تا تغییرات بعدی آن، اجرای migration را
+# روی پایگاه داده جدید تغییر ندهد. یکسان‌سازی متن نسخه ثابت api.search.normalize
+# در زمان ساخت نمایه است؛ پس از تغییر آن فرمان rebuild_search_index اجرا می‌شود.
+_CHARACTER_MAP = str.maketrans({
+    '\u064a': '\u06cc', '\u0649': '\u06cc', '\u0626': '\u06cc',
+    '\u0643': '\u06a9',
+    '\u06c0': '\u0647', '\u0629': '\u0647',
+    '\u0623': '\u0627', '\u0625': '\u0627', '\u0671': '\u0627',
+    '\u0624': '\u0648',
+    '\u200c': ' ',
+    '\u200d': '', '\u0640': '',
+    **{chr(0x06f0 + digit): str(digit) for digit in range(10)},
+    **{chr(0x0660 + digit): str(digit) for digit in range(10)},
+})
+_DIACRITICS = re.compile('[\u064b-\u065f\u0670]')
+
+BATCH_SIZE = 1000
+
+
+def _normalize(text):
+    if not text:
+        return ''
+    return _DIACRITICS.sub('', text.translate(_CHARACTER_MAP)).lower()
+
+
+def create_search_index(apps, schema_editor):
+    # نمایه FTS5 فقط روی SQLite ساخته می‌شود؛ روی پایگاه‌های دیگر جستجو به icontains برمی‌گردد
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        'CREATE VIRTUAL TABLE IF NOT EXISTS api_auction_search USING fts5('
+        'title, description, category, location, tokenize="unicode61 remove_diacritics 2")'
+    )
+    Auction = apps.get_model('api', 'Auction')
+    queryset = Auction.objects.using(connection.alias).order_by('pk').values_list(
+        'pk', 'title', 'description', 'category', 'location'
+    )
+    last_pk = 0
+    with connection.cursor() as cursor:
+        while True:
+            batch = list(queryset.filter(pk__gt=last_pk)[:BATCH_SIZE])
+            if not batch:
+                return
+            cursor.executemany(
+                'INSERT INTO api_auction_search (rowid, title, description, category, location) '
+                'VALUES (%s, %s, %s, %s, %s)',
+                [[row[0]] + [_normalize(value) for value in row[1:]] for row in batch],
+            )
+            last_pk = batch[-1][0]
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute('DROP TABLE IF EXISTS api_auction_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0017_dailycounter'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:27
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0018_auction_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuctionTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('auction_id', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='auction',
+            index=models.Index(fields=['updated_at', 'id'], name='auction_updated_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auctiontombstone',
+            index=models.Index(fields=['deleted_at'], name='tombstone_deleted_at_idx'),
+        ),
+    ]
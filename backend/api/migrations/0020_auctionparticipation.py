@@ -0,0 +1,75 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:34
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+BATCH_SIZE = 1000
+
+
+def backfill_participation(apps, schema_editor):
+    # نسخه ثابت api.participation.rebuild در زمان ساخت نمایه؛ migration به کد فعلی وابسته نیست
+    alias = schema_editor.connection.alias
+    Auction = apps.get_model('api', 'Auction')
+    Bid = apps.get_model('api', 'Bid')
+    AuctionParticipation = apps.get_model('api', 'AuctionParticipation')
+    rows = {}
+
+    def row(user_id, auction_id, status, activity_at):
+        entry = rows.setdefault((user_id, auction_id), {'auction_status': status, 'activity_at': activity_at})
+        entry['activity_at'] = max(entry['activity_at'], activity_at)
+        return entry
+
+    statuses = {}
+    for auction in Auction.objects.using(alias).values(
+        'id', 'creator_id', 'winner_id', 'status', 'created_at', 'updated_at'
+    ):
+        statuses[auction['id']] = auction['status']
+        row(auction['creator_id'], auction['id'], auction['status'], auction['created_at'])['is_creator'] = True
+        if auction['winner_id'] is not None:
+            row(auction['winner_id'], auction['id'], auction['status'], auction['updated_at'])['is_winner'] = True
+
+    for bid in Bid.objects.using(alias).values('bidder_id', 'auction_id').annotate(
+        count=Count('id'), highest=Max('amount'), last_at=Max('created_at')
+    ).order_by():
+        entry = row(bid['bidder_id'], bid['auction_id'], statuses[bid['auction_id']], bid['last_at'])
+        entry.update(is_bidder=True, bid_count=bid['count'], highest_bid_amount=bid['highest'],
+                     last_bid_amount=bid['highest'], last_bid_at=bid['last_at'])
+
+    AuctionParticipation.objects.using(alias).bulk_create([
+        AuctionParticipation(user_id=user_id, auction_id=auction_id, **values)
+        for (user_id, auction_id), values in rows.items()
+    ], batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0019_auction_delta_sync'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuctionParticipation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_creator', models.BooleanField(default=False)),
+                ('is_bidder', models.BooleanField(default=False)),
+                ('is_winner', models.BooleanField(default=False)),
+                ('auction_status', models.CharField(choices=[('pending_review', 'در حال بررسی'), ('scheduled', 'زمان\u200cبندی شده'), ('active', 'فعال'), ('inactive', 'غیرفعال'), ('completed', 'تکمیل شده'), ('cancelled', 'لغو شده'), ('rejected', 'رد شده')], max_length=20)),
+                ('last_bid_amount', models.DecimalField(blank=True, decimal_places=2, max_digits=15, null=True)),
+                ('last_bid_at', models.DateTimeField(blank=True, null=True)),
+                ('highest_bid_amount', models.DecimalField(blank=True, decimal_places=2, max_digits=15, null=True)),
+                ('bid_count', models.IntegerField(default=0)),
+                ('activity_at', models.DateTimeField()),
+                ('auction', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='participations', to='api.auction')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='participations', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('is_creator', True)), fields=['user', '-activity_at', '-id'], name='participation_created_idx'), models.Index(condition=models.Q(('is_bidder', True)), fields=['user', '-activity_at', '-id'], name='participation_bidder_idx'), models.Index(condition=models.Q(('is_winner', True)), fields=['user', '-activity_at', '-id'], name='participation_winner_idx')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'auction'), name='unique_auction_participation')],
+            },
+        ),
+        migrations.RunPython(backfill_participation, migrations.RunPython.noop),
+    ]
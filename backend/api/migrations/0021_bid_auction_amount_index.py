@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0020_auctionparticipation'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='bid',
+            options={},
+        ),
+        migrations.AddIndex(
+            model_name='auctionparticipation',
+            index=models.Index(condition=models.Q(('is_bidder', True)), fields=['auction', '-highest_bid_amount'], name='participation_leaderboard_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bid',
+            index=models.Index(fields=['auction', '-amount', '-id'], name='bid_auction_amount_idx'),
+        ),
+    ]
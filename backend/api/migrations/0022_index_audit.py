@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0021_bid_auction_amount_index'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='auction',
+            index=models.Index(fields=['end_date', 'id'], name='auction_end_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auction',
+            index=models.Index(condition=models.Q(('status', 'pending_review')), fields=['-created_at'], name='auction_pending_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auction',
+            index=models.Index(condition=models.Q(('status', 'scheduled')), fields=['start_date'], name='auction_scheduled_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bid',
+            index=models.Index(fields=['bidder', 'auction'], name='bid_bidder_auction_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('subscription_active', True)), fields=['subscription_end_date'], name='user_subscription_end_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['subscription_type'], name='user_subscription_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('is_admin', True)), fields=['is_admin'], name='user_admin_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usernotification',
+            index=models.Index(fields=['user', '-created_at'], name='notification_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usernotification',
+            index=models.Index(condition=models.Q(('read', False)), fields=['user', '-created_at'], name='notification_user_unread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usernotification',
+            index=models.Index(fields=['-created_at'], name='notification_created_idx'),
+        ),
+    ]
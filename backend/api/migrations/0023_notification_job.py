@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0022_index_audit'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('audience', models.CharField(choices=[('users', 'کاربران مشخص'), ('admins', 'ادمین\u200cها'), ('auction_bidders', 'پیشنهاددهندگان مزایده')], max_length=20)),
+                ('user_ids', models.JSONField(blank=True, default=list)),
+                ('exclude_ids', models.JSONField(blank=True, default=list)),
+                ('type', models.CharField(choices=[('auction_start', 'شروع مزایده'), ('auction_end', 'پایان مزایده'), ('new_bid', 'پیشنهاد جدید'), ('won_auction', 'برنده شدن در مزایده'), ('outbid', 'پیشنهاد بالاتر'), ('auction_created', 'مزایده ایجاد شد'), ('tender_created', 'مناقصه ایجاد شد'), ('auction_approved', 'مزایده تایید شد'), ('tender_approved', 'مناقصه تایید شد'), ('auction_rejected', 'مزایده رد شد'), ('tender_rejected', 'مناقصه رد شد'), ('pending_approval', 'در انتظار تایید')], max_length=20)),
+                ('message', models.TextField()),
+                ('cursor', models.BigIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('auction', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.auction')),
+            ],
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:43
+
+import django.db.models.deletion
+from django.conf import settings
+import time
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def backfill_counters(apps, schema_editor):
+    # نسخه ثابت api.notifications.rebuild_counters؛ migration به کد فعلی وابسته نیست
+    alias = schema_editor.connection.alias
+    UserNotification = apps.get_model('api', 'UserNotification')
+    NotificationCounter = apps.get_model('api', 'NotificationCounter')
+    # نسخه اولیه از زمان فعلی تا ETag های قبلی دوباره معتبر نشوند
+    version = time.time_ns()
+    rows = UserNotification.objects.using(alias).values('user_id').annotate(
+        unread=Count('id', filter=Q(read=False))
+    ).order_by()
+    NotificationCounter.objects.using(alias).bulk_create([
+        NotificationCounter(user_id=row['user_id'], unread=row['unread'], version=version) for row in rows
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0023_notification_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationCounter',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='notification_counter', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('unread', models.IntegerField(default=0)),
+                ('version', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name='usernotification',
+            name='notification_user_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='usernotification',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='notification_user_created_idx'),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
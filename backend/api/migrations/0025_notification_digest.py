@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0024_notification_counter'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usernotification',
+            name='auction',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='notifications', to='api.auction'),
+        ),
+        migrations.AddField(
+            model_name='usernotification',
+            name='count',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddIndex(
+            model_name='usernotification',
+            index=models.Index(condition=models.Q(('read', False)), fields=['auction', 'user', 'type'], name='notification_coalesce_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:46
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0025_notification_digest'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('first_created_at', models.DateTimeField()),
+                ('last_created_at', models.DateTimeField()),
+                ('count', models.PositiveIntegerField()),
+                ('data', models.BinaryField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='usernotification',
+            index=models.Index(condition=models.Q(('read', True)), fields=['created_at'], name='notification_read_created_idx'),
+        ),
+        migrations.AddField(
+            model_name='notificationarchive',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notification_archives', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='notificationarchive',
+            index=models.Index(fields=['user', '-id'], name='notification_archive_user_idx'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from api.history import record
+
+
+def seed_history(apps, schema_editor):
+    # نرخ فعلی هر ارز اولین نقطه تاریخچه آن است
+    CurrencyRate = apps.get_model('api', 'CurrencyRate')
+    record(
+        [(currency.pk, currency.rate, currency.last_updated) for currency in CurrencyRate.objects.order_by('last_updated')],
+        apps.get_model('api', 'CurrencyRateSeries'), apps.get_model('api', 'CurrencyRateCandle'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0026_notification_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CurrencyRateCandle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resolution', models.CharField(choices=[('minute', 'دقیقه'), ('hour', 'ساعت'), ('day', 'روز')], max_length=10)),
+                ('start', models.DateTimeField()),
+                ('open', models.DecimalField(decimal_places=4, max_digits=15)),
+                ('high', models.DecimalField(decimal_places=4, max_digits=15)),
+                ('low', models.DecimalField(decimal_places=4, max_digits=15)),
+                ('close', models.DecimalField(decimal_places=4, max_digits=15)),
+                ('ticks', models.PositiveIntegerField(default=0)),
+                ('currency', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='candles', to='api.currencyrate')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('currency', 'resolution', 'start'), name='unique_currency_rate_candle')],
+            },
+        ),
+        migrations.CreateModel(
+            name='CurrencyRateSeries',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('times', models.BinaryField(default=bytes)),
+                ('rates', models.BinaryField(default=bytes)),
+                ('currency', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='series', to='api.currencyrate')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('currency', 'day'), name='unique_currency_rate_series')],
+            },
+        ),
+        migrations.RunPython(seed_history, migrations.RunPython.noop),
+    ]
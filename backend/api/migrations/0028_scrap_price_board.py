@@ -0,0 +1,73 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:53
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+# قیمت‌هایی که پیش‌تر در NonMetalScrapPrices.jsx ثابت بودند
+INITIAL_PRICES = {
+    'electronic': [
+        ('پی سی بی اس', 86650, 96466),
+        ('برد موبایل اصل', 559200, 703700),
+        ('برد موبایل در هم', 155000, 203700),
+        ('سی پی یو - CPU', 150000, 186467),
+        ('مادر برد (دو چیپ)', 80000, 120000),
+        ('برد سبز', 35000, 45000),
+        ('کارتن خشک - ایرانی', 25000, 30000),
+    ],
+    'non_metal': [
+        ('نایلون درجه یک', 18846, 24693),
+        ('سبد در هم', 12646, 18183),
+        ('فلّه کارتن', 13780, 16134),
+        ('کاغذ سفید / فرم', 17028, 20359),
+        ('روزنامه باطله نو', 20500, 25500),
+        ('پت هاتواش، زیر ۲۰۰', 48750, 48900),
+        ('پت زنده درجه یک', 18789, 20479),
+        ('پت زنده درجه دو', 15940, 17249),
+    ],
+    'metal': [
+        ('آهن سوپر ویژه', 17949, 20042),
+        ('آهن درجه یک', 15592, 17949),
+        ('آهن درجه دو', 13859, 15846),
+        ('چدن درشت بار', 15140, 17879),
+        ('آلومینیوم نرم', 15140, 17879),
+        ('آلومینیوم خشک', 17249, 20479),
+        ('مس کابل قرمز', 95987, 112478),
+    ],
+}
+
+
+def seed_prices(apps, schema_editor):
+    ScrapPrice = apps.get_model('api', 'ScrapPrice')
+    ScrapPrice.objects.bulk_create([
+        ScrapPrice(board=board, name=name, retail=retail, wholesale=wholesale, position=position)
+        for board, prices in INITIAL_PRICES.items()
+        for position, (name, retail, wholesale) in enumerate(prices)
+    ], ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0027_currency_rate_history'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScrapPrice',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('board', models.CharField(choices=[('electronic', 'ضایعات الکترونیک'), ('non_metal', 'ضایعات غیرفلزی'), ('metal', 'ضایعات فلزی')], max_length=20)),
+                ('name', models.CharField(max_length=100)),
+                ('retail', models.DecimalField(decimal_places=2, max_digits=15)),
+                ('wholesale', models.DecimalField(decimal_places=2, max_digits=15)),
+                ('position', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['board', 'position'], name='scrap_price_board_idx')],
+                'constraints': [models.UniqueConstraint(fields=('board', 'name'), name='unique_scrap_price')],
+            },
+        ),
+        migrations.RunPython(seed_prices, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0028_scrap_price_board'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CacheVersion',
+            fields=[
+                ('namespace', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('version', models.BigIntegerField()),
+                ('modified', models.DateTimeField()),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0029_cache_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usernotification',
+            name='last_event_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
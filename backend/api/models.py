@@ -34,12 +34,24 @@ class User(AbstractUser):
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username']
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # انقضای اشتراک فقط روی اشتراک‌های فعال بررسی می‌شود
+            models.Index(fields=['subscription_end_date'], condition=models.Q(subscription_active=True),
+                         name='user_subscription_end_idx'),
+            # فیلتر نوع اشتراک در مدیریت کاربران
+            models.Index(fields=['subscription_type'], name='user_subscription_type_idx'),
+            # ارسال اعلان به ادمین‌ها بدون پیمایش جدول کاربران
+            models.Index(fields=['is_admin'], condition=models.Q(is_admin=True), name='user_admin_idx'),
+        ]
+
     def __str__(self) -> str:
         return str(self.email)
 
 class Auction(models.Model):
     AUCTION_STATUS = [
         ('pending_review', 'در حال بررسی'),
+        ('scheduled', 'زمان‌بندی شده'),
         ('active', 'فعال'),
         ('inactive', 'غیرفعال'),
         ('completed', 'تکمیل شده'),
@@ -62,6 +74,26 @@ class Auction(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # صفحه‌بندی keyset و فیلترهای کاتالوگ عمومی
+            models.Index(fields=['created_at', 'id'], name='auction_created_id_idx'),
+            models.Index(fields=['status', 'created_at'], name='auction_status_created_idx'),
+            models.Index(fields=['status', 'end_date'], name='auction_status_end_idx'),
+            models.Index(fields=['category', 'created_at'], name='auction_category_created_idx'),
+            models.Index(fields=['condition', 'created_at'], name='auction_condition_created_idx'),
+            models.Index(fields=['location', 'created_at'], name='auction_location_created_idx'),
+            # همگام‌سازی تغییرات (updated_since)
+            models.Index(fields=['updated_at', 'id'], name='auction_updated_id_idx'),
+            # ترتیب ending_soon بدون فیلتر وضعیت
+            models.Index(fields=['end_date', 'id'], name='auction_end_id_idx'),
+            # صف تایید ادمین و بارگذاری زمان‌بند؛ ایندکس جزئی فقط ردیف‌های همان وضعیت را دارد
+            models.Index(fields=['-created_at'], condition=models.Q(status='pending_review'),
+                         name='auction_pending_created_idx'),
+            models.Index(fields=['start_date'], condition=models.Q(status='scheduled'),
+                         name='auction_scheduled_start_idx'),
+        ]
+
     def __str__(self) -> str:
         return str(self.title)
 
@@ -72,7 +104,12 @@ class Bid(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
-        ordering = ['-amount']
+        indexes = [
+            # بالاترین پیشنهاد، تاریخچه و جدول رتبه‌بندی هر مزایده بدون مرتب‌سازی کل جدول
+            models.Index(fields=['auction', '-amount', '-id'], name='bid_auction_amount_idx'),
+            # پیشنهادهای یک کاربر (فیلتر ادمین و بازسازی نمایه مشارکت)
+            models.Index(fields=['bidder', 'auction'], name='bid_bidder_auction_idx'),
+        ]
 
     def __str__(self) -> str:
         return f'{self.bidder.email} - {self.amount} on {self.auction.title}'  # type: ignore
@@ -87,6 +124,33 @@ class CurrencyRate(models.Model):
     def __str__(self) -> str:
         return f'{self.name} ({self.code})'
 
+# تابلوی قیمت ضایعات/کالا (قیمت خرده و عمده به تومان)؛ با ingest_price_board به‌روز می‌شود
+class ScrapPrice(models.Model):
+    BOARDS = [
+        ('electronic', 'ضایعات الکترونیک'),
+        ('non_metal', 'ضایعات غیرفلزی'),
+        ('metal', 'ضایعات فلزی'),
+    ]
+
+    board = models.CharField(max_length=20, choices=BOARDS)
+    name = models.CharField(max_length=100)
+    retail = models.DecimalField(max_digits=15, decimal_places=2)
+    wholesale = models.DecimalField(max_digits=15, decimal_places=2)
+    # ترتیب نمایش در تابلو
+    position = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['board', 'name'], name='unique_scrap_price'),
+        ]
+        indexes = [
+            models.Index(fields=['board', 'position'], name='scrap_price_board_idx'),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.get_board_display()}: {self.name}'  # type: ignore
+
 class UserNotification(models.Model):
     NOTIFICATION_TYPES = [
         ('auction_start', 'شروع مزایده'),
@@ -108,9 +172,263 @@ class UserNotification(models.Model):
     message = models.TextField()
     read = models.BooleanField()  
     created_at = models.DateTimeField(auto_now_add=True)
+    # مزایده مرتبط و تعداد رویدادهای تجمیع‌شده در این ردیف (اعلان خلاصه)
+    auction = models.ForeignKey(Auction, on_delete=models.SET_NULL, null=True, blank=True, related_name='notifications')
+    count = models.PositiveIntegerField(default=1)
+    # زمان آخرین رویداد تجمیع‌شده برای نمایش؛ created_at ثابت می‌ماند تا ترتیب cursor فهرست تغییر نکند.
+    # خالی یعنی ردیف فقط رویداد زمان ایجاد را دارد
+    last_event_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # فهرست اعلان‌های کاربر و شمارش خوانده‌نشده‌ها
+            models.Index(fields=['user', '-created_at', '-id'], name='notification_user_created_idx'),
+            models.Index(fields=['user', '-created_at'], condition=models.Q(read=False),
+                         name='notification_user_unread_idx'),
+            # فهرست ادمین (ترتیب پیش‌فرض) و پاک‌سازی اعلان‌های قدیمی
+            models.Index(fields=['-created_at'], name='notification_created_idx'),
+            # انتخاب اعلان‌های خوانده‌شده قدیمی برای بایگانی
+            models.Index(fields=['created_at'], condition=models.Q(read=True), name='notification_read_created_idx'),
+            # یافتن اعلان خلاصه خوانده‌نشده یک کاربر برای همان مزایده و نوع رویداد
+            models.Index(fields=['auction', 'user', 'type'], condition=models.Q(read=False),
+                         name='notification_coalesce_idx'),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.user.email} - {self.type}'  # type: ignore
+
+# پیشنهاد خودکار: سقف پنهان هر پیشنهاددهنده برای یک مزایده
+class ProxyBid(models.Model):
+    auction = models.ForeignKey(Auction, on_delete=models.CASCADE, related_name='proxy_bids')
+    bidder = models.ForeignKey(User, on_delete=models.CASCADE, related_name='proxy_bids')
+    max_amount = models.DecimalField(max_digits=15, decimal_places=2)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['auction', 'bidder'], name='unique_proxy_bid_per_bidder'),
+        ]
+        indexes = [
+            models.Index(fields=['auction', 'max_amount'], name='proxybid_auction_max_idx'),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.bidder_id} max {self.max_amount} on {self.auction_id}'  # type: ignore
+
+# رویدادهای کانال زنده؛ برای ادامه از آخرین شناسه (last_event_id) نگهداری می‌شوند
+class LiveEvent(models.Model):
+    stream = models.CharField(max_length=64)
+    type = models.CharField(max_length=30)
+    payload = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['stream', 'id'], name='liveevent_stream_id_idx'),
+            models.Index(fields=['created_at'], name='liveevent_created_at_idx'),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.stream} #{self.pk} {self.type}'
+
+# خلاصه روزانه آگهی‌ها برای نمودارهای روند؛ به‌صورت افزایشی هنگام نوشتن به‌روز می‌شود
+class AuctionDailyRollup(models.Model):
+    LISTING_TYPES = [
+        ('tender', 'مناقصه'),
+        ('auction', 'مزایده'),
+        ('inquiry', 'استعلام'),
+    ]
+
+    day = models.DateField()
+    listing_type = models.CharField(max_length=10, choices=LISTING_TYPES)
+    category = models.CharField(max_length=100, blank=True, default='')
+    status = models.CharField(max_length=20, choices=Auction.AUCTION_STATUS)
+    # تعداد آگهی‌های ایجادشده در این روز که اکنون در این وضعیت هستند
+    auctions = models.IntegerField(default=0)
+    # تعداد پیشنهادهای ثبت‌شده در این روز روی آگهی‌هایی که اکنون در این وضعیت هستند
+    bids = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'listing_type', 'category', 'status'],
+                                    name='unique_auction_daily_rollup'),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.day} {self.listing_type} {self.category or "-"} {self.status}'
+
+# شمارنده‌های روزانه داشبورد ادمین (مثلاً کاربران جدید هر روز)؛ هنگام نوشتن به‌روز می‌شود
+class DailyCounter(models.Model):
+    METRICS = [
+        ('users', 'کاربران جدید'),
+    ]
+
+    day = models.DateField()
+    metric = models.CharField(max_length=30, choices=METRICS)
+    value = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'metric'], name='unique_daily_counter'),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.day} {self.metric}={self.value}'
+
+
+# نسخه هر فضای نام کش پاسخ (caching.AUCTIONS، ...)؛ نوشتن‌ها در همان تراکنش آن را بالا
+# می‌برند تا تغییر از هر پروسه‌ای (زمان‌بند، ingest، worker) برای همه پروسه‌های وب دیده شود
+class CacheVersion(models.Model):
+    namespace = models.CharField(max_length=50, primary_key=True)
+    version = models.BigIntegerField()
+    modified = models.DateTimeField()
+
+    def __str__(self) -> str:
+        return f'{self.namespace}: {self.version}'
+
+
+# نشانه حذف مزایده برای همگام‌سازی تغییرات؛ کلاینت‌ها ردیف حذف‌شده را از نسخه محلی پاک می‌کنند
+class AuctionTombstone(models.Model):
+    auction_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['deleted_at'], name='tombstone_deleted_at_idx'),
+        ]
+
+    def __str__(self) -> str:
+        return f'auction {self.auction_id} deleted at {self.deleted_at}'
+
+
+# نمایه مشارکت کاربر در مزایده‌ها برای صفحه «مزایده‌های من»؛ هنگام ثبت پیشنهاد و تغییر وضعیت به‌روز می‌شود
+class AuctionParticipation(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='participations')
+    auction = models.ForeignKey(Auction, on_delete=models.CASCADE, related_name='participations')
+    is_creator = models.BooleanField(default=False)
+    is_bidder = models.BooleanField(default=False)
+    is_winner = models.BooleanField(default=False)
+    # کپی وضعیت مزایده تا فیلتر تب‌ها بدون JOIN انجام شود
+    auction_status = models.CharField(max_length=20, choices=Auction.AUCTION_STATUS)
+    last_bid_amount = models.DecimalField(max_digits=15, decimal_places=2, null=True, blank=True)
+    last_bid_at = models.DateTimeField(null=True, blank=True)
+    highest_bid_amount = models.DecimalField(max_digits=15, decimal_places=2, null=True, blank=True)
+    bid_count = models.IntegerField(default=0)
+    # زمان آخرین فعالیت کاربر روی این مزایده (ایجاد، پیشنهاد یا برنده شدن)؛ ترتیب تب‌ها
+    activity_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'auction'], name='unique_auction_participation'),
+        ]
+        indexes = [
+            models.Index(fields=['user', '-activity_at', '-id'], condition=models.Q(is_creator=True),
+                         name='participation_created_idx'),
+            models.Index(fields=['user', '-activity_at', '-id'], condition=models.Q(is_bidder=True),
+                         name='participation_bidder_idx'),
+            models.Index(fields=['user', '-activity_at', '-id'], condition=models.Q(is_winner=True),
+                         name='participation_winner_idx'),
+            models.Index(fields=['auction', '-highest_bid_amount'], condition=models.Q(is_bidder=True),
+                         name='participation_leaderboard_idx'),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.user_id} @ auction {self.auction_id}'  # type: ignore
+
+
+# صف پخش اعلان: یک ردیف برای هر رویداد؛ گیرندگان در پروسه جداگانه و به‌صورت دسته‌ای ساخته می‌شوند
+class NotificationJob(models.Model):
+    AUDIENCES = [
+        ('users', 'کاربران مشخص'),
+        ('admins', 'ادمین‌ها'),
+        ('auction_bidders', 'پیشنهاددهندگان مزایده'),
+    ]
+
+    audience = models.CharField(max_length=20, choices=AUDIENCES)
+    user_ids = models.JSONField(default=list, blank=True)
+    auction = models.ForeignKey(Auction, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    exclude_ids = models.JSONField(default=list, blank=True)
+    type = models.CharField(max_length=20, choices=UserNotification.NOTIFICATION_TYPES)
+    message = models.TextField()
+    # شناسه آخرین گیرنده‌ای که اعلانش ساخته شده؛ ادامه پس از توقف پروسه
+    cursor = models.BigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return f'{self.type} → {self.audience} (after {self.cursor})'
+
+
+# شمارنده اعلان‌های خوانده‌نشده هر کاربر؛ هنگام ایجاد، خواندن و حذف اعلان به‌روز می‌شود
+class NotificationCounter(models.Model):
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True,
+                                related_name='notification_counter')
+    unread = models.IntegerField(default=0)
+    # هر تغییر در اعلان‌های کاربر نسخه را بالا می‌برد (ETag فهرست اعلان‌ها)
+    version = models.BigIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f'{self.user_id}: {self.unread} unread'  # type: ignore
+
+
+# بایگانی فشرده اعلان‌های خوانده‌شده قدیمی؛ هر ردیف دسته‌ای از اعلان‌های یک کاربر (JSON فشرده با zlib)
+class NotificationArchive(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notification_archives')
+    first_created_at = models.DateTimeField()
+    last_created_at = models.DateTimeField()
+    count = models.PositiveIntegerField()
+    data = models.BinaryField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-id'], name='notification_archive_user_idx'),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.user_id}: {self.count} archived notifications'  # type: ignore
+
+
+# تاریخچه خام نرخ هر ارز (فقط افزودنی)؛ هر ردیف تیک‌های یک روز به صورت ستونی:
+# times زمان‌ها (میلی‌ثانیه یونیکس) و rates نرخ‌ها (ضرب در 10^4)، هر دو آرایه int64 پشت سر هم
+class CurrencyRateSeries(models.Model):
+    currency = models.ForeignKey(CurrencyRate, on_delete=models.CASCADE, related_name='series')
+    day = models.DateField()
+    count = models.PositiveIntegerField(default=0)
+    times = models.BinaryField(default=bytes)
+    rates = models.BinaryField(default=bytes)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['currency', 'day'], name='unique_currency_rate_series'),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.currency_id} {self.day}: {self.count} ticks'  # type: ignore
+
+
+# خلاصه OHLC نرخ هر ارز در بازه‌های دقیقه/ساعت/روز؛ هنگام ثبت هر تیک به‌روز می‌شود
+class CurrencyRateCandle(models.Model):
+    RESOLUTIONS = [
+        ('minute', 'دقیقه'),
+        ('hour', 'ساعت'),
+        ('day', 'روز'),
+    ]
+
+    currency = models.ForeignKey(CurrencyRate, on_delete=models.CASCADE, related_name='candles')
+    resolution = models.CharField(max_length=10, choices=RESOLUTIONS)
+    start = models.DateTimeField()
+    open = models.DecimalField(max_digits=15, decimal_places=4)
+    high = models.DecimalField(max_digits=15, decimal_places=4)
+    low = models.DecimalField(max_digits=15, decimal_places=4)
+    close = models.DecimalField(max_digits=15, decimal_places=4)
+    ticks = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            # ایندکس همین قید خواندن بازه یک ارز در یک وضوح را پوشش می‌دهد
+            models.UniqueConstraint(fields=['currency', 'resolution', 'start'], name='unique_currency_rate_candle'),
+        ]
 
     def __str__(self) -> str:
-        return f'{self.user.email} - {self.type}'  # type: ignore
\ No newline at end of file
+        return f'{self.currency_id} {self.resolution} {self.start}'  # type: ignore
@@ -0,0 +1,260 @@
+import time
+from collections import Counter
+from datetime import timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .events import publish_notifications
+from .models import AuctionParticipation, NotificationCounter, NotificationJob, User, UserNotification
+
+# مخاطب صف → (کوئری‌ست گیرندگان، ستون شناسه کاربر)؛ پیمایش keyset روی همین ستون انجام می‌شود
+AUDIENCES: Dict[str, Callable[[NotificationJob], Tuple[Any, str]]] = {
+    'users': lambda job: (User.objects.filter(id__in=job.user_ids), 'id'),
+    'admins': lambda job: (User.objects.filter(is_admin=True), 'id'),
+    'auction_bidders': lambda job: (
+        AuctionParticipation.objects.filter(auction_id=job.auction_id, is_bidder=True), 'user_id'  # type: ignore
+    ),
+}
+
+
+def _create(user_ids: Iterable[Any], notification_type: str, message: str) -> List[UserNotification]:
+    # bulk_create سیگنال post_save ندارد، پس رویداد زنده جداگانه منتشر می‌شود
+    notifications = UserNotification.objects.bulk_create([  # type: ignore
+        UserNotification(user_id=user_id, type=notification_type, message=message, read=False)
+        for user_id in user_ids
+    ])
+    record_created(notifications)
+    publish_notifications(notifications)
+    return notifications
+
+
+def _enqueue(audience: str, notification_type: str, message: str, **fields) -> NotificationJob:
+    return NotificationJob.objects.create(  # type: ignore
+        audience=audience, type=notification_type, message=message, **fields
+    )
+
+
+def notify(user_ids: Iterable[Any], notification_type: str, message: str) -> None:
+    """
+    اعلان برای کاربران مشخص.
+
+    تا NOTIFICATION_INLINE_LIMIT گیرنده با یک bulk_create در همان تراکنش نوشته
+    می‌شود (هزینه‌ای برابر ثبت در صف)؛ فهرست‌های بزرگ‌تر به صف سپرده می‌شوند.
+    """
+    user_ids = list(dict.fromkeys(user_ids))
+    if not user_ids:
+        return
+    if len(user_ids) <= settings.NOTIFICATION_INLINE_LIMIT:
+        _create(user_ids, notification_type, message)
+    else:
+        _enqueue('users', notification_type, message, user_ids=user_ids)
+
+
+def notify_admins(notification_type: str, message: str) -> None:
+    _enqueue('admins', notification_type, message)
+
+
+def notify_auction_bidders(auction_id: Any, notification_type: str, message: str,
+                           exclude: Iterable[Any] = ()) -> None:
+    _enqueue('auction_bidders', notification_type, message, auction_id=auction_id, exclude_ids=list(exclude))
+
+
+# متن اعلان خلاصه برای رویدادهای تکراری یک مزایده
+DIGEST_MESSAGES = {
+    'new_bid': '{count} پیشنهاد جدید برای مزایده "{title}"؛ بالاترین {amount}',
+    'outbid': '{count} پیشنهاد بالاتر از شما در مزایده "{title}" ثبت شد؛ قیمت فعلی {amount}',
+}
+
+
+def _format_amount(amount: Decimal) -> str:
+    if amount == amount.to_integral_value():
+        return f'{amount:,.0f}'
+    return f'{amount:,}'
+
+
+def create_for_auction(auction: Dict[str, Any], amount: Decimal,
+                       entries: Iterable[Tuple[Any, str, str]], now=None) -> List[UserNotification]:
+    """
+    اعلان‌های یک رویداد مزایده؛ entries فهرست (user_id, type, message) است.
+
+    برای انواع NOTIFICATION_COALESCE_TYPES، اگر کاربر در NOTIFICATION_COALESCE_WINDOW
+    ثانیه گذشته اعلان خوانده‌نشده‌ای از همان نوع برای همین مزایده داشته باشد،
+    همان ردیف به اعلان خلاصه تبدیل می‌شود (count، متن و last_event_at به‌روز می‌شوند)
+    و ردیف تازه‌ای درج نمی‌شود. created_at تغییر نمی‌کند تا جایگاه ردیف در فهرست
+    cursor ثابت بماند؛ پنجره تجمیع از آخرین رویداد (last_event_at و در نبود آن
+    created_at) حساب می‌شود. ردیف خوانده‌شده هرگز تجمیع نمی‌شود، پس شمارنده
+    خوانده‌نشده‌ها برای ردیف به‌روزشده تغییر نمی‌کند.
+
+    خروجی: اعلان‌های ساخته یا به‌روزشده برای انتشار رویداد زنده.
+    """
+    now = now or timezone.now()
+    entries = list(entries)
+    types = [notification_type for _, notification_type, _ in entries
+             if notification_type in settings.NOTIFICATION_COALESCE_TYPES]
+    digests: Dict[Tuple[Any, str], UserNotification] = {}
+    if types and settings.NOTIFICATION_COALESCE_WINDOW > 0:
+        since = now - timedelta(seconds=settings.NOTIFICATION_COALESCE_WINDOW)
+        # ترتیب صعودی: در صورت وجود چند ردیف، جدیدترین جایگزین بقیه می‌شود
+        for notification in UserNotification.objects.filter(  # type: ignore
+            Q(last_event_at__gte=since) | Q(last_event_at__isnull=True, created_at__gte=since),
+            auction_id=auction['id'], read=False, type__in=types,
+            user_id__in=[user_id for user_id, _, _ in entries],
+        ).order_by('created_at', 'id'):
+            digests[(notification.user_id, notification.type)] = notification
+
+    created: List[UserNotification] = []
+    updated: List[UserNotification] = []
+    with transaction.atomic():
+        for user_id, notification_type, message in entries:
+            digest = digests.get((user_id, notification_type))
+            if digest is not None:
+                digest.count += 1
+                digest.message = DIGEST_MESSAGES[notification_type].format(
+                    count=digest.count, title=auction['title'], amount=_format_amount(amount)
+                )
+                digest.last_event_at = now
+                # شرط read=False: اگر کاربر در این فاصله اعلان را خوانده باشد ردیف تازه درج می‌شود
+                if UserNotification.objects.filter(pk=digest.pk, read=False).update(  # type: ignore
+                    count=F('count') + 1, message=digest.message, last_event_at=now
+                ):
+                    updated.append(digest)
+                    continue
+            created.append(UserNotification(
+                user_id=user_id, auction_id=auction['id'], type=notification_type, message=message, read=False
+            ))
+        created = UserNotification.objects.bulk_create(created)  # type: ignore
+        record_created(created)
+        adjust_counters({notification.user_id: 0 for notification in updated})  # type: ignore
+    return created + updated
+
+
+def adjust_counters(deltas: Dict[Any, int], create: bool = False) -> None:
+    """
+    تغییر شمارنده خوانده‌نشده‌ها (کاربر → تغییر) و بالا بردن نسخه اعلان‌های کاربر.
+
+    ردیف ناموجود فقط هنگام ایجاد اعلان (create) ساخته می‌شود (همان الگوی
+    rollups.apply)؛ حذف آبشاری کاربر پیش از اعلان‌هایش نباید شمارنده تازه‌ای بسازد.
+    """
+    if not deltas:
+        return
+
+    def update(user_id) -> int:
+        return NotificationCounter.objects.filter(user_id=user_id).update(  # type: ignore
+            unread=F('unread') + deltas[user_id], version=F('version') + 1
+        )
+
+    with transaction.atomic():
+        missing = [user_id for user_id in deltas if not update(user_id) and create]
+        if missing:
+            NotificationCounter.objects.bulk_create(  # type: ignore
+                [NotificationCounter(user_id=user_id) for user_id in missing], ignore_conflicts=True
+            )
+            for user_id in missing:
+                update(user_id)
+
+
+def record_created(notifications: Iterable[UserNotification]) -> None:
+    """برای اعلان‌هایی که با bulk_create ساخته شده‌اند و سیگنال post_save ندارند"""
+    deltas: Dict[Any, int] = Counter()
+    for notification in notifications:
+        deltas[notification.user_id] += 0 if notification.read else 1  # type: ignore
+    adjust_counters(deltas, create=True)
+
+
+def counter(user_id: Any) -> Dict[str, int]:
+    """
+    تعداد خوانده‌نشده‌ها و نسخه اعلان‌های کاربر با یک کوئری روی کلید اصلی، بدون COUNT.
+
+    در کش پروسه نگهداری نمی‌شود چون worker اعلان‌ها در پروسه دیگری شمارنده را تغییر می‌دهد.
+    """
+    row = NotificationCounter.objects.filter(user_id=user_id).values('unread', 'version').first()  # type: ignore
+    return row or {'unread': 0, 'version': 0}
+
+
+def mark_read(queryset, user_id: Any = None) -> int:
+    """
+    خوانده کردن اعلان‌های کوئری‌ست با یک UPDATE.
+
+    وقتی همه ردیف‌ها متعلق به user_id باشند، تعداد ردیف‌های تغییرکرده همان
+    تغییر شمارنده است؛ در غیر این صورت سهم هر کاربر پیش از UPDATE شمرده می‌شود.
+    """
+    unread = queryset.filter(read=False)
+    with transaction.atomic():
+        if user_id is None:
+            per_user = dict(unread.order_by().values_list('user_id').annotate(count=Count('id')))
+            updated = unread.update(read=True)
+        else:
+            updated = unread.update(read=True)
+            per_user = {user_id: updated}
+        adjust_counters({key: -count for key, count in per_user.items() if count})
+    return updated
+
+
+def rebuild_counters() -> int:
+    """بازسازی شمارنده‌ها از جدول اعلان‌ها"""
+    # نسخه جدید از زمان فعلی تا ETag های قبلی دوباره معتبر نشوند
+    version = time.time_ns()
+    rows = UserNotification.objects.values('user_id').annotate(  # type: ignore
+        unread=Count('id', filter=Q(read=False))
+    ).order_by()
+    with transaction.atomic():
+        NotificationCounter.objects.all().delete()  # type: ignore
+        NotificationCounter.objects.bulk_create([  # type: ignore
+            NotificationCounter(user_id=row['user_id'], unread=row['unread'], version=version) for row in rows
+        ], batch_size=1000)
+    return len(rows)
+
+
+def deliver_batch(job_id: Any, batch_size: Optional[int] = None) -> Tuple[int, bool]:
+    """
+    ساخت اعلان برای دسته بعدی گیرندگان یک کار صف.
+
+    هر دسته تراکنش کوتاه خودش را دارد تا قفل نوشتن طولانی نشود؛ cursor در
+    همان تراکنش جلو می‌رود، پس توقف پروسه اعلان تکراری یا گم‌شده ایجاد نمی‌کند.
+    خروجی: (تعداد اعلان‌های ساخته‌شده، پایان کار)
+    """
+    batch_size = batch_size or settings.NOTIFICATION_BATCH_SIZE
+    with transaction.atomic():
+        job = NotificationJob.objects.select_for_update().filter(pk=job_id).first()  # type: ignore
+        if job is None:
+            return 0, True
+        queryset, column = AUDIENCES[job.audience](job)
+        user_ids = list(
+            queryset.filter(**{f'{column}__gt': job.cursor}).exclude(**{f'{column}__in': job.exclude_ids})
+            .order_by(column).values_list(column, flat=True)[:batch_size]
+        )
+        _create(user_ids, job.type, job.message)
+        done = len(user_ids) < batch_size
+        if done:
+            job.delete()
+        else:
+            NotificationJob.objects.filter(pk=job.pk).update(cursor=user_ids[-1])  # type: ignore
+    return len(user_ids), done
+
+
+def drain(batch_size: Optional[int] = None, max_batches: Optional[int] = None) -> int:
+    """پخش کارهای صف به ترتیب ثبت؛ خروجی تعداد اعلان‌های ساخته‌شده"""
+    created = batches = 0
+    for job_id in NotificationJob.objects.order_by('id').values_list('id', flat=True):  # type: ignore
+        done = False
+        while not done:
+            if max_batches is not None and batches >= max_batches:
+                return created
+            count, done = deliver_batch(job_id, batch_size)
+            created += count
+            batches += 1
+    return created
+
+
+def run_forever(batch_size: Optional[int] = None, poll: float = 1.0, on_batch=None) -> None:
+    while True:
+        created = drain(batch_size)
+        if on_batch and created:
+            on_batch(created)
+        if not created:
+            time.sleep(poll)
@@ -0,0 +1,64 @@
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination
+
+
+class AuctionCursorPagination(CursorPagination):
+    """
+    صفحه‌بندی keyset برای کاتالوگ مزایده‌ها.
+
+    به‌جای OFFSET، موقعیت آخرین ردیف در cursor ذخیره می‌شود تا هزینه هر صفحه
+    مستقل از عمق آن باشد. ترتیب‌های مجاز با ?ordering= انتخاب می‌شوند.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    ordering = ('-created_at', '-id')
+    orderings = {
+        'newest': ('-created_at', '-id'),
+        'ending_soon': ('end_date', 'id'),
+    }
+
+    def get_page_size(self, request):
+        # مانند سایر پارامترهای کاتالوگ، مقدار نامعتبر خطای ۴۰۰ می‌دهد؛ مقدار بزرگ‌تر از سقف محدود می‌شود
+        value = request.query_params.get(self.page_size_query_param)
+        if value in (None, ''):
+            return self.page_size
+        try:
+            size = int(value)
+        except ValueError:
+            size = 0
+        if size < 1:
+            raise ValidationError({self.page_size_query_param: 'عدد نامعتبر است'})
+        return min(size, self.max_page_size)
+
+    def get_ordering(self, request, queryset, view):
+        key = request.query_params.get('ordering')
+        if not key:
+            return self.ordering
+        if key not in self.orderings:
+            raise ValidationError({'ordering': f'مقدارهای مجاز: {", ".join(self.orderings)}'})
+        return self.orderings[key]
+
+
+class BidCursorPagination(CursorPagination):
+    """تاریخچه پیشنهادهای یک مزایده؛ مبلغ پیشنهادها صعودی است، پس ترتیب مبلغ همان ترتیب زمانی است"""
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    ordering = ('-amount', '-id')
+
+
+class ParticipationCursorPagination(CursorPagination):
+    """صفحه‌بندی keyset تب‌های «مزایده‌های من» به ترتیب آخرین فعالیت"""
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-activity_at', '-id')
+
+
+class NotificationCursorPagination(CursorPagination):
+    """صفحه‌بندی keyset اعلان‌های کاربر روی ایندکس (user, created_at, id)"""
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-created_at', '-id')
@@ -0,0 +1,173 @@
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, DecimalField, F, Max, Q, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from .models import Auction, AuctionParticipation, Bid
+from .serializers import LeaderboardEntrySerializer
+
+# تب صفحه «مزایده‌های من» → پرچم نقش در نمایه مشارکت
+TABS = {
+    'created': 'is_creator',
+    'participated': 'is_bidder',
+    'won': 'is_winner',
+}
+
+# کلید هر ردیف نمایه: (user_id, auction_id)
+Key = Tuple[Any, Any]
+
+
+def _upsert(keys: Iterable[Key], update: Callable[[Key], int], create: Callable[[Key], AuctionParticipation]) -> None:
+    """
+    به‌روزرسانی ردیف‌های موجود؛ ردیف‌های ناموجود با ignore_conflicts ساخته و
+    دوباره به‌روز می‌شوند (همان الگوی rollups.apply برای درج هم‌زمان).
+    """
+    with transaction.atomic():
+        missing = [key for key in keys if not update(key)]
+        if missing:
+            AuctionParticipation.objects.bulk_create(  # type: ignore
+                [create(key) for key in missing], ignore_conflicts=True
+            )
+            for key in missing:
+                update(key)
+
+
+def record_bids(auction: Dict[str, Any], bids: Iterable[Bid], now=None) -> None:
+    """ثبت پیشنهادهای جدید یک مزایده فعال در نمایه مشارکت پیشنهاددهندگان"""
+    now = now or timezone.now()
+    per_user: Dict[Any, Tuple[int, Any]] = {}
+    for bid in bids:
+        count, amount = per_user.get(bid.bidder_id, (0, bid.amount))
+        per_user[bid.bidder_id] = (count + 1, max(amount, bid.amount))
+    if not per_user:
+        return
+
+    def update(key: Key) -> int:
+        count, amount = per_user[key[0]]
+        amount_value = Value(amount, output_field=DecimalField(max_digits=15, decimal_places=2))
+        return AuctionParticipation.objects.filter(user_id=key[0], auction_id=key[1]).update(  # type: ignore
+            is_bidder=True,
+            last_bid_amount=amount,
+            last_bid_at=now,
+            highest_bid_amount=Greatest(Coalesce(F('highest_bid_amount'), amount_value), amount_value),
+            bid_count=F('bid_count') + count,
+            auction_status='active',
+            activity_at=now,
+        )
+
+    _upsert(
+        [(user_id, auction['id']) for user_id in per_user], update,
+        lambda key: AuctionParticipation(user_id=key[0], auction_id=key[1], auction_status='active', activity_at=now),
+    )
+    invalidate_leaderboard(auction['id'])
+
+
+def record_created(auction: Auction) -> None:
+    _upsert(
+        [(auction.creator_id, auction.pk)],  # type: ignore
+        lambda key: AuctionParticipation.objects.filter(user_id=key[0], auction_id=key[1]).update(  # type: ignore
+            is_creator=True, auction_status=auction.status
+        ),
+        lambda key: AuctionParticipation(
+            user_id=key[0], auction_id=key[1], auction_status=auction.status, activity_at=auction.created_at
+        ),
+    )
+
+
+def record_status_change(auction_ids: Iterable[Any], new_status: str) -> None:
+    AuctionParticipation.objects.filter(auction_id__in=list(auction_ids)).update(  # type: ignore
+        auction_status=new_status
+    )
+
+
+def record_winners(winners: Dict[Any, Any], new_status: str, now=None) -> None:
+    """winners: شناسه مزایده → شناسه برنده (یا None)"""
+    if not winners:
+        return
+    now = now or timezone.now()
+    AuctionParticipation.objects.filter(  # type: ignore
+        auction_id__in=list(winners), is_winner=True
+    ).exclude(
+        user_id__in=[user_id for user_id in winners.values() if user_id is not None]
+    ).update(is_winner=False)
+    _upsert(
+        [(user_id, auction_id) for auction_id, user_id in winners.items() if user_id is not None],
+        lambda key: AuctionParticipation.objects.filter(user_id=key[0], auction_id=key[1]).update(  # type: ignore
+            is_winner=True, auction_status=new_status, activity_at=now
+        ),
+        lambda key: AuctionParticipation(user_id=key[0], auction_id=key[1], auction_status=new_status, activity_at=now),
+    )
+
+
+def tab_counts(user) -> Dict[str, int]:
+    """تعداد ردیف‌های هر تب با یک کوئری تجمیعی"""
+    return AuctionParticipation.objects.filter(user=user).aggregate(  # type: ignore
+        **{tab: Count('id', filter=Q(**{flag: True})) for tab, flag in TABS.items()}
+    )
+
+
+def _leaderboard_key(auction_id: Any) -> str:
+    return f'leaderboard:{auction_id}'
+
+
+def leaderboard(auction_id: Any) -> List[Dict[str, Any]]:
+    """
+    LEADERBOARD_SIZE پیشنهاددهنده برتر یک مزایده بر اساس بالاترین پیشنهاد هر کاربر.
+
+    از نمایه مشارکت (یک ردیف برای هر کاربر) با ایندکس (auction, highest_bid_amount)
+    خوانده و در کش نگهداری می‌شود؛ ثبت پیشنهاد جدید کلید را پاک می‌کند.
+    """
+    key = _leaderboard_key(auction_id)
+    entries = cache.get(key)
+    if entries is None:
+        rows = AuctionParticipation.objects.filter(  # type: ignore
+            auction_id=auction_id, is_bidder=True
+        ).select_related('user').order_by('-highest_bid_amount', 'last_bid_at')[:settings.LEADERBOARD_SIZE]
+        entries = [
+            {'rank': rank, **entry}
+            for rank, entry in enumerate(LeaderboardEntrySerializer(rows, many=True).data, start=1)
+        ]
+        cache.set(key, entries, settings.LEADERBOARD_CACHE_TTL)
+    return entries
+
+
+def invalidate_leaderboard(auction_id: Any) -> None:
+    transaction.on_commit(lambda: cache.delete(_leaderboard_key(auction_id)), robust=True)
+
+
+def rebuild(batch_size: int = 1000) -> int:
+    """بازسازی کامل نمایه از مزایده‌ها و پیشنهادها"""
+    rows: Dict[Key, Dict[str, Any]] = {}
+
+    def row(user_id, auction_id, status, activity_at) -> Dict[str, Any]:
+        entry = rows.setdefault((user_id, auction_id), {'auction_status': status, 'activity_at': activity_at})
+        entry['activity_at'] = max(entry['activity_at'], activity_at)
+        return entry
+
+    for auction in Auction.objects.values(  # type: ignore
+        'id', 'creator_id', 'winner_id', 'status', 'created_at', 'updated_at'
+    ):
+        row(auction['creator_id'], auction['id'], auction['status'], auction['created_at'])['is_creator'] = True
+        if auction['winner_id'] is not None:
+            row(auction['winner_id'], auction['id'], auction['status'], auction['updated_at'])['is_winner'] = True
+
+    statuses = dict(Auction.objects.values_list('id', 'status'))  # type: ignore
+    for bid in Bid.objects.values('bidder_id', 'auction_id').annotate(  # type: ignore
+        count=Count('id'), highest=Max('amount'), last_at=Max('created_at')
+    ).order_by():
+        entry = row(bid['bidder_id'], bid['auction_id'], statuses[bid['auction_id']], bid['last_at'])
+        # پیشنهادهای هر کاربر صعودی است، پس آخرین پیشنهاد همان بالاترین است
+        entry.update(is_bidder=True, bid_count=bid['count'], highest_bid_amount=bid['highest'],
+                     last_bid_amount=bid['highest'], last_bid_at=bid['last_at'])
+
+    with transaction.atomic():
+        AuctionParticipation.objects.all().delete()  # type: ignore
+        AuctionParticipation.objects.bulk_create([  # type: ignore
+            AuctionParticipation(user_id=user_id, auction_id=auction_id, **values)
+            for (user_id, auction_id), values in rows.items()
+        ], batch_size=batch_size)
+    return len(rows)
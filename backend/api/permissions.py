@@ -1,3 +1,4 @@
+from django.db.models import Q
 from rest_framework import permissions
 
 class IsAdminUser(permissions.BasePermission):
@@ -6,4 +7,18 @@ class IsAdminUser(permissions.BasePermission):
     """
     
     def has_permission(self, request, view):
-        return bool(request.user and request.user.is_authenticated and request.user.is_admin) 
\ No newline at end of file
+        return bool(request.user and request.user.is_authenticated and request.user.is_admin)
+
+
+# آگهی‌هایی که هنوز تایید نشده یا رد شده‌اند فقط برای سازنده و ادمین نمایش داده می‌شوند
+HIDDEN_AUCTION_STATUSES = ('pending_review', 'rejected')
+
+
+def visible_auctions(queryset, user):
+    """مزایده‌هایی از queryset که کاربر (یا کاربر ناشناس) اجازه دیدن آن‌ها را دارد"""
+    if user and user.is_authenticated and user.is_admin:
+        return queryset
+    hidden = Q(status__in=HIDDEN_AUCTION_STATUSES)
+    if user and user.is_authenticated:
+        hidden &= ~Q(creator_id=user.pk)
+    return queryset.exclude(hidden)
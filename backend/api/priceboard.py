@@ -0,0 +1,131 @@
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from . import caching
+from .ingest import FeedError, decimal_value, feed_rows, read
+from .models import ScrapPrice
+from .serializers import ScrapPriceSerializer
+
+BOARDS = [code for code, _ in ScrapPrice.BOARDS]
+
+# دقت ستون‌های retail و wholesale
+_QUANTUM = Decimal('0.01')
+
+
+def _snapshot_key(version: int) -> str:
+    return f'priceboard:snapshot:{version}'
+
+
+def snapshot(version: Optional[int] = None) -> Dict[str, Any]:
+    """
+    همه تابلوها در یک پاسخ، کش‌شده با کلید نسخه فضای نام PRICE_BOARD.
+
+    نسخه از جدول CacheVersion خوانده می‌شود و هر ingest (در هر پروسه‌ای) آن را
+    در همان تراکنش بالا می‌برد، پس ورودی قبلی هیچ‌گاه دوباره خوانده نمی‌شود و
+    TTL فقط برای آزاد شدن حافظه است. version خوانده‌شده توسط view را می‌توان
+    ارسال کرد تا کوئری نسخه تکرار نشود.
+    """
+    if version is None:
+        version = caching.version(caching.PRICE_BOARD)
+    key = _snapshot_key(version)
+    data = cache.get(key)
+    if data is None:
+        boards: Dict[str, Dict[str, Any]] = {
+            code: {'board': code, 'title': title, 'updated_at': None, 'prices': []}
+            for code, title in ScrapPrice.BOARDS
+        }
+        rows = list(ScrapPrice.objects.order_by('board', 'position', 'id'))  # type: ignore
+        for row, entry in zip(rows, ScrapPriceSerializer(rows, many=True).data):
+            board = boards[row.board]
+            board['prices'].append(entry)
+            board['updated_at'] = max(board['updated_at'] or entry['updated_at'], entry['updated_at'])
+        data = {'version': version, 'boards': list(boards.values())}
+        cache.set(key, data, settings.PRICE_BOARD_CACHE_TTL)
+    return data
+
+
+def parse(text: str) -> List[Dict[str, Any]]:
+    """
+    خواندن قیمت‌ها از JSON (فهرست یا {"prices": [...]}) یا CSV با سرآیند.
+
+    هر ردیف board، name، retail و wholesale دارد؛ ردیف آخر هر (board, name) معتبر است.
+    """
+    return parse_rows(feed_rows(text, 'prices'))
+
+
+def parse_rows(rows: List[Any]) -> List[Dict[str, Any]]:
+    max_length = ScrapPrice._meta.get_field('name').max_length  # type: ignore
+    prices: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for line, row in enumerate(rows, start=1):
+        if not isinstance(row, dict):
+            raise FeedError(f'ردیف {line}: قالب نامعتبر است')
+        board = str(row.get('board') or '').strip()
+        if board not in BOARDS:
+            raise FeedError(f'ردیف {line}: تابلو باید یکی از {", ".join(BOARDS)} باشد')
+        name = str(row.get('name') or '').strip()
+        if not name or len(name) > max_length:
+            raise FeedError(f'ردیف {line}: نام نامعتبر است')
+        for field in ('retail', 'wholesale'):
+            if row.get(field) in (None, ''):
+                raise FeedError(f'ردیف {line}: مقدار {field} ارسال نشده است')
+        prices[(board, name)] = {
+            'board': board,
+            'name': name,
+            'retail': decimal_value(row['retail'], line, 'retail', _QUANTUM),
+            'wholesale': decimal_value(row['wholesale'], line, 'wholesale', _QUANTUM),
+        }
+    return list(prices.values())
+
+
+def load(source: str) -> List[Dict[str, Any]]:
+    return parse(read(source))
+
+
+def ingest(prices: List[Dict[str, Any]], dry_run: bool = False, now=None) -> Dict[str, int]:
+    """
+    اعمال یک دسته قیمت روی تابلو، با همان روش ingest.ingest برای نرخ ارزها.
+
+    ردیف‌ها بر اساس (board, name) مقایسه و فقط تغییرها در یک تراکنش با
+    bulk_update / bulk_create نوشته می‌شوند؛ ردیف‌های جدید به انتهای تابلوی
+    خود اضافه می‌شوند. نسخه تابلو یک بار برای کل دسته بالا می‌رود.
+    """
+    now = now or timezone.now()
+    summary = {'total': len(prices), 'created': 0, 'updated': 0, 'unchanged': 0}
+    with transaction.atomic():
+        existing = {
+            (row.board, row.name): row
+            for row in ScrapPrice.objects.filter(  # type: ignore
+                board__in={price['board'] for price in prices}, name__in={price['name'] for price in prices}
+            )
+        }
+        positions = dict(ScrapPrice.objects.values_list('board').annotate(last=Max('position')).order_by())  # type: ignore
+
+        updated: List[ScrapPrice] = []
+        created: List[ScrapPrice] = []
+        for price in prices:
+            row = existing.get((price['board'], price['name']))
+            if row is None:
+                position = positions.get(price['board'], -1) + 1
+                positions[price['board']] = position
+                created.append(ScrapPrice(position=position, updated_at=now, **price))
+            elif (row.retail, row.wholesale) != (price['retail'], price['wholesale']):
+                row.retail, row.wholesale, row.updated_at = price['retail'], price['wholesale'], now
+                updated.append(row)
+            else:
+                summary['unchanged'] += 1
+
+        summary['created'] = len(created)
+        summary['updated'] = len(updated)
+        if dry_run or not (created or updated):
+            return summary
+
+        ScrapPrice.objects.bulk_update(updated, ['retail', 'wholesale', 'updated_at'])  # type: ignore
+        ScrapPrice.objects.bulk_create(created)  # type: ignore
+        caching.invalidate(caching.PRICE_BOARD)
+    return summary
@@ -0,0 +1,142 @@
+import re
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.db import connection, transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .models import Auction, Bid, CurrencyRate, User, UserNotification
+
+# مسیرهای پرمصرف API؛ {auction}، {user}، ... با شناسه داده‌های نمونه پر می‌شوند
+ENDPOINTS = (
+    '/api/auctions/',
+    '/api/auctions/?ordering=ending_soon',
+    '/api/auctions/?status=active&ordering=ending_soon',
+    '/api/auctions/?status=active&ending_within=24',
+    '/api/auctions/?category=metal',
+    '/api/auctions/?condition=used',
+    '/api/auctions/?location=tehran',
+    '/api/auctions/?updated_since={since}',
+    '/api/auctions/search/?q=metal',
+    '/api/auctions/{auction}/',
+    '/api/auctions/{auction}/bids/',
+    '/api/auctions/{auction}/leaderboard/',
+    '/api/profile/',
+    '/api/profile/auctions/?tab=created',
+    '/api/profile/auctions/?tab=participated',
+    '/api/profile/auctions/?tab=won',
+    '/api/notifications/',
+    '/api/notifications/unread-count/',
+    '/api/currency-rates/',
+    '/api/currency-rates/{currency}/history/',
+    '/api/price-board/',
+    '/api/admin/pending-approvals/',
+    '/api/admin/users/?subscription_type=gold',
+    '/api/admin/bids/?bidder_id={user}',
+    '/api/admin/bids/?auction_id={auction}',
+    '/api/admin/notifications/',
+    '/api/admin/notifications/?user_id={user}',
+)
+
+# جدول‌های مرجع کوچکی که عمداً به طور کامل برگردانده می‌شوند
+INTENTIONAL_SCANS = {'api_currencyrate'}
+
+# سطرهای طرح اجرا که پیمایش کامل یک جدول هستند
+_FULL_SCAN = {
+    'sqlite': re.compile(r'^SCAN (?P<table>[^\s(]\S*)$'),
+    'postgresql': re.compile(r'Seq Scan on (?P<table>\S+)'),
+}
+
+
+class QueryPlanError(ValueError):
+    """طرح اجرای کوئری روی این پایگاه داده قابل بررسی نیست"""
+
+
+def _full_scan_pattern(vendor: str):
+    if vendor not in _FULL_SCAN:
+        raise QueryPlanError(f'پایگاه داده {vendor} پشتیبانی نمی‌شود')
+    return _FULL_SCAN[vendor]
+
+
+def explain(sql: str, params: Any) -> List[str]:
+    """طرح اجرای یک کوئری به صورت سطرهای متنی"""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            return [row[-1] for row in cursor.fetchall()]
+        cursor.execute(f'EXPLAIN {sql}', params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def full_scans(plan: Iterable[str], vendor: Optional[str] = None) -> List[str]:
+    pattern = _full_scan_pattern(vendor or connection.vendor)
+    tables = [match.group('table') for match in map(pattern.search, (line.strip() for line in plan)) if match]
+    return [table.strip('"') for table in tables if table.strip('"') not in INTENTIONAL_SCANS]
+
+
+@contextmanager
+def _capture(queries: List[Tuple[str, Any]]):
+    def wrapper(execute, sql, params, many, context):
+        if not many and sql.lstrip().upper().startswith('SELECT'):
+            queries.append((sql, params))
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(wrapper):
+        yield
+
+
+def _seed() -> Dict[str, Any]:
+    now = timezone.now()
+    user = User.objects.create_user(
+        username='queryplan', email='queryplan@example.com', password='queryplan',
+        is_staff=True, is_admin=True, subscription_type='gold',
+    )
+    auction = Auction.objects.create(  # type: ignore
+        title='metal', description='metal', status='active', creator=user,
+        start_date=now - timedelta(hours=1), end_date=now + timedelta(hours=1),
+        starting_price=Decimal('100'), current_price=Decimal('100'),
+        category='metal', condition='used', location='tehran',
+    )
+    bid = Bid.objects.create(auction=auction, bidder=user, amount=Decimal('110'))  # type: ignore
+    notification = UserNotification.objects.create(  # type: ignore
+        user=user, type='new_bid', message='metal', read=False
+    )
+    currency = CurrencyRate.objects.create(name='دلار', code='USD', rate=Decimal('1'), change=Decimal('0'))  # type: ignore
+    return {'user': user.pk, 'auction': auction.pk, 'bid': bid.pk,
+            'notification': notification.pk, 'currency': currency.pk,
+            'since': int((now - timedelta(hours=1)).timestamp()), '_user': user}
+
+
+def report(endpoints: Iterable[str] = ENDPOINTS) -> List[Dict[str, Any]]:
+    """
+    اجرای GET روی هر مسیر و گزارش طرح اجرای کوئری‌های SELECT آن.
+
+    داده‌های نمونه و درخواست‌ها داخل یک تراکنش اجرا و در پایان rollback
+    می‌شوند و کش پاسخ غیرفعال است تا همه کوئری‌ها واقعاً اجرا شوند.
+    خروجی برای هر کوئری: endpoint، status، sql، plan و full_scans.
+    """
+    _full_scan_pattern(connection.vendor)
+
+    results: List[Dict[str, Any]] = []
+    dummy_cache = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+    with override_settings(CACHES=dummy_cache, ALLOWED_HOSTS=['*']), transaction.atomic():
+        ids = _seed()
+        client = APIClient()
+        client.force_authenticate(ids.pop('_user'))
+        for endpoint in endpoints:
+            path = endpoint.format(**ids)
+            queries: List[Tuple[str, Any]] = []
+            with _capture(queries):
+                response = client.get(path)
+            for sql, params in queries:
+                plan = explain(sql, params)
+                results.append({
+                    'endpoint': path, 'status': response.status_code, 'sql': sql,
+                    'plan': plan, 'full_scans': full_scans(plan),
+                })
+        transaction.set_rollback(True)
+    return results
@@ -0,0 +1,57 @@
+import csv
+import io
+import json
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from .fastjson import dumps
+
+
+def _rows(data):
+    if isinstance(data, dict):
+        return [data]
+    return list(data or [])
+
+
+class NDJSONRenderer(BaseRenderer):
+    """هر ردیف در یک خط JSON (newline-delimited JSON)"""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return ''.join(
+            json.dumps(row, cls=JSONEncoder, ensure_ascii=False) + '\n' for row in _rows(data)
+        ).encode(self.charset)
+
+
+class CSVRenderer(BaseRenderer):
+    """خروجی CSV؛ ستون‌ها از کلیدهای ردیف اول گرفته می‌شوند"""
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        rows = _rows(data)
+        if not rows:
+            return b''
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=list(rows[0]), extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+        return buffer.getvalue().encode(self.charset)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    همان خروجی JSONRenderer با کدگذار سریع (orjson در صورت نصب)؛
+    برای درخواست‌هایی که تورفتگی می‌خواهند به JSONRenderer برمی‌گردد.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type or '', renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
@@ -0,0 +1,112 @@
+import json
+import time
+import zlib
+from collections import Counter, defaultdict
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import notifications
+from .fastjson import UserNotificationRowSerializer, dumps
+from .models import NotificationArchive, UserNotification
+
+
+def _pack(entries: List[Dict[str, Any]]) -> bytes:
+    return zlib.compress(dumps(entries), 6)
+
+
+def unpack(archive: NotificationArchive) -> List[Dict[str, Any]]:
+    return json.loads(zlib.decompress(bytes(archive.data)))
+
+
+def _store(user_id: Any, entries: List[Dict[str, Any]], times: List[Any]) -> None:
+    """
+    افزودن اعلان‌ها به بایگانی کاربر؛ اگر آخرین دسته او هنوز پر نشده باشد، در
+    همان ردیف ادغام (compaction) و گرنه ردیف تازه ساخته می‌شود.
+    """
+    chunk_size = settings.NOTIFICATION_ARCHIVE_CHUNK_SIZE
+    latest = NotificationArchive.objects.filter(user_id=user_id).order_by('-id').first()  # type: ignore
+    if latest is not None and latest.count + len(entries) <= chunk_size:
+        merged = unpack(latest) + entries
+        NotificationArchive.objects.filter(pk=latest.pk).update(  # type: ignore
+            data=_pack(merged), count=len(merged),
+            first_created_at=min(latest.first_created_at, *times),
+            last_created_at=max(latest.last_created_at, *times),
+        )
+        return
+    for start in range(0, len(entries), chunk_size):
+        part, part_times = entries[start:start + chunk_size], times[start:start + chunk_size]
+        NotificationArchive.objects.create(  # type: ignore
+            user_id=user_id, data=_pack(part), count=len(part),
+            first_created_at=min(part_times), last_created_at=max(part_times),
+        )
+
+
+def archive_batch(cutoff, batch_size: Optional[int] = None) -> int:
+    """
+    انتقال یک دسته از اعلان‌های خوانده‌شده قدیمی‌تر از cutoff به بایگانی.
+
+    هر دسته تراکنش کوتاه خودش را دارد تا قفل نوشتن جدول اعلان‌ها طولانی نشود.
+    فقط اعلان‌های خوانده‌شده انتخاب می‌شوند؛ شمارنده خوانده‌نشده‌ها با تغییر
+    واقعی ردیف‌های حذف‌شده به‌روز و نسخه فهرست کاربران بالا می‌رود.
+    """
+    batch_size = batch_size or settings.NOTIFICATION_ARCHIVE_BATCH_SIZE
+    serializer = UserNotificationRowSerializer()
+    with transaction.atomic():
+        rows = list(UserNotificationRowSerializer.values(
+            UserNotification.objects.filter(read=True, created_at__lt=cutoff).order_by('created_at', 'id')  # type: ignore
+        )[:batch_size])
+        if not rows:
+            return 0
+        per_user: Dict[Any, Tuple[List[Dict[str, Any]], List[Any]]] = defaultdict(lambda: ([], []))
+        for row in rows:
+            entries, times = per_user[row['user']]
+            entries.append(serializer.to_representation(row))
+            times.append(row['created_at'])
+        for user_id, (entries, times) in per_user.items():
+            _store(user_id, entries, times)
+        # post_delete هر ردیف تغییر شمارنده خود را (با مقدار read هنگام حذف) در _counter_deltas
+        # همین حذف جمع می‌کند تا برای هر کاربر فقط یک UPDATE شمارنده اجرا شود
+        batch = UserNotification.objects.filter(pk__in=[row['id'] for row in rows])  # type: ignore
+        batch._counter_deltas = Counter({user_id: 0 for user_id in per_user})
+        batch.delete()
+        notifications.adjust_counters(batch._counter_deltas)
+    return len(rows)
+
+
+def archive(days: Optional[int] = None, batch_size: Optional[int] = None,
+            pause: float = 0.0, max_batches: Optional[int] = None) -> int:
+    """بایگانی دسته‌ای تا خالی شدن؛ pause فاصله بین دسته‌ها برای نوشتن‌های هم‌زمان است"""
+    cutoff = timezone.now() - timedelta(days=settings.NOTIFICATION_RETENTION_DAYS if days is None else days)
+    archived = batches = 0
+    while max_batches is None or batches < max_batches:
+        count = archive_batch(cutoff, batch_size)
+        archived += count
+        batches += 1
+        if not count:
+            break
+        if pause:
+            time.sleep(pause)
+    return archived
+
+
+def older(user_id: Any, before: Optional[int] = None) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    """
+    یک دسته از اعلان‌های بایگانی‌شده کاربر (جدیدترین اول) پیش از دسته before.
+
+    خروجی: (اعلان‌ها، شناسه دسته برای درخواست بعدی یا None)
+    """
+    queryset = NotificationArchive.objects.filter(user_id=user_id)  # type: ignore
+    if before is not None:
+        queryset = queryset.filter(id__lt=before)
+    chunk = queryset.order_by('-id').first()
+    if chunk is None:
+        return [], None
+    # اعلان‌هایی که دیرتر خوانده شده‌اند ممکن است در دسته‌های بعدی آمده باشند
+    entries = sorted(unpack(chunk), key=lambda entry: (parse_datetime(entry['created_at']), entry['id']),
+                     reverse=True)
+    return entries, chunk.pk if queryset.filter(id__lt=chunk.pk).exists() else None
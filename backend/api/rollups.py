@@ -0,0 +1,258 @@
+from collections import Counter
+from datetime import timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate, TruncMonth
+from django.utils import timezone
+
+from .models import Auction, AuctionDailyRollup, Bid, DailyCounter, User
+
+LISTING_TYPES = [code for code, _ in AuctionDailyRollup.LISTING_TYPES]
+
+# کلید هر ردیف خلاصه: (day, listing_type, category, status)
+RollupKey = Tuple[Any, str, str, str]
+
+
+def listing_type(condition: Optional[str]) -> str:
+    """نوع آگهی از فیلد condition؛ مقدار پیش‌فرض مزایده است"""
+    if condition in ('tender', 'inquiry'):
+        return condition
+    return 'auction'
+
+
+def rollup_key(created_at, condition: Optional[str], category: Optional[str], status: str) -> RollupKey:
+    return (timezone.localdate(created_at), listing_type(condition), category or '', status)
+
+
+def apply(auctions: Optional[Dict[RollupKey, int]] = None, bids: Optional[Dict[RollupKey, int]] = None) -> None:
+    """
+    اعمال تغییرات شمارنده‌ها روی جدول خلاصه.
+
+    برای هر کلید یک UPDATE با F() اجرا می‌شود؛ کلیدهایی که ردیف ندارند ابتدا
+    با ignore_conflicts ساخته می‌شوند تا درج هم‌زمان باعث گم شدن شمارش نشود.
+    """
+    deltas: Dict[RollupKey, List[int]] = {}
+    for index, changes in enumerate((auctions or {}, bids or {})):
+        for key, delta in changes.items():
+            if delta:
+                deltas.setdefault(key, [0, 0])[index] += delta
+    if not deltas:
+        return
+
+    def update(key: RollupKey) -> int:
+        day, kind, category, status = key
+        auction_delta, bid_delta = deltas[key]
+        return AuctionDailyRollup.objects.filter(  # type: ignore
+            day=day, listing_type=kind, category=category, status=status
+        ).update(auctions=F('auctions') + auction_delta, bids=F('bids') + bid_delta)
+
+    with transaction.atomic():
+        missing = [key for key in deltas if not update(key)]
+        if missing:
+            AuctionDailyRollup.objects.bulk_create([  # type: ignore
+                AuctionDailyRollup(day=day, listing_type=kind, category=category, status=status)
+                for day, kind, category, status in missing
+            ], ignore_conflicts=True)
+            for key in missing:
+                update(key)
+
+
+def bid_days(auction_ids: Iterable[Any]) -> Dict[Any, List[Tuple[Any, int]]]:
+    """تعداد پیشنهادهای هر مزایده به تفکیک روز ثبت: {auction_id: [(day, count), ...]}"""
+    result: Dict[Any, List[Tuple[Any, int]]] = {}
+    auction_ids = list(auction_ids)
+    if not auction_ids:
+        return result
+    for row in Bid.objects.filter(auction_id__in=auction_ids).annotate(  # type: ignore
+        day=TruncDate('created_at')
+    ).values('auction_id', 'day').annotate(total=Count('id')).order_by():
+        result.setdefault(row['auction_id'], []).append((row['day'], row['total']))
+    return result
+
+
+def _move_bids(changes: Counter, days: Iterable[Tuple[Any, int]], old_key: RollupKey,
+               new_key: Optional[RollupKey]) -> None:
+    # پیشنهادها با روز ثبت خودشان و نوع، دسته و وضعیت فعلی مزایده شمرده می‌شوند
+    for day, total in days:
+        changes[(day,) + old_key[1:]] -= total
+        if new_key is not None:
+            changes[(day,) + new_key[1:]] += total
+
+
+def record_status_change(rows: Iterable[Dict[str, Any]], new_status: str) -> None:
+    """
+    rows شامل id، created_at، condition، category و status قبلی هر آگهی است.
+
+    شمارش پیشنهادهای هر آگهی هم از وضعیت قبلی به وضعیت جدید منتقل می‌شود تا
+    فیلتر وضعیت روی سری پیشنهادها هم درست باشد (یک کوئری تجمیعی برای کل دسته).
+    """
+    moved = [row for row in rows if row['status'] != new_status]
+    days = bid_days(row['id'] for row in moved)
+    changes: Counter = Counter()
+    bids: Counter = Counter()
+    for row in moved:
+        old_key = rollup_key(row['created_at'], row['condition'], row['category'], row['status'])
+        new_key = rollup_key(row['created_at'], row['condition'], row['category'], new_status)
+        changes[old_key] -= 1
+        changes[new_key] += 1
+        _move_bids(bids, days.get(row['id'], ()), old_key, new_key)
+    apply(auctions=changes, bids=bids)
+
+
+def record_change(auction_id: Any, old_key: RollupKey, new_key: RollupKey) -> None:
+    """ویرایش یک آگهی (وضعیت، نوع یا دسته): انتقال شمارش آگهی و پیشنهادهای آن به کلید جدید"""
+    if old_key == new_key:
+        return
+    bids: Counter = Counter()
+    _move_bids(bids, bid_days([auction_id]).get(auction_id, ()), old_key, new_key)
+    apply(auctions={old_key: -1, new_key: 1}, bids=bids)
+
+
+def record_deleted(key: RollupKey, days: Iterable[Tuple[Any, int]]) -> None:
+    """حذف یک آگهی همراه با پیشنهادهایش (days خروجی bid_days پیش از حذف است)"""
+    bids: Counter = Counter()
+    _move_bids(bids, days, key, None)
+    apply(auctions={key: -1}, bids=bids)
+
+
+def record_bids(auction: Dict[str, Any], count: int, now=None) -> None:
+    """شمارش پیشنهادهای ثبت‌شده روی یک مزایده فعال در روز جاری"""
+    now = now or timezone.now()
+    apply(bids={rollup_key(now, auction['condition'], auction['category'], 'active'): count})
+
+
+def rebuild() -> int:
+    """بازسازی کامل جدول‌های خلاصه و شمارنده‌ها از روی داده‌های فعلی (برای مقداردهی اولیه)"""
+    auctions: Counter = Counter()
+    for row in Auction.objects.annotate(day=TruncDate('created_at')).values(  # type: ignore
+        'day', 'condition', 'category', 'status'
+    ).annotate(total=Count('id')).order_by():
+        auctions[(row['day'], listing_type(row['condition']), row['category'] or '', row['status'])] += row['total']
+
+    bids: Counter = Counter()
+    for row in Bid.objects.annotate(day=TruncDate('created_at')).values(  # type: ignore
+        'day', 'auction__condition', 'auction__category', 'auction__status'
+    ).annotate(total=Count('id')).order_by():
+        key = (row['day'], listing_type(row['auction__condition']), row['auction__category'] or '',
+               row['auction__status'])
+        bids[key] += row['total']
+
+    with transaction.atomic():
+        AuctionDailyRollup.objects.all().delete()  # type: ignore
+        rows = AuctionDailyRollup.objects.bulk_create([  # type: ignore
+            AuctionDailyRollup(day=key[0], listing_type=key[1], category=key[2], status=key[3],
+                               auctions=auctions.get(key, 0), bids=bids.get(key, 0))
+            for key in set(auctions) | set(bids)
+        ], batch_size=500)
+        DailyCounter.objects.all().delete()  # type: ignore
+        DailyCounter.objects.bulk_create([  # type: ignore
+            DailyCounter(day=row['day'], metric='users', value=row['total'])
+            for row in User.objects.annotate(day=TruncDate('created_at')).values('day').annotate(
+                total=Count('id')
+            ).order_by()
+        ], batch_size=500)
+    return len(rows)
+
+
+def increment_counter(metric: str, delta: int = 1, day=None) -> None:
+    """افزایش (یا کاهش) شمارنده روزانه یک معیار با همان الگوی UPDATE/درج apply"""
+    day = day or timezone.localdate()
+
+    def update() -> int:
+        return DailyCounter.objects.filter(day=day, metric=metric).update(  # type: ignore
+            value=F('value') + delta
+        )
+
+    with transaction.atomic():
+        if not update():
+            DailyCounter.objects.bulk_create(  # type: ignore
+                [DailyCounter(day=day, metric=metric)], ignore_conflicts=True
+            )
+            update()
+
+
+def daily_totals(since, until) -> Dict[Any, Dict[str, int]]:
+    """
+    شمارش روزانه کاربران، آگهی‌ها و پیشنهادهای جدید در بازه [since, until].
+
+    از جدول‌های خلاصه خوانده می‌شود (دو کوئری تجمیعی روی ردیف‌های روزانه)،
+    بنابراین هزینه به حجم جدول‌های اصلی بستگی ندارد.
+    """
+    totals: Dict[Any, Dict[str, int]] = {}
+    for row in AuctionDailyRollup.objects.filter(day__gte=since, day__lte=until).values('day').annotate(  # type: ignore
+        auction_total=Sum('auctions'), bid_total=Sum('bids')
+    ).order_by():
+        point = totals.setdefault(row['day'], {'users': 0, 'auctions': 0, 'bids': 0})
+        point['auctions'] = row['auction_total']
+        point['bids'] = row['bid_total']
+    for day, metric, value in DailyCounter.objects.filter(  # type: ignore
+        day__gte=since, day__lte=until
+    ).values_list('day', 'metric', 'value'):
+        totals.setdefault(day, {'users': 0, 'auctions': 0, 'bids': 0})[metric] = value
+    return totals
+
+
+def _empty_point() -> Dict[str, int]:
+    point = {kind: 0 for kind in LISTING_TYPES}
+    point['bids'] = 0
+    return point
+
+
+def trend_series(today=None, months: int = 6, category: Optional[str] = None,
+                 status: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    سری‌های امروز، دیروز، هفته، ماه و روند ماهانه از جدول خلاصه.
+
+    دو کوئری تجمیعی اجرا می‌شود (روزانه برای ۳۰ روز اخیر و ماهانه برای چند
+    ماه اخیر) و هزینه آن به تعداد آگهی‌ها بستگی ندارد.
+    """
+    today = today or timezone.localdate()
+    month_start = today - timedelta(days=29)
+    first_month = today.replace(day=1)
+    for _ in range(months - 1):
+        first_month = (first_month - timedelta(days=1)).replace(day=1)
+
+    queryset = AuctionDailyRollup.objects.all()  # type: ignore
+    if category:
+        queryset = queryset.filter(category=category)
+    if status:
+        queryset = queryset.filter(status__in=status)
+
+    days: Dict[Any, Dict[str, int]] = {}
+    for row in queryset.filter(day__gte=month_start, day__lte=today).values('day', 'listing_type').annotate(
+        total=Sum('auctions'), bid_total=Sum('bids')
+    ).order_by():
+        point = days.setdefault(row['day'], _empty_point())
+        point[row['listing_type']] += row['total']
+        point['bids'] += row['bid_total']
+
+    by_month: Dict[Any, Dict[str, int]] = {}
+    for row in queryset.filter(day__gte=first_month, day__lte=today).annotate(month=TruncMonth('day')).values(
+        'month', 'listing_type'
+    ).annotate(total=Sum('auctions'), bid_total=Sum('bids')).order_by():
+        point = by_month.setdefault(row['month'], _empty_point())
+        point[row['listing_type']] += row['total']
+        point['bids'] += row['bid_total']
+
+    def daily(count: int) -> List[Dict[str, Any]]:
+        series = []
+        for offset in range(count - 1, -1, -1):
+            day = today - timedelta(days=offset)
+            series.append({'date': day.isoformat(), **days.get(day, _empty_point())})
+        return series
+
+    monthly = []
+    month = first_month
+    while month <= today:
+        monthly.append({'month': month.strftime('%Y-%m'), **by_month.get(month, _empty_point())})
+        month = (month + timedelta(days=32)).replace(day=1)
+
+    return {
+        'today': days.get(today, _empty_point()),
+        'yesterday': days.get(today - timedelta(days=1), _empty_point()),
+        'week': daily(7),
+        'month': daily(30),
+        'months': monthly,
+    }
@@ -0,0 +1,7 @@
+from django.urls import path
+
+from .consumers import LiveEventConsumer
+
+websocket_urlpatterns = [
+    path('ws/live/', LiveEventConsumer.as_asgi()),
+]
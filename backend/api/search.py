@@ -0,0 +1,133 @@
+import re
+from typing import Any, Iterable, List, Optional
+
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, When
+
+# جدول FTS5 (فقط روی SQLite)؛ rowid همان شناسه مزایده است
+SEARCH_TABLE = 'api_auction_search'
+SEARCH_COLUMNS = ('title', 'description', 'category', 'location')
+# وزن ستون‌ها در رتبه‌بندی bm25 به ترتیب SEARCH_COLUMNS
+SEARCH_WEIGHTS = (10.0, 1.0, 4.0, 2.0)
+
+_CHARACTER_MAP = str.maketrans({
+    '\u064a': '\u06cc', '\u0649': '\u06cc', '\u0626': '\u06cc',  # ي ى ئ → ی
+    '\u0643': '\u06a9',  # ك → ک
+    '\u06c0': '\u0647', '\u0629': '\u0647',  # ۀ ة → ه
+    '\u0623': '\u0627', '\u0625': '\u0627', '\u0671': '\u0627',  # أ إ ٱ → ا
+    '\u0624': '\u0648',  # ؤ → و
+    '\u200c': ' ',  # نیم‌فاصله
+    '\u200d': '', '\u0640': '',  # ZWJ و کشیده
+    **{chr(0x06f0 + digit): str(digit) for digit in range(10)},  # ارقام فارسی
+    **{chr(0x0660 + digit): str(digit) for digit in range(10)},  # ارقام عربی
+})
+# اعراب عربی (فتحه، کسره، تنوین، تشدید، ...)
+_DIACRITICS = re.compile('[\u064b-\u065f\u0670]')
+_TOKEN = re.compile(r'\w+')
+
+
+def normalize(text: Optional[str]) -> str:
+    """
+    یکسان‌سازی متن فارسی برای نمایه و جستجو: ی و ک عربی، ه و الف‌های
+    همزه‌دار، نیم‌فاصله، کشیده، اعراب و ارقام فارسی/عربی.
+    """
+    if not text:
+        return ''
+    return _DIACRITICS.sub('', text.translate(_CHARACTER_MAP)).lower()
+
+
+def tokens(query: str) -> List[str]:
+    return _TOKEN.findall(normalize(query))
+
+
+def is_supported() -> bool:
+    return connection.vendor == 'sqlite'
+
+
+def _row(auction) -> List[Any]:
+    return [auction.pk] + [normalize(getattr(auction, column)) for column in SEARCH_COLUMNS]
+
+
+def index_auctions(auctions: Iterable[Any]) -> None:
+    """افزودن یا جایگزینی ردیف‌های نمایه برای مزایده‌های داده‌شده"""
+    if not is_supported():
+        return
+    rows = [_row(auction) for auction in auctions]
+    if not rows:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s', [[row[0]] for row in rows])
+        cursor.executemany(
+            f'INSERT INTO {SEARCH_TABLE} (rowid, {", ".join(SEARCH_COLUMNS)}) VALUES (%s, %s, %s, %s, %s)',
+            rows,
+        )
+
+
+def remove_auction(auction_id: Any) -> None:
+    if not is_supported():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s', [auction_id])
+
+
+def rebuild(auction_model, batch_size: int = 1000) -> int:
+    """بازسازی کامل نمایه؛ auction_model می‌تواند مدل تاریخی یک migration باشد"""
+    if not is_supported():
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+    count = 0
+    queryset = auction_model.objects.order_by('pk').only('pk', *SEARCH_COLUMNS)
+    last_pk = 0
+    while True:
+        batch = list(queryset.filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            return count
+        index_auctions(batch)
+        count += len(batch)
+        last_pk = batch[-1].pk
+
+
+def _match_expression(words: List[str]) -> str:
+    # هر واژه به صورت پیشوندی جستجو می‌شود تا نتیجه هنگام تایپ هم به‌دست آید
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def ranked_ids(query: str, limit: int) -> List[int]:
+    words = tokens(query)
+    if not words:
+        return []
+    weights = ', '.join(str(weight) for weight in SEARCH_WEIGHTS)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s '
+            f'ORDER BY bm25({SEARCH_TABLE}, {weights}) LIMIT %s',
+            [_match_expression(words), limit],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def search_auctions(queryset, query: str, limit: int = 100):
+    """
+    جستجوی متنی مزایده‌ها با ترتیب مرتبط‌ترین نتایج.
+
+    روی SQLite از نمایه FTS5 استفاده می‌شود؛ روی پایگاه‌های دیگر به جستجوی
+    icontains روی همان ستون‌ها (به ترتیب جدیدترین) برمی‌گردد.
+    """
+    if not is_supported():
+        words = query.split()
+        if not words:
+            return queryset.none()
+        for word in words:
+            condition = Q()
+            for column in SEARCH_COLUMNS:
+                condition |= Q(**{f'{column}__icontains': word})
+            queryset = queryset.filter(condition)
+        return queryset.order_by('-created_at')[:limit]
+
+    # نتایج اضافه برای جبران ردیف‌هایی که فیلترهای queryset حذف می‌کنند
+    ids = ranked_ids(query, limit * 5)
+    if not ids:
+        return queryset.none()
+    rank = Case(*[When(pk=pk, then=position) for position, pk in enumerate(ids)], output_field=IntegerField())
+    return queryset.filter(pk__in=ids).annotate(search_rank=rank).order_by('search_rank')[:limit]
@@ -1,7 +1,10 @@
 from rest_framework import serializers
-from .models import User, Auction, Bid, CurrencyRate, UserNotification
+from .models import (
+    User, Auction, AuctionParticipation, Bid, ProxyBid, CurrencyRate, CurrencyRateCandle, ScrapPrice, UserNotification
+)
+from .sparse import SparseFieldsMixin
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'username', 'email', 'phone_number', 'address', 'company', 'national_id', 'profile_image', 'subscription_type', 'subscription_start_date', 'subscription_end_date', 'subscription_active', 'is_admin', 'created_at', 'updated_at']
@@ -14,9 +17,17 @@ class UserSerializer(serializers.ModelSerializer):
         user = User.objects.create_user(**validated_data)
         return user
 
-class AuctionSerializer(serializers.ModelSerializer):
-    creator = UserSerializer(read_only=True)
-    winner = UserSerializer(read_only=True)
+class PublicUserSerializer(serializers.ModelSerializer):
+    """خلاصه عمومی کاربر برای نمایش تو در تو (بدون آدرس، کد ملی و اطلاعات اشتراک)"""
+    class Meta:
+        model = User
+        fields = ['id', 'username', 'first_name', 'last_name', 'company', 'profile_image']
+        read_only_fields = fields
+
+class AuctionSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    expandable_fields = ('creator', 'winner')
+    creator = PublicUserSerializer(read_only=True)
+    winner = PublicUserSerializer(read_only=True)
     current_price = serializers.DecimalField(read_only=True, max_digits=15, decimal_places=2)
     
     class Meta:
@@ -25,28 +36,75 @@ class AuctionSerializer(serializers.ModelSerializer):
                 'starting_price', 'current_price', 'category', 'condition', 'location',
                 'creator', 'winner', 'created_at', 'updated_at']
 
-class BidSerializer(serializers.ModelSerializer):
-    bidder = UserSerializer(read_only=True)
+class AuctionParticipationSerializer(serializers.ModelSerializer):
+    """ردیف نمایه مشارکت به همراه خلاصه مزایده برای صفحه «مزایده‌های من»"""
+    auction = AuctionSerializer(read_only=True)
+    status = serializers.CharField(source='auction_status', read_only=True)
+
+    class Meta:
+        model = AuctionParticipation
+        fields = ['id', 'auction', 'status', 'is_creator', 'is_bidder', 'is_winner',
+                  'last_bid_amount', 'last_bid_at', 'highest_bid_amount', 'bid_count', 'activity_at']
+        read_only_fields = fields
+
+class LeaderboardEntrySerializer(serializers.ModelSerializer):
+    bidder = PublicUserSerializer(source='user', read_only=True)
+    amount = serializers.DecimalField(source='highest_bid_amount', max_digits=15, decimal_places=2, read_only=True)
+
+    class Meta:
+        model = AuctionParticipation
+        fields = ['bidder', 'amount', 'bid_count', 'last_bid_at']
+        read_only_fields = fields
+
+class BidSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    expandable_fields = ('bidder',)
+    bidder = PublicUserSerializer(read_only=True)
     
     class Meta:
         model = Bid
         fields = ['id', 'auction', 'bidder', 'amount', 'created_at']
+        read_only_fields = ['auction']
 
     def validate_amount(self, value):
-        auction = self.context['auction']
-        if value <= auction.current_price:
+        if value <= 0:
+            raise serializers.ValidationError('Bid amount must be positive')
+        # بررسی نهایی قیمت به‌صورت اتمیک در api.bidding.place_bid انجام می‌شود
+        auction = self.context.get('auction')
+        if auction is not None and value <= auction.current_price:
             raise serializers.ValidationError('Bid amount must be higher than current price')
         return value
 
-class CurrencyRateSerializer(serializers.ModelSerializer):
+class ProxyBidSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ProxyBid
+        fields = ['id', 'auction', 'max_amount', 'created_at', 'updated_at']
+        read_only_fields = ['auction']
+
+    def validate_max_amount(self, value):
+        if value <= 0:
+            raise serializers.ValidationError('Maximum amount must be positive')
+        return value
+
+class CurrencyRateSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = CurrencyRate
         fields = ['id', 'name', 'code', 'rate', 'change', 'last_updated']
 
+class CurrencyRateCandleSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = CurrencyRateCandle
+        fields = ['resolution', 'start', 'open', 'high', 'low', 'close', 'ticks']
+
+class ScrapPriceSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ScrapPrice
+        fields = ['name', 'retail', 'wholesale', 'updated_at']
+
 class UserNotificationSerializer(serializers.ModelSerializer):
     class Meta:
         model = UserNotification
-        fields = ['id', 'user', 'type', 'message', 'read', 'created_at']
+        fields = ['id', 'user', 'type', 'message', 'read', 'auction', 'count', 'created_at', 'last_event_at']
+        read_only_fields = ['count', 'last_event_at']
 
 class UserLoginSerializer(serializers.Serializer):
     email = serializers.EmailField()
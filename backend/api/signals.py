@@ -0,0 +1,164 @@
+from django.db.models.signals import post_delete, post_init, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import caching, history, notifications, participation, rollups, search
+from .events import publish_notification, publish_status_changes
+from .models import Auction, AuctionTombstone, Bid, CurrencyRate, ScrapPrice, User, UserNotification
+
+
+def _auction_rollup_key(instance, status):
+    return rollups.rollup_key(instance.created_at, instance.condition, instance.category, status)
+
+
+@receiver(post_init, sender=Auction)
+def remember_auction_status(sender, instance, **kwargs):
+    # از __dict__ خوانده می‌شود تا فیلد deferred باعث کوئری اضافه نشود
+    instance._initial_status = instance.__dict__.get('status')
+    instance._initial_condition = instance.__dict__.get('condition')
+    instance._initial_category = instance.__dict__.get('category')
+    instance._initial_winner_id = instance.__dict__.get('winner_id')
+
+
+@receiver(post_save, sender=Auction)
+def auction_status_changed(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_initial_status', None)
+    if (created and instance.status == 'active') or (not created and previous != instance.status):
+        publish_status_changes([instance.pk], instance.status)
+
+    # به‌روزرسانی جدول خلاصه نمودار روند
+    new_key = _auction_rollup_key(instance, instance.status)
+    if created:
+        rollups.apply(auctions={new_key: 1})
+        participation.record_created(instance)
+        if instance.winner_id is not None:
+            participation.record_winners({instance.pk: instance.winner_id}, instance.status)
+    else:
+        old_key = rollups.rollup_key(
+            instance.created_at, instance._initial_condition, instance._initial_category, previous
+        )
+        if previous is not None:
+            rollups.record_change(instance.pk, old_key, new_key)
+        # فیلدهای deferred (مقدار اولیه نامعلوم) تغییر نکرده فرض می‌شوند
+        if previous is not None and previous != instance.status:
+            participation.record_status_change([instance.pk], instance.status)
+        winner_id = instance.__dict__.get('winner_id')
+        if 'winner_id' in instance.__dict__ and winner_id != getattr(instance, '_initial_winner_id', winner_id):
+            participation.record_winners({instance.pk: winner_id}, instance.status)
+
+    instance._initial_status = instance.status
+    instance._initial_condition = instance.condition
+    instance._initial_category = instance.category
+    instance._initial_winner_id = instance.__dict__.get('winner_id')
+
+    search.index_auctions([instance])
+
+
+@receiver(pre_delete, sender=Auction)
+def remember_auction_bids(sender, instance, origin=None, **kwargs):
+    # پیشنهادها (cascade) پیش از post_delete مزایده حذف می‌شوند؛ شمارش آن‌ها از قبل خوانده
+    # و شناسه مزایده روی origin همین حذف علامت زده می‌شود تا bid_deleted دوباره کم نکند
+    instance._rollup_bid_days = rollups.bid_days([instance.pk]).get(instance.pk, [])
+    if origin is not None:
+        if not hasattr(origin, '_deleted_auction_ids'):
+            origin._deleted_auction_ids = set()
+        origin._deleted_auction_ids.add(instance.pk)
+
+
+@receiver(post_delete, sender=Auction)
+def auction_deleted(sender, instance, **kwargs):
+    rollups.record_deleted(
+        _auction_rollup_key(instance, instance.status), getattr(instance, '_rollup_bid_days', ())
+    )
+    search.remove_auction(instance.pk)
+    # نشانه حذف برای همگام‌سازی تغییرات (updated_since) کلاینت‌ها
+    AuctionTombstone.objects.create(auction_id=instance.pk)  # type: ignore
+
+
+@receiver(post_delete, sender=Bid)
+def bid_deleted(sender, instance, origin=None, **kwargs):
+    # پیشنهادهای مزایده‌ای که در همین عملیات حذف می‌شود در auction_deleted کم شده‌اند
+    if instance.auction_id in getattr(origin, '_deleted_auction_ids', ()):
+        return
+    auction = Auction.objects.filter(pk=instance.auction_id).values(  # type: ignore
+        'condition', 'category', 'status'
+    ).first()
+    if auction is not None:
+        rollups.apply(bids={
+            rollups.rollup_key(instance.created_at, auction['condition'], auction['category'], auction['status']): -1
+        })
+
+
+@receiver(post_save, sender=Auction)
+@receiver(post_delete, sender=Auction)
+@receiver(post_save, sender=Bid)
+@receiver(post_delete, sender=Bid)
+def invalidate_auction_cache(sender, created=False, **kwargs):
+    # پیشنهاد جدید فقط در bidding ثبت می‌شود که نسخه را پس از commit بالا می‌برد
+    if sender is Bid and created:
+        return
+    caching.invalidate(caching.AUCTIONS)
+
+
+@receiver(post_save, sender=CurrencyRate)
+@receiver(post_delete, sender=CurrencyRate)
+def invalidate_currency_cache(sender, **kwargs):
+    caching.invalidate(caching.CURRENCIES)
+
+
+@receiver(post_save, sender=ScrapPrice)
+@receiver(post_delete, sender=ScrapPrice)
+def invalidate_price_board(sender, **kwargs):
+    caching.invalidate(caching.PRICE_BOARD)
+
+
+@receiver(post_init, sender=CurrencyRate)
+def remember_currency_rate(sender, instance, **kwargs):
+    instance._initial_rate = instance.__dict__.get('rate')
+
+
+@receiver(post_save, sender=CurrencyRate)
+def currency_rate_changed(sender, instance, created, **kwargs):
+    # ذخیره بدون تغییر نرخ (مثلاً ویرایش نام) تیک تازه‌ای در تاریخچه ثبت نمی‌کند
+    if created or instance._initial_rate != instance.rate:
+        history.record([(instance.pk, instance.rate, timezone.now())])
+    instance._initial_rate = instance.rate
+
+
+@receiver(post_save, sender=User)
+def user_created(sender, instance, created, **kwargs):
+    if created:
+        rollups.increment_counter('users', 1, timezone.localdate(instance.created_at))
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    rollups.increment_counter('users', -1, timezone.localdate(instance.created_at))
+
+
+@receiver(post_init, sender=UserNotification)
+def remember_notification_read(sender, instance, **kwargs):
+    instance._initial_read = instance.__dict__.get('read')
+
+
+@receiver(post_save, sender=UserNotification)
+def notification_created(sender, instance, created, **kwargs):
+    if created:
+        publish_notification(instance)
+        notifications.adjust_counters({instance.user_id: 0 if instance.read else 1}, create=True)
+    else:
+        previous = getattr(instance, '_initial_read', None)
+        delta = 0 if previous is None or previous == instance.read else (-1 if instance.read else 1)
+        notifications.adjust_counters({instance.user_id: delta})
+    instance._initial_read = instance.read
+
+
+@receiver(post_delete, sender=UserNotification)
+def notification_deleted(sender, instance, origin=None, **kwargs):
+    delta = 0 if instance.read else -1
+    # حذف دسته‌ای (retention.archive_batch) تغییرها را جمع می‌کند و یک بار اعمال می‌کند
+    deltas = getattr(origin, '_counter_deltas', None)
+    if deltas is not None:
+        deltas[instance.user_id] += delta
+    else:
+        notifications.adjust_counters({instance.user_id: delta})
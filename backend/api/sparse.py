@@ -0,0 +1,107 @@
+from typing import Iterable, Optional, Set, Tuple
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+
+def _split(value: Optional[str]) -> Optional[Set[str]]:
+    if value is None:
+        return None
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+def requested_fields(request) -> Tuple[Optional[Set[str]], Set[str]]:
+    """
+    پارامترهای ?fields= و ?expand= درخواست.
+
+    فقط برای درخواست‌های خواندنی اعمال می‌شوند تا اعتبارسنجی نوشتن تغییر نکند.
+    خروجی (None, ...) یعنی همه فیلدها با نمایش پیش‌فرض.
+    """
+    if request is None or request.method not in ('GET', 'HEAD'):
+        return None, set()
+    params = request.query_params
+    fields = _split(params.get('fields'))
+    expand = _split(params.get('expand')) or set()
+    if fields is None and not expand:
+        return None, set()
+    return fields, expand
+
+
+class SparseFieldsMixin:
+    """
+    خروجی و کوئری محدود به فیلدهای درخواست‌شده (?fields=id,title).
+
+    وقتی ?fields= یا ?expand= داده شود، روابط expandable_fields فقط با شناسه
+    نمایش داده می‌شوند و JOIN آن‌ها حذف می‌شود، مگر در ?expand= آمده باشند.
+    بدون این پارامترها خروجی همان نمایش پیش‌فرض سریالایزر است.
+    """
+    expandable_fields: Tuple[str, ...] = ()
+
+    def _is_root(self) -> bool:
+        parent = self.parent  # type: ignore
+        return parent is None or (isinstance(parent, serializers.ListSerializer) and parent.parent is None)
+
+    def get_fields(self):
+        fields = super().get_fields()  # type: ignore
+        if not self._is_root():
+            return fields
+        requested, expand = requested_fields(self.context.get('request'))  # type: ignore
+        if requested is None and not expand:
+            return fields
+
+        unknown = (requested or set()) - set(fields)
+        if unknown:
+            raise ValidationError({'fields': f'فیلدهای نامعتبر: {", ".join(sorted(unknown))}'})
+        not_expandable = expand - set(self.expandable_fields)
+        if not_expandable:
+            raise ValidationError({'expand': f'مقدارهای مجاز: {", ".join(self.expandable_fields)}'})
+
+        for name in list(fields):
+            if requested is not None and name not in requested and name not in expand:
+                del fields[name]
+            elif name in self.expandable_fields and name not in expand:
+                fields[name] = serializers.PrimaryKeyRelatedField(read_only=True)
+        return fields
+
+    @classmethod
+    def sparse_queryset(cls, queryset, request, extra: Iterable[str] = ()):
+        """
+        محدود کردن ستون‌های کوئری (only) و JOIN ها (select_related) به فیلدهای
+        درخواست‌شده. extra ستون‌هایی است که view خودش لازم دارد (مثل ستون‌های
+        ترتیب صفحه‌بندی). اگر فیلدی به ستون مدل نگاشت نشود، کوئری تغییر نمی‌کند.
+        """
+        requested, expand = requested_fields(request)
+        if requested is None and not expand:
+            return queryset
+
+        model = queryset.model
+        columns = {model._meta.pk.name, *extra}
+        related = []
+        for name, field in cls(context={'request': request}).fields.items():
+            if name in expand:
+                related.append(field.source)
+                columns.update(f'{field.source}__{child.source}' for child in field.fields.values())
+                continue
+            try:
+                model._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                return queryset
+            columns.add(field.source)
+        # select_related() بدون آرگومان همه روابط را JOIN می‌کند
+        queryset = queryset.select_related(None)
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset.only(*columns)
+
+
+class SparseFieldsViewMixin:
+    """اعمال ?fields= / ?expand= روی کوئری‌ست view پیش از اجرا"""
+    # ستون‌هایی که view جدا از فیلدهای خروجی به آن‌ها نیاز دارد
+    sparse_extra_fields: Tuple[str, ...] = ()
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)  # type: ignore
+        return self.get_serializer_class().sparse_queryset(  # type: ignore
+            queryset, self.request, extra=self.sparse_extra_fields  # type: ignore
+        )
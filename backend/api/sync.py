@@ -0,0 +1,109 @@
+import base64
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from typing import Any, Dict, Tuple
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+
+from .models import AuctionTombstone
+
+# آگهی‌هایی که در نسخه محلی کلاینت باید حذف شوند
+TOMBSTONE_STATUSES = ('rejected',)
+
+Position = Tuple[datetime, int]
+
+
+def encode_cursor(position: Position) -> str:
+    updated_at, last_id = position
+    raw = f'{updated_at.isoformat()}|{last_id}'.encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def parse_since(value: str) -> Position:
+    """
+    updated_since می‌تواند cursor برگشتی از پاسخ قبلی، زمان ISO 8601 یا
+    زمان یونیکس (ثانیه) باشد. برای زمان خام، ردیف‌های هم‌زمان هم برگردانده می‌شوند.
+    """
+    try:
+        padded = value + '=' * (-len(value) % 4)
+        stamp, last_id = base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8').split('|')
+        updated_at = parse_datetime(stamp)
+        if updated_at is not None:
+            return updated_at, int(last_id)
+    except (ValueError, UnicodeError):
+        pass
+
+    try:
+        return datetime.fromtimestamp(float(value), tz=dt_timezone.utc), 0
+    except (ValueError, OverflowError, OSError):
+        pass
+    try:
+        updated_at = parse_datetime(value)
+    except ValueError:
+        updated_at = None
+    if updated_at is None:
+        raise ValidationError({'updated_since': 'cursor یا زمان نامعتبر است'})
+    if timezone.is_naive(updated_at):
+        updated_at = timezone.make_aware(updated_at)
+    return updated_at, 0
+
+
+def changes(queryset, since: Position, limit: int, serialize, visible=None) -> Dict[str, Any]:
+    """
+    تغییرات مزایده‌ها پس از موقعیت since به ترتیب (updated_at, id).
+
+    visible کوئری‌ست فیلترشده کلاینت است؛ ردیفی که تغییر کرده ولی دیگر با
+    فیلترها مطابقت ندارد (مثلاً وضعیتش عوض شده) هم در deleted می‌آید.
+    خروجی شامل ردیف‌های تغییرکرده، شناسه‌های حذف‌شده یا ردشده (deleted)، cursor
+    بعدی و has_more است. cursor نهایی تا DELTA_SYNC_OVERLAP_SECONDS ثانیه عقب‌تر
+    از زمان فعلی نگه داشته می‌شود تا ردیف‌هایی که تراکنششان دیرتر commit شده
+    از دست نروند؛ کلاینت باید ردیف‌ها را بر اساس id جایگزین کند.
+    """
+    now = timezone.now()
+    since_at, since_id = since
+    if since_at < now - timedelta(days=settings.DELTA_SYNC_TOMBSTONE_DAYS):
+        # نشانه‌های حذف قدیمی‌تر پاک شده‌اند؛ کلاینت باید کل فهرست را دوباره بگیرد
+        return {'resync': True}
+
+    rows = list(
+        queryset.filter(Q(updated_at__gt=since_at) | Q(updated_at=since_at, id__gt=since_id))
+        .order_by('updated_at', 'id')[:limit + 1]
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    if has_more:
+        position = (rows[-1].updated_at, rows[-1].id)
+        until = rows[-1].updated_at
+    else:
+        settled = now - timedelta(seconds=settings.DELTA_SYNC_OVERLAP_SECONDS)
+        if not rows:
+            position = (settled, 0) if settled > since_at else (since_at, since_id)
+        elif rows[-1].updated_at <= settled:
+            position = (rows[-1].updated_at, rows[-1].id)
+        else:
+            position = (max(since_at, settled), 0)
+        until = now
+
+    hidden = {auction.id for auction in rows if auction.status in TOMBSTONE_STATUSES}
+    if visible is not None and rows:
+        changed = [auction.id for auction in rows if auction.id not in hidden]
+        matching = set(visible.filter(id__in=changed).values_list('id', flat=True))
+        hidden.update(pk for pk in changed if pk not in matching)
+
+    deleted = list(hidden)
+    deleted += list(
+        AuctionTombstone.objects.filter(  # type: ignore
+            deleted_at__gte=since_at, deleted_at__lte=until
+        ).values_list('auction_id', flat=True)
+    )
+    return {
+        'results': serialize([auction for auction in rows if auction.id not in hidden]),
+        'deleted': sorted(set(deleted)),
+        'cursor': encode_cursor(position),
+        'has_more': has_more,
+    }
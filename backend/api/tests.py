@@ -1,3 +1,1717 @@
-from django.test import TestCase
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from importlib import import_module
 
-# Create your tests here.
+from django.apps import apps
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models import Q
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from channels.db import database_sync_to_async
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from . import caching, history, ingest, notifications, participation, priceboard, queryplan, retention, rollups
+from .fastjson import (
+    AuctionRowSerializer, BidRowSerializer, CurrencyRateRowSerializer, UserNotificationRowSerializer, dumps
+)
+from .bidding import BidRejected, place_bid, register_proxy_bid
+from .middleware import JWTAuthMiddleware
+from .routing import websocket_urlpatterns
+from .lifecycle import LifecycleScheduler, close_auctions, open_auctions
+from .models import (
+    Auction, AuctionDailyRollup, AuctionParticipation, Bid, CurrencyRate, CurrencyRateCandle, CurrencyRateSeries,
+    LiveEvent, NotificationArchive, NotificationCounter, NotificationJob, ProxyBid, ScrapPrice, User, UserNotification
+)
+from .serializers import AuctionSerializer, BidSerializer, CurrencyRateSerializer, UserNotificationSerializer
+
+
+class QueryCountTests(TestCase):
+    """تعداد کوئری هر endpoint نباید با تعداد ردیف‌ها رشد کند (N+1)"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = User.objects.create_user(
+            username='admin', email='admin@example.com', password='pass', is_staff=True
+        )
+        self.users = []
+
+    def _add_rows(self, count):
+        now = timezone.now()
+        for _ in range(count):
+            index = len(self.users)
+            seller = User.objects.create_user(username=f'seller{index}', email=f'seller{index}@example.com')
+            bidder = User.objects.create_user(username=f'bidder{index}', email=f'bidder{index}@example.com')
+            self.users.append(seller)
+            auction = Auction.objects.create(  # type: ignore
+                title=f'auction {index}', description='-', status='completed',
+                start_date=now - timedelta(days=2), end_date=now - timedelta(days=1),
+                starting_price=Decimal('100'), current_price=Decimal('200'),
+                creator=seller, winner=bidder,
+            )
+            Bid.objects.create(auction=auction, bidder=bidder, amount=Decimal('200'))  # type: ignore
+            # مزایده‌ای که کاربر ادمین در آن شرکت کرده و برنده شده است
+            mine = Auction.objects.create(  # type: ignore
+                title=f'mine {index}', description='-', status='completed',
+                start_date=now - timedelta(days=2), end_date=now - timedelta(days=1),
+                starting_price=Decimal('100'), current_price=Decimal('300'),
+                creator=self.admin, winner=self.admin,
+            )
+            Bid.objects.create(auction=mine, bidder=self.admin, amount=Decimal('300'))  # type: ignore
+
+    def _count(self, url):
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def assertConstantQueries(self, url, authenticate=False):
+        if authenticate:
+            self.client.force_authenticate(self.admin)
+        self._add_rows(2)
+        few = self._count(url)
+        self._add_rows(8)
+        many = self._count(url)
+        self.assertEqual(few, many, f'{url}: {few} queries for 2 rows, {many} for 10 rows')
+        return many
+
+    def test_auction_list(self):
+        self.assertConstantQueries('/api/auctions/?page_size=100')
+
+    def test_auction_detail(self):
+        self._add_rows(1)
+        auction = Auction.objects.first()  # type: ignore
+        self.assertEqual(self._count(f'/api/auctions/{auction.pk}/'), 1)
+
+    def test_user_auctions(self):
+        self.assertConstantQueries('/api/profile/auctions/', authenticate=True)
+
+    def test_admin_auctions(self):
+        self.assertConstantQueries('/api/admin/auctions/', authenticate=True)
+
+    def test_admin_bids(self):
+        self.assertConstantQueries('/api/admin/bids/', authenticate=True)
+
+    def test_admin_export(self):
+        for model_type in ('auctions', 'bids'):
+            with self.subTest(model_type=model_type):
+                self.assertConstantQueries(f'/api/admin/export-data/?model_type={model_type}', authenticate=True)
+
+    def test_nested_user_is_public_summary(self):
+        self._add_rows(1)
+        response = self.client.get('/api/auctions/')
+        creator = response.json()['results'][0]['creator']
+        self.assertIn('username', creator)
+        for private in ('email', 'address', 'national_id', 'phone_number'):
+            self.assertNotIn(private, creator)
+
+
+class AuctionRollupTests(TestCase):
+    """جدول خلاصه روزانه باید با بازسازی کامل از روی داده‌ها یکسان بماند"""
+
+    def setUp(self):
+        self.seller = User.objects.create_user(username='seller', email='seller@example.com')
+        self.bidder = User.objects.create_user(username='bidder', email='bidder@example.com')
+
+    def _snapshot(self):
+        return sorted(AuctionDailyRollup.objects.filter(  # type: ignore
+            Q(auctions__gt=0) | Q(bids__gt=0)
+        ).values_list('day', 'listing_type', 'category', 'status', 'auctions', 'bids'))
+
+    def _create(self, condition, status='active'):
+        now = timezone.now()
+        return Auction.objects.create(  # type: ignore
+            title='t', description='-', status=status, condition=condition, category='metal',
+            start_date=now, end_date=now + timedelta(days=1),
+            starting_price=Decimal('100'), current_price=Decimal('100'), creator=self.seller,
+        )
+
+    def test_incremental_matches_rebuild(self):
+        tender = self._create('tender')
+        auction = self._create('new', status='pending_review')
+        self._create('inquiry')
+        place_bid(tender.pk, self.bidder, Decimal('200'))
+        place_bid(tender.pk, self.bidder, Decimal('300'))
+        auction.status = 'active'
+        auction.save()
+        close_auctions([tender.pk], timezone.now() + timedelta(days=2))
+        self._create('tender').delete()
+
+        incremental = self._snapshot()
+        rollups.rebuild()
+        self.assertEqual(incremental, self._snapshot())
+
+    def test_bids_follow_auction_status(self):
+        tender = self._create('tender')
+        other = self._create('new')
+        place_bid(tender.pk, self.bidder, Decimal('200'))
+        place_bid(tender.pk, self.bidder, Decimal('300'))
+        place_bid(other.pk, self.bidder, Decimal('200'))
+        close_auctions([tender.pk], timezone.now() + timedelta(days=2))
+
+        def bids(status):
+            return APIClient().get(f'/api/auctions/trends/?status={status}').json()['today']['bids']
+
+        # پیشنهادهای مزایده بسته‌شده با وضعیت فعلی آن شمرده می‌شوند
+        self.assertEqual((bids('active'), bids('completed'), bids('active,completed')), (1, 2, 3))
+        other.category = 'plastic'
+        other.save()
+        self.assertEqual(rollups.trend_series(category='plastic')['today']['bids'], 1)
+        incremental = self._snapshot()
+        rollups.rebuild()
+        self.assertEqual(incremental, self._snapshot())
+
+    def test_deleted_bids_are_subtracted(self):
+        auctions = [self._create('tender') for _ in range(3)]
+        second_bidder = User.objects.create_user(username='second', email='second@example.com')
+        for auction in auctions:
+            place_bid(auction.pk, self.bidder, Decimal('200'))
+            place_bid(auction.pk, second_bidder, Decimal('300'))
+        # حذف مستقیم، حذف مزایده (cascade) و حذف کاربر (cascade روی مزایده‌های دیگران)
+        Bid.objects.filter(auction=auctions[0], amount=Decimal('300')).delete()  # type: ignore
+        auctions[1].delete()
+        second_bidder.delete()
+        self.assertEqual(rollups.trend_series()['today']['bids'], 2)
+        incremental = self._snapshot()
+        rollups.rebuild()
+        self.assertEqual(incremental, self._snapshot())
+
+    def test_migration_backfill_keys_bids_by_status(self):
+        completed, active = self._create('tender'), self._create('new')
+        place_bid(completed.pk, self.bidder, Decimal('200'))
+        place_bid(completed.pk, self.bidder, Decimal('300'))
+        place_bid(active.pk, self.bidder, Decimal('200'))
+        close_auctions([completed.pk], timezone.now() + timedelta(days=2))
+        rollups.rebuild()
+        expected = self._snapshot()
+
+        AuctionDailyRollup.objects.all().delete()  # type: ignore
+        import_module('api.migrations.0016_auctiondailyrollup').backfill_rollups(apps, None)
+        self.assertEqual(self._snapshot(), expected)
+        self.assertEqual(sorted((row[3], row[5]) for row in expected), [('active', 1), ('completed', 2)])
+
+    def test_trend_endpoint(self):
+        self._create('tender')
+        self._create('tender')
+        self._create(None)
+        with CaptureQueriesContext(connection) as queries:
+            response = APIClient().get('/api/auctions/trends/')
+        self.assertEqual(len(queries), 2)
+        data = response.json()
+        self.assertEqual(data['today'], {'tender': 2, 'auction': 1, 'inquiry': 0, 'bids': 0})
+        self.assertEqual(len(data['week']), 7)
+        self.assertEqual(len(data['month']), 30)
+        self.assertEqual(len(data['months']), 6)
+        self.assertEqual(data['months'][-1]['tender'], 2)
+
+
+class AdminDashboardTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(username='admin', email='admin@example.com', is_admin=True)
+        self.client.force_authenticate(self.admin)
+        now = timezone.now()
+        self.auction = Auction.objects.create(  # type: ignore
+            title='t', description='-', status='active', start_date=now, end_date=now + timedelta(days=1),
+            starting_price=Decimal('100'), current_price=Decimal('100'), creator=self.admin,
+        )
+        place_bid(self.auction.pk, User.objects.create_user(username='b', email='b@example.com'), Decimal('150'))
+
+    def test_query_count_independent_of_window(self):
+        counts = []
+        for days in (7, 365):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(f'/api/admin/dashboard/?days={days}')
+            self.assertEqual(len(response.json()['daily_stats']), days)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_stats(self):
+        data = self.client.get('/api/admin/dashboard/').json()
+        self.assertEqual(data['users'], {'total': 2, 'active': 2, 'premium': 0})
+        self.assertEqual(data['auctions'], {'total': 1, 'active': 1, 'completed': 0})
+        self.assertEqual(data['bids'], {'total': 1, 'total_amount': 150.0})
+        self.assertEqual(data['daily_stats'][0]['users'], 2)
+        self.assertEqual(data['daily_stats'][0]['auctions'], 1)
+        self.assertEqual(data['daily_stats'][0]['bids'], 1)
+
+    def test_invalid_window(self):
+        self.assertEqual(self.client.get('/api/admin/dashboard/?days=5').status_code, 400)
+
+
+class AdminExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(
+            username='admin', email='admin@example.com', is_staff=True
+        ))
+        seller = User.objects.create_user(username='seller', email='seller@example.com')
+        now = timezone.now()
+        auction = Auction.objects.create(  # type: ignore
+            title='t', description='-', status='active', start_date=now, end_date=now + timedelta(days=1),
+            starting_price=Decimal('100'), current_price=Decimal('100'), creator=seller,
+        )
+        for amount in range(5):
+            Bid.objects.create(auction=auction, bidder=seller, amount=Decimal(200 + amount))  # type: ignore
+
+    def _export(self, query):
+        response = self.client.get(f'/api/admin/export-data/?{query}')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content)
+
+    @override_settings(EXPORT_CHUNK_SIZE=2)
+    def test_ndjson_reads_in_chunks(self):
+        with CaptureQueriesContext(connection) as queries:
+            response, body = self._export('model_type=bids&format=ndjson')
+        lines = body.decode().splitlines()
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        self.assertEqual([json.loads(line)['amount'] for line in lines],
+                         ['200.00', '201.00', '202.00', '203.00', '204.00'])
+        # سه دسته دوتایی؛ یک کوئری برای هر دسته
+        self.assertEqual(sum('api_bid' in q['sql'] for q in queries.captured_queries), 3)
+
+    def test_csv_flattens_nested_users(self):
+        _, body = self._export('model_type=auctions&format=csv')
+        rows = list(csv.DictReader(io.StringIO(body.decode())))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['creator.username'], 'seller')
+        self.assertEqual(rows[0]['winner.username'], '')
+
+    def test_gzip_json(self):
+        response, body = self._export('model_type=bids&format=json&gzip=1')
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        data = json.loads(gzip.decompress(body))
+        self.assertEqual(data['count'], 5)
+        self.assertEqual(len(data['data']), 5)
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get('/api/admin/export-data/?model_type=x').status_code, 400)
+        self.assertEqual(self.client.get('/api/admin/export-data/?model_type=bids&format=xml').status_code, 404)
+
+
+class AuctionSearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.seller = User.objects.create_user(username='seller', email='seller@example.com')
+
+    def _create(self, title, description='-', status='active', **fields):
+        now = timezone.now()
+        return Auction.objects.create(  # type: ignore
+            title=title, description=description, status=status, start_date=now,
+            end_date=now + timedelta(days=1), starting_price=Decimal('100'),
+            current_price=Decimal('100'), creator=self.seller, **fields,
+        )
+
+    def _search(self, query):
+        response = self.client.get('/api/auctions/search/', {'q': query})
+        self.assertEqual(response.status_code, 200)
+        return [row['title'] for row in response.json()]
+
+    def test_persian_normalization(self):
+        # ی و ک عربی، نیم‌فاصله و ارقام فارسی
+        self._create('فروش كاميون ولوو مدل ۱۴۰۰', location='تهران')
+        self._create('ضایعات آهن', description='بارگیری‌شده')
+        self.assertEqual(self._search('کامیون'), ['فروش كاميون ولوو مدل ۱۴۰۰'])
+        self.assertEqual(self._search('1400'), ['فروش كاميون ولوو مدل ۱۴۰۰'])
+        self.assertEqual(self._search('تهران'), ['فروش كاميون ولوو مدل ۱۴۰۰'])
+        self.assertEqual(self._search('بارگیری شده'), ['ضایعات آهن'])
+
+    def test_ranking_prefix_and_visibility(self):
+        self._create('لوازم اداری', description='میز و صندلی و کامپیوتر')
+        self._create('کامپیوتر رومیزی')
+        self._create('کامپیوتر تایید نشده', status='pending_review')
+        self.assertEqual(self._search('کامپ'), ['کامپیوتر رومیزی', 'لوازم اداری'])
+
+    def test_index_follows_writes(self):
+        auction = self._create('میلگرد')
+        auction.title = 'تیرآهن'
+        auction.save()
+        self.assertEqual(self._search('میلگرد'), [])
+        self.assertEqual(self._search('تیرآهن'), ['تیرآهن'])
+        auction.delete()
+        self.assertEqual(self._search('تیرآهن'), [])
+
+    def test_query_required(self):
+        self.assertEqual(self.client.get('/api/auctions/search/').status_code, 400)
+
+    @override_settings(ADMIN_AUCTION_SEARCH_LIMIT=2)
+    def test_admin_search_reports_truncation(self):
+        for index in range(3):
+            self._create(f'میلگرد {index}')
+        self._create('تیرآهن')
+        self.client.force_authenticate(User.objects.create_user(
+            username='admin', email='admin@example.com', is_staff=True
+        ))
+        response = self.client.get('/api/admin/auctions/', {'search': 'میلگرد'})
+        self.assertEqual(len(response.json()), 2)
+        self.assertEqual(response['X-Search-Truncated'], '2')
+        response = self.client.get('/api/admin/auctions/', {'search': 'تیرآهن'})
+        self.assertEqual([row['title'] for row in response.json()], ['تیرآهن'])
+        self.assertNotIn('X-Search-Truncated', response)
+
+
+class AuctionListParamsTests(TestCase):
+    """پارامترهای فیلتر و صفحه‌بندی cursor فهرست مزایده‌ها"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='seller', email='seller@example.com')
+
+    def _create(self, count):
+        now = timezone.now()
+        Auction.objects.bulk_create([  # type: ignore
+            Auction(
+                title=f'auction {index}', description='-', status='active',
+                start_date=now - timedelta(days=1), end_date=now + timedelta(hours=index + 1),
+                starting_price=Decimal('100'), current_price=Decimal(100 + index), creator=self.user,
+            )
+            for index in range(count)
+        ])
+
+    def test_invalid_numbers_are_rejected(self):
+        self._create(1)
+        for query in ('min_price=nan', 'max_price=NaN', 'min_price=inf', 'max_price=-Infinity', 'min_price=abc',
+                      'ending_within=nan', 'ending_within=inf', 'ending_within=1e30', 'ending_within=-1',
+                      'ending_within=100000'):
+            with self.subTest(query=query):
+                response = self.client.get(f'/api/auctions/?{query}')
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(query.split('=')[0], response.json())
+
+    def test_valid_filters(self):
+        self._create(5)
+        response = self.client.get('/api/auctions/?min_price=101&max_price=103&ending_within=3.5')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['title'] for row in response.json()['results']], ['auction 2', 'auction 1'])
+
+    def test_invalid_ordering(self):
+        response = self.client.get('/api/auctions/?ordering=price')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('ordering', response.json())
+
+    def test_cursor_traversal(self):
+        self._create(7)
+        for ordering, expected in (('newest', [f'auction {i}' for i in reversed(range(7))]),
+                                   ('ending_soon', [f'auction {i}' for i in range(7)])):
+            with self.subTest(ordering=ordering):
+                titles = []
+                url = f'/api/auctions/?ordering={ordering}&page_size=3'
+                while url:
+                    page = self.client.get(url).json()
+                    self.assertLessEqual(len(page['results']), 3)
+                    titles.extend(row['title'] for row in page['results'])
+                    url = page['next']
+                self.assertEqual(titles, expected)
+                # previous صفحه دوم همان صفحه اول است
+                first = self.client.get(f'/api/auctions/?ordering={ordering}&page_size=3').json()
+                second = self.client.get(first['next']).json()
+                back = self.client.get(second['previous']).json()
+                self.assertEqual([row['id'] for row in back['results']], [row['id'] for row in first['results']])
+
+    def test_page_size_is_clamped(self):
+        self._create(25)
+        self.assertEqual(len(self.client.get('/api/auctions/').json()['results']), 20)
+        self.assertEqual(len(self.client.get('/api/auctions/?page_size=5').json()['results']), 5)
+        # مقدار نامعتبر، صفر یا منفی مانند سایر پارامترها خطای ۴۰۰ می‌دهد
+        since = int((timezone.now() - timedelta(hours=1)).timestamp())
+        for page_size in ('abc', '0', '-3', '1.5'):
+            for url in (f'/api/auctions/?page_size={page_size}',
+                        f'/api/auctions/?updated_since={since}&page_size={page_size}'):
+                with self.subTest(url=url):
+                    response = self.client.get(url)
+                    self.assertEqual(response.status_code, 400)
+                    self.assertIn('page_size', response.json())
+
+    def test_page_size_upper_bound(self):
+        self._create(1001)
+        response = self.client.get('/api/auctions/?page_size=5000&fields=id')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['results']), 1000)
+        self.assertIsNotNone(response.json()['next'])
+
+
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.seller = User.objects.create_user(username='seller', email='seller@example.com')
+        now = timezone.now()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.auction = Auction.objects.create(  # type: ignore
+                title='t', description='-', status='active', start_date=now, end_date=now + timedelta(days=1),
+                starting_price=Decimal('100'), current_price=Decimal('100'), creator=self.seller,
+            )
+
+    def _prices(self):
+        return [row['current_price'] for row in self.client.get('/api/auctions/').json()['results']]
+
+    def test_anonymous_hits_are_served_from_cache(self):
+        self._prices()
+        with CaptureQueriesContext(connection) as queries:
+            self._prices()
+        # فقط خواندن نسخه فضای نام از جدول CacheVersion
+        self.assertEqual(len(queries), 1)
+        self.assertIn('api_cacheversion', queries[0]['sql'])
+
+    def test_authenticated_requests_bypass_cache(self):
+        self.client.force_authenticate(self.seller)
+        self.client.get('/api/auctions/')
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/api/auctions/')
+        self.assertGreater(len(queries), 0)
+
+    def test_bid_invalidates_auction_list(self):
+        self.assertEqual(self._prices(), ['100.00'])
+        bidder = User.objects.create_user(username='bidder', email='bidder@example.com')
+        with self.captureOnCommitCallbacks(execute=True):
+            place_bid(self.auction.pk, bidder, Decimal('250'))
+        self.assertEqual(self._prices(), ['250.00'])
+
+    def test_currency_save_invalidates_rates(self):
+        rate = CurrencyRate.objects.create(name='دلار', code='USD', rate=Decimal('1'), change=Decimal('0'))  # type: ignore
+        self.client.get('/api/currency-rates/')
+        with self.captureOnCommitCallbacks(execute=True):
+            rate.rate = Decimal('2')
+            rate.save()
+        self.assertEqual(self.client.get('/api/currency-rates/').json()[0]['rate'], '2.0000')
+
+    def test_stale_entry_served_while_another_request_rebuilds(self):
+        request = APIClient().get('/api/currency-rates/').wsgi_request
+        calls = []
+        self.assertEqual(caching.cached('test', request, lambda: calls.append(1) or 'old'), ('old', True))
+        caching._bump('test')
+        # درخواست دیگری قفل بازسازی را در اختیار دارد
+        cache.add(f'{caching._entry_key("test", request)}:lock', 1)
+        request = APIClient().get('/api/currency-rates/').wsgi_request
+        self.assertEqual(caching.cached('test', request, lambda: calls.append(1) or 'new'), ('old', False))
+        self.assertEqual(len(calls), 1)
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='user', email='user@example.com')
+
+    def test_auctions_not_modified_with_only_version_lookup(self):
+        now = timezone.now()
+        Auction.objects.create(  # type: ignore
+            title='t', description='-', status='active', start_date=now, end_date=now + timedelta(days=1),
+            starting_price=Decimal('100'), current_price=Decimal('100'), creator=self.user,
+        )
+        first = self.client.get('/api/auctions/')
+        self.assertIn('Last-Modified', first)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/auctions/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(len(queries), 1)
+        self.assertIn('api_cacheversion', queries[0]['sql'])
+        # پارامترهای متفاوت ETag متفاوت دارند
+        self.assertNotEqual(self.client.get('/api/auctions/?status=active')['ETag'], first['ETag'])
+
+    def test_write_changes_etag(self):
+        etag = self.client.get('/api/currency-rates/')['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            CurrencyRate.objects.create(name='یورو', code='EUR', rate=Decimal('1'), change=Decimal('0'))  # type: ignore
+        response = self.client.get('/api/currency-rates/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 1)
+
+    def test_write_from_another_process_changes_etag(self):
+        # زمان‌بند، ingest و worker اعلان‌ها پروسه جدا با LocMemCache جداگانه دارند
+        etag = self.client.get('/api/currency-rates/')['ETag']
+        other_process = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                                     'LOCATION': 'other-process'}}
+        with override_settings(CACHES=other_process), self.captureOnCommitCallbacks(execute=True):
+            CurrencyRate.objects.create(name='یورو', code='EUR', rate=Decimal('1'), change=Decimal('0'))  # type: ignore
+        response = self.client.get('/api/currency-rates/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 1)
+
+    def test_lifecycle_transition_changes_auction_etag(self):
+        now = timezone.now()
+        auction = Auction.objects.create(  # type: ignore
+            title='t', description='-', status='active', start_date=now - timedelta(days=1),
+            end_date=now - timedelta(minutes=1), starting_price=Decimal('100'), current_price=Decimal('100'),
+            creator=self.user,
+        )
+        etag = self.client.get('/api/auctions/?status=active')['ETag']
+        self.assertEqual(self.client.get('/api/auctions/?status=active', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        # run_auction_scheduler در پروسه جداگانه با کش خودش اجرا می‌شود
+        other_process = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                                     'LOCATION': 'scheduler'}}
+        with override_settings(CACHES=other_process), self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(close_auctions([auction.pk]), [auction.pk])
+        response = self.client.get('/api/auctions/?status=active', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'], [])
+
+    def test_if_modified_since(self):
+        CurrencyRate.objects.create(name='یورو', code='EUR', rate=Decimal('1'), change=Decimal('0'))  # type: ignore
+        last_modified = self.client.get('/api/currency-rates/')['Last-Modified']
+        response = self.client.get('/api/currency-rates/', HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_notifications_etag_follows_read_state(self):
+        self.client.force_authenticate(self.user)
+        notification = UserNotification.objects.create(  # type: ignore
+            user=self.user, type='new_bid', message='m', read=False
+        )
+        etag = self.client.get('/api/notifications/')['ETag']
+        self.assertEqual(self.client.get('/api/notifications/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f'/api/notifications/{notification.pk}/mark-read/')
+        self.assertEqual(self.client.get('/api/notifications/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class DeltaSyncTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='seller', email='seller@example.com')
+        self.now = timezone.now()
+        self.auctions = []
+        for index in range(3):
+            auction = Auction.objects.create(  # type: ignore
+                title=f'auction {index}', description='-', status='active',
+                start_date=self.now, end_date=self.now + timedelta(days=1),
+                starting_price=Decimal('100'), current_price=Decimal('100'), creator=self.user,
+            )
+            # زمان‌های تغییر مشخص و یکی تکراری برای بررسی شکستن تساوی با id
+            Auction.objects.filter(pk=auction.pk).update(  # type: ignore
+                updated_at=self.now - timedelta(minutes=10 - min(index, 1))
+            )
+            self.auctions.append(auction)
+
+    def _sync(self, since, **params):
+        return self.client.get('/api/auctions/', {'updated_since': since, **params})
+
+    def test_pages_through_changes_with_cursor(self):
+        since = (self.now - timedelta(hours=1)).isoformat()
+        first = self._sync(since, page_size=2).json()
+        self.assertTrue(first['has_more'])
+        self.assertEqual([row['id'] for row in first['results']], [self.auctions[0].pk, self.auctions[1].pk])
+        second = self._sync(first['cursor'], page_size=2).json()
+        self.assertFalse(second['has_more'])
+        self.assertEqual([row['id'] for row in second['results']], [self.auctions[2].pk])
+
+        # بدون تغییر جدید، cursor نهایی فقط ردیف‌های داخل بازه همپوشانی را دوباره برمی‌گرداند
+        self.assertEqual(self._sync(second['cursor']).json()['results'], [])
+
+    def test_only_changed_rows_returned(self):
+        since = (self.now - timedelta(minutes=1)).isoformat()
+        self.assertEqual(self._sync(since).json()['results'], [])
+        place_bid(self.auctions[1].pk, User.objects.create_user(username='b', email='b@example.com'),
+                  Decimal('2000'))
+        self.assertEqual([row['id'] for row in self._sync(since).json()['results']], [self.auctions[1].pk])
+
+    def test_deleted_and_rejected_are_reported(self):
+        since = str((self.now - timedelta(minutes=1)).timestamp())
+        deleted_id = self.auctions[0].pk
+        self.auctions[0].delete()
+        rejected = self.auctions[1]
+        rejected.status = 'rejected'
+        rejected.save()
+        data = self._sync(since).json()
+        self.assertEqual(data['results'], [])
+        self.assertEqual(data['deleted'], sorted([deleted_id, rejected.pk]))
+
+    def test_rows_leaving_filter_are_reported(self):
+        since = (self.now - timedelta(minutes=1)).isoformat()
+        auction = self.auctions[2]
+        auction.status = 'completed'
+        auction.save()
+        data = self._sync(since, status='active').json()
+        self.assertEqual(data['deleted'], [auction.pk])
+
+    def test_stale_or_invalid_since(self):
+        self.assertEqual(self._sync((self.now - timedelta(days=365)).isoformat()).status_code, 410)
+        self.assertEqual(self._sync('not-a-date').status_code, 400)
+
+
+class FastJSONTests(TestCase):
+    """سریالایزرهای سریع روی ()values باید دقیقاً خروجی سریالایزرهای DRF را تولید کنند"""
+
+    def setUp(self):
+        now = timezone.now()
+        self.seller = User.objects.create_user(
+            username='seller', email='seller@example.com', company='شرکت', profile_image='profile_images/a.png'
+        )
+        self.bidder = User.objects.create_user(username='bidder', email='bidder@example.com')
+        self.auction = Auction.objects.create(  # type: ignore
+            title='ضایعات آهن', description='-', status='completed',
+            start_date=now - timedelta(days=2), end_date=now - timedelta(days=1),
+            starting_price=Decimal('100'), current_price=Decimal('250.5'),
+            creator=self.seller, winner=self.bidder,
+        )
+        Auction.objects.create(  # type: ignore
+            title='بدون برنده', description='-', status='active', start_date=now, end_date=now + timedelta(days=1),
+            starting_price=Decimal('100'), current_price=Decimal('100'), creator=self.bidder,
+        )
+        Bid.objects.create(auction=self.auction, bidder=self.bidder, amount=Decimal('250.5'))  # type: ignore
+        UserNotification.objects.create(user=self.seller, type='new_bid', message='پیشنهاد', read=False)  # type: ignore
+        CurrencyRate.objects.create(  # type: ignore
+            name='دلار', code='USD', rate=Decimal('58000.12'), change=Decimal('-1.5')
+        )
+
+    def test_matches_drf_serializers(self):
+        cases = [
+            (Auction.objects.select_related('creator', 'winner'), AuctionSerializer, AuctionRowSerializer),  # type: ignore
+            (Bid.objects.select_related('bidder'), BidSerializer, BidRowSerializer),  # type: ignore
+            (UserNotification.objects.all(), UserNotificationSerializer, UserNotificationRowSerializer),  # type: ignore
+            (CurrencyRate.objects.all(), CurrencyRateSerializer, CurrencyRateRowSerializer),  # type: ignore
+        ]
+        for queryset, serializer_class, row_serializer_class in cases:
+            with self.subTest(serializer=serializer_class.__name__):
+                expected = json.loads(json.dumps(serializer_class(queryset.order_by('pk'), many=True).data))
+                fast = row_serializer_class().serialize(row_serializer_class.values(queryset.order_by('pk')))
+                self.assertEqual(json.loads(dumps(fast)), expected)
+
+
+class SparseFieldsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        now = timezone.now()
+        self.seller = User.objects.create_user(username='seller', email='seller@example.com')
+        for index in range(3):
+            Auction.objects.create(  # type: ignore
+                title=f'ضایعات {index}', description='-', status='active',
+                start_date=now, end_date=now + timedelta(days=1),
+                starting_price=Decimal('100'), current_price=Decimal('100'), creator=self.seller,
+            )
+
+    def _get(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        # خواندن نسخه کش (caching.stamp) جدا از کوئری فهرست است
+        return response.json(), [query['sql'] for query in queries if 'api_cacheversion' not in query['sql']]
+
+    def test_fields_narrow_output_and_sql(self):
+        data, queries = self._get('/api/auctions/?fields=id,title,creator')
+        self.assertEqual(set(data['results'][0]), {'id', 'title', 'creator'})
+        self.assertEqual(data['results'][0]['creator'], self.seller.pk)
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('JOIN', queries[0])
+        self.assertNotIn('"description"', queries[0])
+
+    def test_expand_joins_relation(self):
+        data, queries = self._get('/api/auctions/?fields=id&expand=creator')
+        self.assertEqual(data['results'][0]['creator']['username'], 'seller')
+        self.assertEqual(len(queries), 1)
+        self.assertIn('JOIN', queries[0])
+        self.assertNotIn('"email"', queries[0])
+
+    def test_default_payload_unchanged(self):
+        data, _ = self._get('/api/auctions/')
+        self.assertEqual(data['results'][0]['creator']['username'], 'seller')
+        self.assertIn('description', data['results'][0])
+
+    def test_detail_and_search(self):
+        auction = Auction.objects.first()  # type: ignore
+        data, _ = self._get(f'/api/auctions/{auction.pk}/?fields=id,current_price')
+        self.assertEqual(set(data), {'id', 'current_price'})
+        data, _ = self._get('/api/auctions/search/?q=ضایعات&fields=id,title')
+        self.assertEqual(len(data), 3)
+        self.assertEqual(set(data[0]), {'id', 'title'})
+
+    def test_invalid_names_rejected(self):
+        self.assertEqual(self.client.get('/api/auctions/?fields=id,secret').status_code, 400)
+        self.assertEqual(self.client.get('/api/auctions/?expand=title').status_code, 400)
+
+
+class ParticipationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        now = timezone.now()
+        self.seller = User.objects.create_user(username='seller', email='seller@example.com')
+        self.alice = User.objects.create_user(username='alice', email='alice@example.com')
+        self.bob = User.objects.create_user(username='bob', email='bob@example.com')
+        self.auctions = [
+            Auction.objects.create(  # type: ignore
+                title=f'auction {index}', description='-', status='active',
+                start_date=now - timedelta(hours=1), end_date=now + timedelta(days=1),
+                starting_price=Decimal('100'), current_price=Decimal('100'), creator=self.seller,
+            )
+            for index in range(3)
+        ]
+
+    def _snapshot(self):
+        return sorted(AuctionParticipation.objects.values_list(  # type: ignore
+            'user_id', 'auction_id', 'is_creator', 'is_bidder', 'is_winner', 'auction_status',
+            'highest_bid_amount', 'bid_count'
+        ))
+
+    def _tab(self, user, tab, **params):
+        self.client.force_authenticate(user)
+        response = self.client.get('/api/profile/auctions/', {'tab': tab, **params})
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_bids_and_close_update_index(self):
+        place_bid(self.auctions[0].pk, self.alice, Decimal('200'))
+        place_bid(self.auctions[0].pk, self.bob, Decimal('300'))
+        place_bid(self.auctions[0].pk, self.alice, Decimal('400'))
+        place_bid(self.auctions[1].pk, self.bob, Decimal('150'))
+
+        row = AuctionParticipation.objects.get(user=self.alice, auction=self.auctions[0])  # type: ignore
+        self.assertEqual((row.bid_count, row.last_bid_amount, row.highest_bid_amount), (2, Decimal('400'), Decimal('400')))
+
+        Auction.objects.filter(pk=self.auctions[0].pk).update(end_date=timezone.now())  # type: ignore
+        close_auctions([self.auctions[0].pk])
+
+        won = self._tab(self.alice, 'won')
+        self.assertEqual([item['auction']['id'] for item in won['results']], [self.auctions[0].pk])
+        self.assertEqual(won['results'][0]['status'], 'completed')
+        self.assertEqual(won['counts'], {'created': 0, 'participated': 1, 'won': 1})
+        # ترتیب بر اساس آخرین فعالیت
+        participated = self._tab(self.bob, 'participated')
+        self.assertEqual([item['auction']['id'] for item in participated['results']],
+                         [self.auctions[1].pk, self.auctions[0].pk])
+        self.assertEqual(self._tab(self.bob, 'participated', status='active')['counts']['participated'], 2)
+        self.assertEqual(len(self._tab(self.bob, 'participated', status='active')['results']), 1)
+
+        # بازسازی کامل باید همان نمایه نگهداری‌شده را بسازد
+        incremental = self._snapshot()
+        participation.rebuild()
+        self.assertEqual(self._snapshot(), incremental)
+        # backfill ثابت migration هم همان نمایه را می‌سازد
+        AuctionParticipation.objects.all().delete()  # type: ignore
+        import_module('api.migrations.0020_auctionparticipation').backfill_participation(
+            apps, connection.schema_editor()
+        )
+        self.assertEqual(self._snapshot(), incremental)
+
+    def test_created_tab_paginates(self):
+        first = self._tab(self.seller, 'created', page_size=2)
+        self.assertEqual(len(first['results']), 2)
+        self.assertEqual(first['counts']['created'], 3)
+        self.client.force_authenticate(self.seller)
+        second = self.client.get(first['next']).json()
+        self.assertEqual(len(second['results']), 1)
+
+    def test_status_change_and_invalid_tab(self):
+        auction = self.auctions[2]
+        auction.status = 'cancelled'
+        auction.save()
+        statuses = {item['auction']['id']: item['status'] for item in self._tab(self.seller, 'created')['results']}
+        self.assertEqual(statuses[auction.pk], 'cancelled')
+        self.client.force_authenticate(self.seller)
+        self.assertEqual(self.client.get('/api/profile/auctions/?tab=all').status_code, 400)
+
+
+class LiveEventConsumerTests(TestCase):
+    """استریم زنده وب‌سوکت: اشتراک، مجوز، ارسال به همه مشترکان و ادامه از آخرین رویداد"""
+
+    def setUp(self):
+        now = timezone.now()
+        self.seller = User.objects.create_user(username='seller', email='seller@example.com')
+        self.bidder = User.objects.create_user(username='bidder', email='bidder@example.com')
+        self.auction = Auction.objects.create(  # type: ignore
+            title='auction', description='-', status='active',
+            start_date=now - timedelta(hours=1), end_date=now + timedelta(days=1),
+            starting_price=Decimal('100'), current_price=Decimal('100'), creator=self.seller,
+        )
+        self.hidden = Auction.objects.create(  # type: ignore
+            title='hidden', description='-', status='pending_review',
+            start_date=now, end_date=now + timedelta(days=1),
+            starting_price=Decimal('100'), current_price=Decimal('100'), creator=self.seller,
+        )
+
+    async def _connect(self, user=None):
+        path = '/ws/live/'
+        if user is not None:
+            path += f'?token={RefreshToken.for_user(user).access_token}'
+        communicator = WebsocketCommunicator(JWTAuthMiddleware(URLRouter(websocket_urlpatterns)), path)
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        return communicator
+
+    async def _subscribe(self, communicator, stream, **extra):
+        await communicator.send_json_to({'action': 'subscribe', 'stream': stream, **extra})
+        return await communicator.receive_json_from()
+
+    def _bid(self, amount):
+        with self.captureOnCommitCallbacks(execute=True):
+            place_bid(self.auction.pk, self.bidder, Decimal(amount))
+
+    async def test_fan_out_to_all_subscribers(self):
+        stream = f'auction.{self.auction.pk}'
+        first, second = await self._connect(), await self._connect(self.bidder)
+        for communicator in (first, second):
+            self.assertEqual(await self._subscribe(communicator, stream), {'type': 'subscribed', 'stream': stream})
+        await database_sync_to_async(self._bid)('150')
+        for communicator in (first, second):
+            message = await communicator.receive_json_from()
+            self.assertEqual((message['type'], message['stream'], message['event']), ('event', stream, 'bid'))
+            self.assertEqual(message['payload']['current_price'], '150')
+            await communicator.disconnect()
+
+    async def test_replay_since_cursor(self):
+        stream = f'auction.{self.auction.pk}'
+        for amount in ('150', '200', '250'):
+            await database_sync_to_async(self._bid)(amount)
+        ids = await database_sync_to_async(lambda: list(LiveEvent.objects.filter(  # type: ignore
+            stream=stream, type='bid'
+        ).order_by('id').values_list('id', flat=True)))()
+        communicator = await self._connect()
+        replayed = await self._subscribe(communicator, stream, last_event_id=ids[0])
+        self.assertEqual((replayed['id'], replayed['payload']['amount']), (ids[1], '200'))
+        self.assertEqual((await communicator.receive_json_from())['id'], ids[2])
+        self.assertEqual(await communicator.receive_json_from(), {'type': 'subscribed', 'stream': stream})
+        with override_settings(LIVE_EVENT_REPLAY_LIMIT=1):
+            self.assertEqual(await self._subscribe(communicator, stream, last_event_id=0),
+                             {'type': 'resync', 'stream': stream})
+        await communicator.disconnect()
+
+    async def test_user_stream_requires_owner(self):
+        stream = f'user.{self.bidder.pk}'
+        anonymous = await self._connect()
+        self.assertEqual((await self._subscribe(anonymous, stream))['type'], 'error')
+        other = await self._connect(self.seller)
+        self.assertEqual((await self._subscribe(other, stream))['type'], 'error')
+        owner = await self._connect(self.bidder)
+        self.assertEqual(await self._subscribe(owner, stream), {'type': 'subscribed', 'stream': stream})
+        for communicator in (anonymous, other, owner):
+            await communicator.disconnect()
+
+    async def test_hidden_auction_stream(self):
+        stream = f'auction.{self.hidden.pk}'
+        for user, expected in ((None, 'error'), (self.bidder, 'error'), (self.seller, 'subscribed')):
+            with self.subTest(user=user):
+                communicator = await self._connect(user)
+                self.assertEqual((await self._subscribe(communicator, stream))['type'], expected)
+                await communicator.disconnect()
+        # همان قاعده endpoint جزئیات
+        response = await database_sync_to_async(lambda: APIClient().get(f'/api/auctions/{self.hidden.pk}/'))()
+        self.assertEqual(response.status_code, 404)
+
+
+class LifecycleTests(TestCase):
+    """باز و بسته شدن زمان‌بندی‌شده مزایده‌ها و اعلان‌های دسته‌ای آن"""
+
+    def setUp(self):
+        cache.clear()
+        self.now = timezone.now()
+        self.seller = User.objects.create_user(username='seller', email='seller@example.com')
+        self.bidders = [User.objects.create_user(username=f'b{i}', email=f'b{i}@example.com') for i in range(2)]
+
+    def _auction(self, status, start, end, title='auction'):
+        return Auction.objects.create(  # type: ignore
+            title=title, description='-', status=status, start_date=self.now + start, end_date=self.now + end,
+            starting_price=Decimal('100'), current_price=Decimal('100'), creator=self.seller,
+        )
+
+    def _notifications(self, auction):
+        return sorted(auction.notifications.values_list('user__username', 'type'))
+
+    def test_scheduler_opens_due_auctions(self):
+        due = self._auction('scheduled', -timedelta(minutes=1), timedelta(days=1), 'due')
+        later = self._auction('scheduled', timedelta(seconds=30), timedelta(days=1), 'later')
+        future = self._auction('scheduled', timedelta(hours=1), timedelta(days=1), 'future')
+        scheduler = LifecycleScheduler(horizon=timedelta(minutes=1))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(scheduler.tick(self.now), ([due.pk], []))
+        # شروع نزدیک در heap می‌ماند و بدون کوئری دوباره در موعد خود باز می‌شود
+        self.assertEqual(len(scheduler), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(scheduler.run_due(self.now + timedelta(seconds=31)), ([later.pk], []))
+        statuses = dict(Auction.objects.values_list('title', 'status'))  # type: ignore
+        self.assertEqual(statuses, {'due': 'active', 'later': 'active', 'future': 'scheduled'})
+        self.assertEqual(self._notifications(due), [('seller', 'auction_start')])
+        self.assertEqual(notifications.counter(self.seller.pk)['unread'], 2)
+        self.assertEqual(open_auctions([future.pk], self.now), [])
+
+    def test_close_picks_highest_bidder(self):
+        auction = self._auction('active', -timedelta(days=1), timedelta(hours=1))
+        with self.captureOnCommitCallbacks(execute=True):
+            place_bid(auction.pk, self.bidders[0], Decimal('150'))
+            place_bid(auction.pk, self.bidders[1], Decimal('200'))
+        # پیش از پایان زمان بسته نمی‌شود
+        self.assertEqual(close_auctions([auction.pk], self.now), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(close_auctions([auction.pk], self.now + timedelta(hours=2)), [auction.pk])
+        auction.refresh_from_db()
+        self.assertEqual((auction.status, auction.winner), ('completed', self.bidders[1]))
+        self.assertIn(('b1', 'won_auction'), self._notifications(auction))
+        self.assertIn(('seller', 'auction_end'), self._notifications(auction))
+        self.assertNotIn(('b0', 'won_auction'), self._notifications(auction))
+        # بستن دوباره اثری ندارد
+        self.assertEqual(close_auctions([auction.pk], self.now + timedelta(hours=3)), [])
+
+    def test_close_without_bids(self):
+        auction = self._auction('active', -timedelta(days=1), -timedelta(minutes=1))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(LifecycleScheduler().tick(self.now), ([], [auction.pk]))
+        auction.refresh_from_db()
+        self.assertEqual((auction.status, auction.winner), ('completed', None))
+        self.assertEqual(self._notifications(auction), [('seller', 'auction_end')])
+        self.assertIn('بدون پیشنهاد', auction.notifications.get().message)
+
+    def _close_interleaved(self, auction, concurrent):
+        # نوشتن هم‌زمان درست پس از نخستین دستور بستن روی جدول مزایده اجرا می‌شود؛ با قفل
+        # پیش از خواندن، بستن نتیجه آن را می‌بیند و آن را بازنویسی نمی‌کند
+        pending = [concurrent]
+
+        def interleave(execute, sql, params, many, context):
+            result = execute(sql, params, many, context)
+            if pending and '"api_auction"' in sql:
+                pending.pop()()
+            return result
+
+        with self.captureOnCommitCallbacks(execute=True), connection.execute_wrapper(interleave):
+            closed = close_auctions([auction.pk], self.now + timedelta(hours=2))
+        auction.refresh_from_db()
+        return closed
+
+    def test_close_sees_interleaved_bid(self):
+        auction = self._auction('active', -timedelta(days=1), timedelta(hours=1))
+        with self.captureOnCommitCallbacks(execute=True):
+            place_bid(auction.pk, self.bidders[0], Decimal('150'))
+        closed = self._close_interleaved(auction, lambda: place_bid(auction.pk, self.bidders[1], Decimal('200')))
+        self.assertEqual(closed, [auction.pk])
+        self.assertEqual((auction.status, auction.winner, auction.current_price),
+                         ('completed', self.bidders[1], Decimal('200')))
+        self.assertIn(('b1', 'won_auction'), self._notifications(auction))
+
+    def test_close_skips_interleaved_cancel(self):
+        auction = self._auction('active', -timedelta(days=1), timedelta(hours=1))
+        closed = self._close_interleaved(
+            auction, lambda: Auction.objects.filter(pk=auction.pk).update(status='cancelled')  # type: ignore
+        )
+        self.assertEqual(closed, [])
+        self.assertEqual((auction.status, auction.winner), ('cancelled', None))
+        self.assertEqual(self._notifications(auction), [])
+
+    def test_stale_heap_entry_is_ignored(self):
+        auction = self._auction('active', -timedelta(days=1), timedelta(seconds=10))
+        scheduler = LifecycleScheduler()
+        scheduler.refill(self.now)
+        Auction.objects.filter(pk=auction.pk).update(end_date=self.now + timedelta(days=1))  # type: ignore
+        self.assertEqual(scheduler.run_due(self.now + timedelta(seconds=11)), ([], []))
+        auction.refresh_from_db()
+        self.assertEqual(auction.status, 'active')
+
+    def _close_batch(self, count):
+        ids = []
+        for index in range(count):
+            auction = self._auction('active', -timedelta(days=1), -timedelta(minutes=1), f'batch {index}')
+            Bid.objects.create(auction=auction, bidder=self.bidders[index % 2], amount=Decimal(150 + index))  # type: ignore
+            ids.append(auction.pk)
+        with CaptureQueriesContext(connection) as queries, self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(sorted(close_auctions(ids, self.now)), ids)
+        return [query['sql'] for query in queries if query['sql'].startswith('INSERT INTO "api_usernotification"')]
+
+    def test_bulk_close_notifications(self):
+        # اعلان‌های هر دسته با یک INSERT نوشته می‌شوند
+        self.assertEqual(len(self._close_batch(2)), 1)
+        self.assertEqual(len(self._close_batch(8)), 1)
+        # هر مزایده یک اعلان برنده و یک اعلان پایان برای سازنده
+        self.assertEqual(UserNotification.objects.filter(type='won_auction').count(), 10)  # type: ignore
+        self.assertEqual(UserNotification.objects.filter(type='auction_end').count(), 10)  # type: ignore
+        self.assertEqual(notifications.counter(self.seller.pk)['unread'], 10)
+        self.assertEqual(sum(notifications.counter(user.pk)['unread'] for user in self.bidders), 10)
+
+
+class BidEngineTests(TestCase):
+    """پذیرش و رد پیشنهادها در موتور اتمیک و endpoint ثبت پیشنهاد"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        now = timezone.now()
+        self.seller = User.objects.create_user(username='seller', email='seller@example.com')
+        self.alice = User.objects.create_user(username='alice', email='alice@example.com')
+        self.bob = User.objects.create_user(username='bob', email='bob@example.com')
+        self.auction = Auction.objects.create(  # type: ignore
+            title='auction', description='-', status='active',
+            start_date=now - timedelta(hours=1), end_date=now + timedelta(days=1),
+            starting_price=Decimal('100'), current_price=Decimal('100'), creator=self.seller,
+        )
+
+    def _post(self, user, amount, auction=None):
+        self.client.force_authenticate(user)
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(f'/api/auctions/{(auction or self.auction).pk}/bid/', {'amount': amount})
+
+    def test_lower_or_equal_bid_rejected_after_competing_bid(self):
+        self.assertEqual(self._post(self.alice, '200').status_code, 201)
+        for amount in ('150', '200'):
+            with self.subTest(amount=amount):
+                response = self._post(self.bob, amount)
+                self.assertEqual(response.status_code, 409)
+                self.assertEqual(response.json(), {
+                    'error': 'Bid amount must be higher than current price', 'code': 'outbid',
+                    'current_price': '200.00',
+                })
+        self.assertEqual(Bid.objects.filter(auction=self.auction).count(), 1)  # type: ignore
+
+    def test_closed_or_expired_auction(self):
+        now = timezone.now()
+        closed = Auction.objects.create(  # type: ignore
+            title='closed', description='-', status='completed', start_date=now - timedelta(days=2),
+            end_date=now + timedelta(days=1), starting_price=Decimal('100'), current_price=Decimal('100'),
+            creator=self.seller,
+        )
+        expired = Auction.objects.create(  # type: ignore
+            title='expired', description='-', status='active', start_date=now - timedelta(days=2),
+            end_date=now - timedelta(seconds=1), starting_price=Decimal('100'), current_price=Decimal('100'),
+            creator=self.seller,
+        )
+        for auction in (closed, expired):
+            with self.subTest(auction=auction.title):
+                response = self._post(self.alice, '500', auction)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json()['code'], 'not_active')
+                auction.refresh_from_db()
+                self.assertEqual(auction.current_price, Decimal('100'))
+        self.assertEqual(self.client.post('/api/auctions/999999/bid/', {'amount': '500'}).status_code, 404)
+        self.assertFalse(Bid.objects.exists())  # type: ignore
+
+    def test_creator_cannot_bid_on_own_auction(self):
+        response = self._post(self.seller, '500')
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.json()['code'], 'own_auction')
+        with self.assertRaises(BidRejected) as rejected:
+            register_proxy_bid(self.auction.pk, self.seller, Decimal('500'))
+        self.assertEqual(rejected.exception.code, 'own_auction')
+        self.auction.refresh_from_db()
+        self.assertEqual(self.auction.current_price, Decimal('100'))
+        self.assertFalse(Bid.objects.exists())  # type: ignore
+
+    def test_price_and_winner_follow_sequential_bids(self):
+        for user, amount in ((self.alice, '150'), (self.bob, '175'), (self.alice, '300'), (self.bob, '301')):
+            self.assertEqual(self._post(user, amount).status_code, 201)
+            self.auction.refresh_from_db()
+            top = self.auction.bids.order_by('-amount').first()
+            self.assertEqual(self.auction.current_price, top.amount)
+            self.assertEqual(self.auction.current_price, Decimal(amount))
+            self.assertEqual(top.bidder, user)
+
+        Auction.objects.filter(pk=self.auction.pk).update(end_date=timezone.now())  # type: ignore
+        with self.captureOnCommitCallbacks(execute=True):
+            close_auctions([self.auction.pk])
+        self.auction.refresh_from_db()
+        self.assertEqual((self.auction.status, self.auction.winner, self.auction.current_price),
+                         ('completed', self.bob, Decimal('301')))
+        self.assertEqual(self._post(self.alice, '400').status_code, 400)
+
+    def test_cache_version_bumped_once_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            register_proxy_bid(self.auction.pk, self.bob, Decimal('5000'))
+        # پاسخ خودکار سقف پنهان (دو پیشنهاد) و پیشنهاد دستی بدون رقیب
+        for user, amount in ((self.alice, '2000'), (self.alice, '9000')):
+            with self.subTest(amount=amount):
+                version = caching.version(caching.AUCTIONS)
+                with self.captureOnCommitCallbacks() as callbacks:
+                    place_bid(self.auction.pk, user, Decimal(amount))
+                # ردیف نسخه مشترک درون تراکنش قفل‌دار پیشنهاد نوشته نمی‌شود
+                self.assertEqual(caching.version(caching.AUCTIONS), version)
+                for callback in callbacks:
+                    callback()
+                self.assertEqual(caching.version(caching.AUCTIONS), version + 1)
+
+
+@override_settings(BID_INCREMENT=10)
+class ProxyBidTests(TestCase):
+    """رقابت سقف‌های پنهان با یکدیگر و با پیشنهادهای دستی"""
+
+    def setUp(self):
+        cache.clear()
+        now = timezone.now()
+        seller = User.objects.create_user(username='seller', email='seller@example.com')
+        self.alice = User.objects.create_user(username='alice', email='alice@example.com')
+        self.bob = User.objects.create_user(username='bob', email='bob@example.com')
+        self.auction = Auction.objects.create(  # type: ignore
+            title='auction', description='-', status='active',
+            start_date=now - timedelta(hours=1), end_date=now + timedelta(days=1),
+            starting_price=Decimal('100'), current_price=Decimal('100'), creator=seller,
+        )
+
+    def _proxy(self, user, max_amount):
+        with self.captureOnCommitCallbacks(execute=True):
+            return register_proxy_bid(self.auction.pk, user, Decimal(max_amount))
+
+    def _bid(self, user, amount):
+        with self.captureOnCommitCallbacks(execute=True):
+            return place_bid(self.auction.pk, user, Decimal(amount))
+
+    def _state(self):
+        self.auction.refresh_from_db()
+        bids = [(bid.bidder.username, bid.amount) for bid in self.auction.bids.order_by('amount', 'id')]
+        return self.auction.current_price, bids
+
+    def test_manual_bid_outbid_by_proxy(self):
+        self.assertEqual(self._proxy(self.alice, '500')[1:], (Decimal('110'), True))
+        self._bid(self.bob, '200')
+        self.assertEqual(self._state(), (Decimal('210'), [
+            ('alice', Decimal('110')), ('bob', Decimal('200')), ('alice', Decimal('210')),
+        ]))
+        outbid = UserNotification.objects.filter(user=self.bob, type='outbid')  # type: ignore
+        self.assertTrue(outbid.exists())
+
+    def test_equal_maximums_earliest_wins(self):
+        self._proxy(self.alice, '300')
+        self.assertEqual(self._proxy(self.bob, '300')[1:], (Decimal('300'), False))
+        self.assertEqual(self._state(), (Decimal('300'), [('alice', Decimal('110')), ('alice', Decimal('300'))]))
+
+    def test_manual_bid_equal_to_earlier_maximum_loses(self):
+        self._proxy(self.alice, '300')
+        with self.assertRaises(BidRejected) as rejected:
+            self._bid(self.bob, '300')
+        self.assertEqual((rejected.exception.code, rejected.exception.current_price), ('outbid', Decimal('300')))
+        # سقف قدیمی‌تر با همان مبلغ پیشتاز می‌شود
+        self.assertEqual(self._state(), (Decimal('300'), [('alice', Decimal('110')), ('alice', Decimal('300'))]))
+
+    def test_increment_above_runner_up_capped_at_winner_max(self):
+        self._proxy(self.alice, '300')
+        self._proxy(self.bob, '500')
+        self.assertEqual(self._state(), (Decimal('310'), [
+            ('alice', Decimal('110')), ('alice', Decimal('300')), ('bob', Decimal('310')),
+        ]))
+        # سقف پیشتاز از «نفر دوم + گام» کمتر است: قیمت همان سقف می‌شود
+        self._proxy(self.alice, '505')
+        self.assertEqual(self._state()[0], Decimal('505'))
+
+    def test_proxy_below_current_price(self):
+        self._bid(self.bob, '200')
+        with self.assertRaises(BidRejected) as rejected:
+            self._proxy(self.alice, '150')
+        self.assertEqual(rejected.exception.code, 'outbid')
+        self.assertFalse(ProxyBid.objects.filter(bidder=self.alice).exists())  # type: ignore
+
+        # سقف کمتر از پیشنهاد دستی پاسخی ثبت نمی‌کند
+        self._proxy(self.alice, '250')
+        self._bid(self.bob, '400')
+        self.assertEqual(self._state(), (Decimal('400'), [
+            ('bob', Decimal('200')), ('alice', Decimal('210')), ('bob', Decimal('400')),
+        ]))
+
+
+class BidHistoryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        now = timezone.now()
+        seller = User.objects.create_user(username='seller', email='seller@example.com')
+        self.bidders = [User.objects.create_user(username=f'b{i}', email=f'b{i}@example.com') for i in range(3)]
+        self.auction = Auction.objects.create(  # type: ignore
+            title='auction', description='-', status='active',
+            start_date=now - timedelta(hours=1), end_date=now + timedelta(days=1),
+            starting_price=Decimal('100'), current_price=Decimal('100'), creator=seller,
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            for step in range(1, 6):
+                place_bid(self.auction.pk, self.bidders[step % 3], Decimal(100 + step * 10))
+
+    def test_history_keyset_pages(self):
+        url = f'/api/auctions/{self.auction.pk}/bids/?page_size=2'
+        amounts = []
+        while url:
+            data = self.client.get(url).json()
+            amounts += [row['amount'] for row in data['results']]
+            url = data['next']
+        self.assertEqual(amounts, ['150.00', '140.00', '130.00', '120.00', '110.00'])
+
+    def test_leaderboard_cached_and_invalidated(self):
+        url = f'/api/auctions/{self.auction.pk}/leaderboard/'
+        first = self.client.get(url).json()['results']
+        self.assertEqual([(row['rank'], row['bidder']['username'], row['amount']) for row in first],
+                         [(1, 'b2', '150.00'), (2, 'b1', '140.00'), (3, 'b0', '130.00')])
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+        self.assertEqual(len(queries), 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            place_bid(self.auction.pk, self.bidders[0], Decimal('500'))
+        top = self.client.get(f'{url}?limit=1').json()['results']
+        self.assertEqual([(row['bidder']['username'], row['amount']) for row in top], [('b0', '500.00')])
+
+    def test_highest_bid_uses_index(self):
+        queryset = Bid.objects.filter(auction=self.auction).order_by('-amount', '-id')[:1]  # type: ignore
+        self.assertIn('bid_auction_amount_idx', queryset.explain())
+
+
+class QueryPlanTests(TestCase):
+    def test_endpoints_avoid_full_scans(self):
+        rows = queryplan.report()
+        self.assertTrue(rows)
+        self.assertEqual({row['status'] for row in rows}, {200})
+        self.assertEqual([(row['endpoint'], row['full_scans']) for row in rows if row['full_scans']], [])
+
+    def test_unsupported_database(self):
+        self.assertEqual(queryplan.full_scans(['SCAN api_auction'], 'sqlite'), ['api_auction'])
+        with self.assertRaises(queryplan.QueryPlanError):
+            queryplan.full_scans(['TABLE ACCESS FULL'], 'oracle')
+        # فرمان خطا را به CommandError تبدیل می‌کند؛ الگوی پایگاه داده فعلی موقتاً برداشته می‌شود
+        pattern = queryplan._FULL_SCAN.pop(connection.vendor)
+        self.addCleanup(queryplan._FULL_SCAN.__setitem__, connection.vendor, pattern)
+        with self.assertRaisesMessage(CommandError, connection.vendor):
+            call_command('explain_queries', stdout=io.StringIO())
+
+    def test_unread_count_uses_partial_index(self):
+        user = User.objects.create_user(username='u', email='u@example.com', password='x')
+        UserNotification.objects.bulk_create([  # type: ignore
+            UserNotification(user=user, type='outbid', message='m', read=index % 20 != 0) for index in range(200)
+        ])
+        # بدون آمار، دو نمایه کاربر هزینه برابر دارند و انتخاب به ترتیب بارگذاری نمایه‌ها بستگی دارد
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        queryset = UserNotification.objects.filter(user=user, read=False).order_by('-created_at')  # type: ignore
+        self.assertIn('notification_user_unread_idx', queryset.explain())
+
+
+class NotificationFanoutTests(TestCase):
+    def setUp(self):
+        self.creator = User.objects.create_user(username='c', email='c@example.com', subscription_active=True)
+        self.admins = [
+            User.objects.create_user(username=f'a{i}', email=f'a{i}@example.com', is_admin=True) for i in range(5)
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(self.creator)
+
+    def test_admin_fanout_is_queued(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/api/create-auction/', {
+                'title': 'آهن', 'description': '-', 'starting_price': '100', 'category': 'metal',
+            })
+        self.assertEqual(response.status_code, 201)
+        # فهرست ادمین‌ها در درخواست خوانده نمی‌شود
+        self.assertFalse(any('"is_admin" = ' in query['sql'] for query in queries))
+        self.assertEqual(UserNotification.objects.filter(type='pending_approval').count(), 0)  # type: ignore
+        self.assertEqual(UserNotification.objects.filter(user=self.creator).count(), 1)  # type: ignore
+
+        self.assertEqual(notifications.deliver_batch(NotificationJob.objects.get().pk, batch_size=2), (2, False))
+        self.assertEqual(notifications.drain(batch_size=2), 3)
+        self.assertFalse(NotificationJob.objects.exists())  # type: ignore
+        self.assertEqual(
+            sorted(UserNotification.objects.filter(type='pending_approval').values_list('user_id', flat=True)),  # type: ignore
+            [admin.pk for admin in self.admins],
+        )
+
+    def test_auction_bidders_audience(self):
+        now = timezone.now()
+        auction = Auction.objects.create(  # type: ignore
+            title='t', description='-', status='active', start_date=now, end_date=now + timedelta(days=1),
+            starting_price=Decimal('100'), current_price=Decimal('100'), creator=self.creator,
+        )
+        for step, bidder in enumerate(self.admins, start=1):
+            place_bid(auction.pk, bidder, Decimal(100 + step))
+        notifications.notify_auction_bidders(auction.pk, 'auction_end', 'پایان', exclude=[self.admins[0].pk])
+        self.assertEqual(notifications.drain(batch_size=3), 4)
+        self.assertEqual(UserNotification.objects.filter(type='auction_end').count(), 4)  # type: ignore
+
+
+class NotificationCounterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='u', email='u@example.com')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            notifications.notify([self.user.pk], 'new_bid', 'a')
+            for message in ('b', 'c'):
+                UserNotification.objects.create(user=self.user, type='outbid', message=message, read=False)  # type: ignore
+            UserNotification.objects.create(user=self.user, type='outbid', message='d', read=True)  # type: ignore
+
+    def unread(self):
+        return self.client.get('/api/notifications/unread-count/').json()['unread']
+
+    def test_counter_without_count_query(self):
+        self.assertEqual(self.unread(), 3)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.unread(), 3)
+        self.assertFalse(any('COUNT(' in query['sql'] for query in queries))
+
+    def test_mark_read_up_to_id(self):
+        second = UserNotification.objects.filter(message='b').get()  # type: ignore
+        with self.captureOnCommitCallbacks(execute=True):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post('/api/notifications/mark-read/', {'up_to_id': second.pk})
+        self.assertEqual(response.json(), {'updated': 2, 'unread': 1})
+        self.assertEqual(sum(query['sql'].startswith('UPDATE "api_usernotification"') for query in queries), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/notifications/mark-read/')
+        self.assertEqual(response.json(), {'updated': 1, 'unread': 0})
+        self.assertEqual(self.client.post('/api/notifications/mark-read/', {'before': 'x'}).status_code, 400)
+
+    def test_counter_follows_single_updates_and_deletes(self):
+        notification = UserNotification.objects.filter(read=False).first()  # type: ignore
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f'/api/notifications/{notification.pk}/mark-read/')
+            UserNotification.objects.filter(read=False).first().delete()  # type: ignore
+        self.assertEqual(self.unread(), 1)
+        unread = UserNotification.objects.filter(user=self.user, read=False).count()  # type: ignore
+        self.assertEqual(NotificationCounter.objects.get(user=self.user).unread, unread)  # type: ignore
+
+    def test_rebuild_and_migration_backfill(self):
+        version = notifications.counter(self.user.pk)['version']
+        self.assertEqual(notifications.rebuild_counters(), 1)
+        rebuilt = notifications.counter(self.user.pk)
+        self.assertEqual(rebuilt['unread'], 3)
+        self.assertGreater(rebuilt['version'], version)
+
+        NotificationCounter.objects.all().delete()  # type: ignore
+        import_module('api.migrations.0024_notification_counter').backfill_counters(apps, connection.schema_editor())
+        backfilled = notifications.counter(self.user.pk)
+        self.assertEqual(backfilled['unread'], 3)
+        self.assertGreater(backfilled['version'], rebuilt['version'])
+
+    def test_paginated_listing(self):
+        page = self.client.get('/api/notifications/?page_size=3').json()
+        self.assertEqual([row['message'] for row in page['results']], ['d', 'c', 'b'])
+        rest = self.client.get(page['next']).json()
+        self.assertEqual([row['message'] for row in rest['results']], ['a'])
+
+
+class NotificationCoalescingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        now = timezone.now()
+        self.creator = User.objects.create_user(username='c', email='c@example.com')
+        self.bidders = [User.objects.create_user(username=f'b{i}', email=f'b{i}@example.com') for i in range(2)]
+        self.auction = Auction.objects.create(  # type: ignore
+            title='مس', description='-', status='active', start_date=now, end_date=now + timedelta(days=1),
+            starting_price=Decimal('100'), current_price=Decimal('100'), creator=self.creator,
+        )
+
+    def bid(self, step):
+        with self.captureOnCommitCallbacks(execute=True):
+            place_bid(self.auction.pk, self.bidders[step % 2], Decimal(4_500_000 + step))
+
+    def test_repeated_bids_update_one_digest_row(self):
+        for step in range(12):
+            self.bid(step)
+        rows = UserNotification.objects.filter(user=self.creator, type='new_bid')  # type: ignore
+        self.assertEqual(rows.count(), 1)
+        digest = rows.get()
+        self.assertEqual((digest.count, digest.read, digest.auction_id), (12, False, self.auction.pk))
+        self.assertIn('12 پیشنهاد جدید', digest.message)
+        self.assertIn('4,500,011', digest.message)
+        self.assertEqual(notifications.counter(self.creator.pk)['unread'], 1)
+        self.assertGreater(digest.last_event_at, digest.created_at)
+
+    def test_coalescing_keeps_cursor_position(self):
+        self.bid(0)
+        digest = UserNotification.objects.get(user=self.creator, type='new_bid')  # type: ignore
+        later = UserNotification.objects.create(  # type: ignore
+            user=self.creator, type='won_auction', message='later', read=False
+        )
+        self.bid(2)
+        digest.refresh_from_db()
+        self.assertEqual(digest.count, 2)
+        self.assertLess(digest.created_at, later.created_at)
+
+        client = APIClient()
+        client.force_authenticate(self.creator)
+        results = client.get('/api/notifications/').json()['results']
+        self.assertEqual([entry['id'] for entry in results][:2], [later.pk, digest.pk])
+        self.assertIsNone(results[0]['last_event_at'])
+        self.assertEqual(parse_datetime(results[1]['last_event_at']), digest.last_event_at)
+        self.assertEqual(parse_datetime(results[1]['created_at']), digest.created_at)
+
+    def test_read_or_expired_rows_are_not_coalesced(self):
+        self.bid(0)
+        UserNotification.objects.filter(user=self.creator).update(read=True)  # type: ignore
+        self.bid(1)
+        with override_settings(NOTIFICATION_COALESCE_WINDOW=0):
+            self.bid(2)
+        counts = list(UserNotification.objects.filter(  # type: ignore
+            user=self.creator, type='new_bid'
+        ).order_by('-created_at', '-id').values_list('count', 'read'))
+        self.assertEqual(counts, [(1, False), (1, False), (1, True)])
+
+
+class NotificationRetentionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='u', email='u@example.com')
+        old = timezone.now() - timedelta(days=120)
+        notifications.record_created(UserNotification.objects.bulk_create([  # type: ignore
+            UserNotification(user=self.user, type='outbid', message=f'm{i}', read=i != 0) for i in range(7)
+        ]))
+        UserNotification.objects.update(created_at=old)  # type: ignore
+        UserNotification.objects.create(user=self.user, type='outbid', message='new', read=True)  # type: ignore
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    @override_settings(NOTIFICATION_ARCHIVE_CHUNK_SIZE=4)
+    def test_archive_in_batches_and_load_older(self):
+        self.assertEqual(retention.archive(days=90, batch_size=2), 6)
+        # فقط اعلان خوانده‌نشده قدیمی و اعلان تازه در جدول اصلی می‌مانند
+        self.assertEqual(sorted(UserNotification.objects.values_list('message', flat=True)), ['m0', 'new'])  # type: ignore
+        self.assertEqual(list(NotificationArchive.objects.order_by('id').values_list('count', flat=True)), [4, 2])  # type: ignore
+        self.assertEqual(notifications.counter(self.user.pk)['unread'], 1)
+
+        page = self.client.get('/api/notifications/archive/').json()
+        self.assertEqual([entry['message'] for entry in page['results']], ['m6', 'm5'])
+        rest = self.client.get(page['next']).json()
+        self.assertEqual([entry['message'] for entry in rest['results']], ['m4', 'm3', 'm2', 'm1'])
+        self.assertIsNone(rest['next'])
+        self.assertEqual(rest['results'][0], UserNotificationSerializer(
+            UserNotification(id=rest['results'][0]['id'], user=self.user, type='outbid', message='m4', read=True,
+                             created_at=parse_datetime(rest['results'][0]['created_at']))
+        ).data)
+
+
+    def test_counter_updates_once_per_user(self):
+        other = User.objects.create_user(username='o', email='o@example.com')
+        UserNotification.objects.bulk_create([  # type: ignore
+            UserNotification(user=other, type='outbid', message=f'o{i}', read=True) for i in range(3)
+        ])
+        UserNotification.objects.update(created_at=timezone.now() - timedelta(days=120))  # type: ignore
+        version = notifications.counter(self.user.pk)['version']
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(retention.archive_batch(timezone.now() - timedelta(days=90)), 10)
+        counter_updates = [query for query in queries if query['sql'].startswith('UPDATE "api_notificationcounter"')]
+        self.assertEqual(len(counter_updates), 2)
+        self.assertEqual(notifications.counter(self.user.pk), {'unread': 1, 'version': version + 1})
+
+        # ردیف خوانده‌نشده از سیگنال post_delete عادی همچنان شمارنده را کم می‌کند
+        UserNotification.objects.get(message='m0').delete()  # type: ignore
+        self.assertEqual(notifications.counter(self.user.pk)['unread'], 0)
+
+
+class CurrencyRateHistoryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.currency = CurrencyRate.objects.create(  # type: ignore
+            name='دلار', code='USD', rate=Decimal('100.0000'), change=Decimal('0')
+        )
+        # تاریخچه ساخته‌شده هنگام ایجاد کنار گذاشته می‌شود تا زمان تیک‌ها مشخص باشد
+        CurrencyRateSeries.objects.all().delete()  # type: ignore
+        CurrencyRateCandle.objects.all().delete()  # type: ignore
+        self.base = datetime(2026, 1, 1, 10, 0, tzinfo=dt_timezone.utc)
+
+    def tick(self, rate, minutes):
+        history.record([(self.currency.pk, Decimal(rate), self.base + timedelta(minutes=minutes))])
+
+    def test_ticks_are_appended_and_downsampled(self):
+        for rate, minutes in [('101', 0), ('105.5', 0.5), ('99', 1), ('102', 61), ('98.1234', 62)]:
+            self.tick(rate, minutes)
+        series = CurrencyRateSeries.objects.get()  # type: ignore
+        self.assertEqual(series.count, 5)
+        self.assertEqual(len(bytes(series.times)), 5 * 8)
+        self.assertEqual(history.raw_ticks(self.currency.pk, self.base, self.base + timedelta(hours=2))[-1],
+                         (self.base + timedelta(minutes=62), Decimal('98.1234')))
+
+        def ohlc(resolution):
+            return list(CurrencyRateCandle.objects.filter(resolution=resolution).order_by('start').values_list(  # type: ignore
+                'open', 'high', 'low', 'close', 'ticks'))
+
+        self.assertEqual(ohlc('minute')[0], (Decimal('101'), Decimal('105.5'), Decimal('101'), Decimal('105.5'), 2))
+        self.assertEqual(ohlc('hour'), [
+            (Decimal('101'), Decimal('105.5'), Decimal('99'), Decimal('99'), 3),
+            (Decimal('102'), Decimal('102'), Decimal('98.1234'), Decimal('98.1234'), 2),
+        ])
+        self.assertEqual(ohlc('day'), [(Decimal('101'), Decimal('105.5'), Decimal('98.1234'), Decimal('98.1234'), 5)])
+
+        snapshot = ohlc('minute') + ohlc('hour') + ohlc('day')
+        history.rebuild()
+        self.assertEqual(ohlc('minute') + ohlc('hour') + ohlc('day'), snapshot)
+
+    def test_rate_change_records_tick(self):
+        self.currency.name = 'دلار آمریکا'
+        self.currency.save()
+        self.assertFalse(CurrencyRateSeries.objects.exists())  # type: ignore
+        self.currency.rate = Decimal('110')
+        self.currency.save()
+        self.assertEqual(CurrencyRateSeries.objects.get().count, 1)  # type: ignore
+
+    def test_history_endpoint_reads_candles(self):
+        self.tick('101', 0)
+        self.tick('102', 90)
+        url = f'/api/currency-rates/{self.currency.pk}/history/'
+        params = {'from': self.base.isoformat(), 'to': (self.base + timedelta(hours=3)).isoformat()}
+        # وجود ارز، نسخه کش و خلاصه‌ها
+        with self.assertNumQueries(3):
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([(row['resolution'], row['close']) for row in response.json()],
+                         [('minute', '101.0000'), ('minute', '102.0000')])
+        self.assertIn('ETag', response)
+
+        response = self.client.get(url, {**params, 'resolution': 'hour'})
+        self.assertEqual([row['start'] for row in response.json()],
+                         ['2026-01-01T10:00:00Z', '2026-01-01T11:00:00Z'])
+
+        wide = {'from': self.base.isoformat(), 'to': (self.base + timedelta(days=30)).isoformat()}
+        self.assertEqual(self.client.get(url, wide).json()[0]['resolution'], 'hour')
+        self.assertEqual(self.client.get(url, {**wide, 'resolution': 'minute'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/currency-rates/999999/history/').status_code, 404)
+
+
+class CurrencyFeedIngestTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.usd = CurrencyRate.objects.create(  # type: ignore
+            name='دلار', code='USD', rate=Decimal('50000'), change=Decimal('0')
+        )
+        self.eur = CurrencyRate.objects.create(  # type: ignore
+            name='یورو', code='EUR', rate=Decimal('60000'), change=Decimal('0')
+        )
+        self.admin = User.objects.create_user(username='admin', email='admin@example.com', is_staff=True)
+
+    def test_feed_writes_only_changes_in_one_batch(self):
+        feed = 'code,name,rate\nusd,دلار,"51,000"\nEUR,یورو,60000\nXAU,طلا,3500000.5\n'
+        quotes = ingest.parse(feed)
+        self.assertEqual([quote['code'] for quote in quotes], ['USD', 'EUR', 'XAU'])
+
+        version = caching.version(caching.CURRENCIES)
+        with self.captureOnCommitCallbacks(execute=True), CaptureQueriesContext(connection) as queries:
+            summary = ingest.ingest(quotes)
+        self.assertEqual(summary, {'total': 3, 'created': 1, 'updated': 1, 'unchanged': 1})
+        # کش ارزها یک بار برای کل دسته بی‌اعتبار می‌شود
+        self.assertEqual(caching.version(caching.CURRENCIES), version + 1)
+        writes = [query['sql'] for query in queries.captured_queries if query['sql'].startswith('UPDATE "api_currencyrate"')]
+        self.assertEqual(len(writes), 1)
+
+        self.usd.refresh_from_db()
+        self.eur.refresh_from_db()
+        self.assertEqual((self.usd.rate, self.usd.change), (Decimal('51000'), Decimal('2')))
+        self.assertEqual(self.eur.change, Decimal('0'))
+        gold = CurrencyRate.objects.get(code='XAU')  # type: ignore
+        self.assertEqual(gold.rate, Decimal('3500000.5'))
+        # تاریخچه فقط برای نرخ‌های تغییرکرده تیک می‌گیرد (یک تیک ایجاد + یک تیک به‌روزرسانی برای USD)
+        self.assertEqual(dict(CurrencyRateSeries.objects.values_list('currency__code', 'count')),  # type: ignore
+                         {'USD': 2, 'EUR': 1, 'XAU': 1})
+
+        self.assertEqual(ingest.ingest(quotes), {'total': 3, 'created': 0, 'updated': 0, 'unchanged': 3})
+
+    def test_command_ingest_visible_on_next_get(self):
+        url = '/api/currency-rates/'
+        first = self.client.get(url)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', encoding='utf-8', delete=False) as feed:
+            feed.write('code,rate\nUSD,52000\n')
+        self.addCleanup(os.remove, feed.name)
+        # فرمان در پروسه جداگانه با کش خودش اجرا می‌شود
+        other_process = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                                     'LOCATION': 'ingest'}}
+        with override_settings(CACHES=other_process), self.captureOnCommitCallbacks(execute=True):
+            call_command('ingest_currency_feed', feed.name, stdout=io.StringIO())
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        rates = {row['code']: row['rate'] for row in response.json()}
+        self.assertEqual(rates, {'USD': '52000.0000', 'EUR': '60000.0000'})
+
+    def test_invalid_feed_is_rejected(self):
+        with self.assertRaises(ingest.FeedError):
+            ingest.parse('[{"code": "USD", "rate": "abc"}]')
+        with self.assertRaises(ingest.FeedError):
+            ingest.parse('{"items": []}')
+        for rate in ('NaN', 'sNaN', 'Infinity', '-1', '0', '0.00001'):
+            with self.subTest(rate=rate), self.assertRaises(ingest.FeedError):
+                ingest.parse(json.dumps([{'code': 'usd', 'rate': rate}]))
+
+    def test_admin_endpoint(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        url = '/api/admin/currencies/ingest/'
+        response = client.post(url, {'quotes': [{'code': 'USD', 'rate': '49000'}], 'dry_run': True}, format='json')
+        self.assertEqual(response.json()['updated'], 1)
+        self.usd.refresh_from_db()
+        self.assertEqual(self.usd.rate, Decimal('50000'))
+
+        upload = io.BytesIO(json.dumps({'quotes': [{'code': 'USD', 'rate': 49000}]}).encode('utf-8'))
+        upload.name = 'feed.json'
+        response = client.post(url, {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, 200)
+        self.usd.refresh_from_db()
+        self.assertEqual((self.usd.rate, self.usd.change), (Decimal('49000'), Decimal('-2')))
+
+        self.assertEqual(client.post(url, {}, format='json').status_code, 400)
+        client.force_authenticate(User.objects.create_user(username='u', email='u@example.com'))
+        self.assertEqual(client.post(url, {'quotes': []}, format='json').status_code, 403)
+
+
+class PriceBoardTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user(username='admin', email='admin@example.com', is_staff=True)
+
+    def test_snapshot_is_cached_and_versioned(self):
+        url = '/api/price-board/'
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        metal = next(board for board in response.json()['boards'] if board['board'] == 'metal')
+        self.assertEqual(metal['prices'][0]['name'], 'آهن سوپر ویژه')
+        etag = response['ETag']
+
+        # فقط کوئری نسخه؛ snapshot از کش خوانده می‌شود
+        with self.assertNumQueries(2):
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            summary = priceboard.ingest(priceboard.parse(
+                'board,name,retail,wholesale\n'
+                'metal,آهن سوپر ویژه,18000,20042\n'
+                'metal,آهن درجه یک,15592,17949\n'
+                'metal,مس شمش,120000,130000\n'
+            ))
+        self.assertEqual(summary, {'total': 3, 'created': 1, 'updated': 1, 'unchanged': 1})
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        metal = next(board for board in response.json()['boards'] if board['board'] == 'metal')
+        self.assertEqual(metal['prices'][0]['retail'], '18000.00')
+        self.assertEqual(metal['prices'][-1]['name'], 'مس شمش')
+
+    def test_command_ingest_visible_on_next_get(self):
+        url = '/api/price-board/'
+        first = self.client.get(url)
+        with tempfile.NamedTemporaryFile('w', suffix='.json', encoding='utf-8', delete=False) as feed:
+            json.dump({'prices': [{'board': 'metal', 'name': 'آهن سوپر ویژه', 'retail': '1', 'wholesale': '2'}]},
+                      feed)
+        self.addCleanup(os.remove, feed.name)
+        # فرمان در پروسه جداگانه با کش خودش اجرا می‌شود
+        other_process = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                                     'LOCATION': 'ingest'}}
+        with override_settings(CACHES=other_process), self.captureOnCommitCallbacks(execute=True):
+            call_command('ingest_price_board', feed.name, stdout=io.StringIO())
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        metal = next(board for board in response.json()['boards'] if board['board'] == 'metal')
+        self.assertEqual((metal['prices'][0]['retail'], metal['prices'][0]['wholesale']), ('1.00', '2.00'))
+        self.assertGreater(response.json()['version'], first.json()['version'])
+
+    def test_non_finite_or_negative_price_is_rejected(self):
+        for retail in ('NaN', 'Infinity', '-5', '0'):
+            with self.subTest(retail=retail), self.assertRaises(ingest.FeedError):
+                priceboard.parse_rows([{'board': 'metal', 'name': 'مس', 'retail': retail, 'wholesale': '1'}])
+
+    def test_admin_ingest(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        url = '/api/admin/price-board/ingest/'
+        response = client.post(url, {'prices': [{'board': 'glass', 'name': 'x', 'retail': 1, 'wholesale': 1}]},
+                                format='json')
+        self.assertEqual(response.status_code, 400)
+        response = client.post(url, {'prices': [
+            {'board': 'non_metal', 'name': 'سبد در هم', 'retail': '13000', 'wholesale': '18183'}
+        ]}, format='json')
+        self.assertEqual(response.json()['updated'], 1)
+        self.assertEqual(ScrapPrice.objects.get(name='سبد در هم').retail, Decimal('13000'))  # type: ignore
@@ -2,10 +2,10 @@ from django.urls import path
 from rest_framework_simplejwt.views import TokenRefreshView
 from .views import (
     UserRegistrationView, UserLoginView, UserProfileView,
-    AuctionListCreateView, AuctionDetailView,
-    BidCreateView, CurrencyRateListView,
-    UserNotificationListView, mark_notification_read,
-    user_auctions, SubscriptionPurchaseView,
+    AuctionListCreateView, AuctionDetailView, AuctionSearchView, AuctionTrendView,
+    BidCreateView, AuctionBidListView, AuctionLeaderboardView, ProxyBidView, CurrencyRateListView, CurrencyRateHistoryView, price_board,
+    UserNotificationListView, notification_archive, notification_unread_count, mark_notification_read, mark_notifications_read,
+    MyAuctionsView, SubscriptionPurchaseView,
     CreateAuctionView, CreateTenderView,
     ChangePasswordView,
     # Admin Views
@@ -13,7 +13,7 @@ from .views import (
     AdminAuctionManagementView, AdminAuctionDetailView,
     AdminBidManagementView, AdminBidDetailView,
     AdminNotificationManagementView, AdminNotificationDetailView,
-    AdminCurrencyManagementView, AdminCurrencyDetailView,
+    AdminCurrencyManagementView, AdminCurrencyDetailView, admin_ingest_currencies, admin_ingest_price_board,
     admin_bulk_action, admin_export_data, admin_approve_auction, admin_pending_approvals
 )
 
@@ -26,18 +26,28 @@ urlpatterns = [
     
     # User Profile URLs
     path('profile/', UserProfileView.as_view(), name='user-profile'),
-    path('profile/auctions/', user_auctions, name='user-auctions'),
+    path('profile/auctions/', MyAuctionsView.as_view(), name='user-auctions'),
     
     # Auction URLs
     path('auctions/', AuctionListCreateView.as_view(), name='auction-list-create'),
+    path('auctions/search/', AuctionSearchView.as_view(), name='auction-search'),
+    path('auctions/trends/', AuctionTrendView.as_view(), name='auction-trends'),
     path('auctions/<int:pk>/', AuctionDetailView.as_view(), name='auction-detail'),
     path('auctions/<int:auction_pk>/bid/', BidCreateView.as_view(), name='auction-bid'),
+    path('auctions/<int:auction_pk>/bids/', AuctionBidListView.as_view(), name='auction-bids'),
+    path('auctions/<int:auction_pk>/leaderboard/', AuctionLeaderboardView.as_view(), name='auction-leaderboard'),
+    path('auctions/<int:auction_pk>/proxy-bid/', ProxyBidView.as_view(), name='auction-proxy-bid'),
     
     # Currency Rates URLs
     path('currency-rates/', CurrencyRateListView.as_view(), name='currency-rates'),
+    path('currency-rates/<int:pk>/history/', CurrencyRateHistoryView.as_view(), name='currency-rate-history'),
+    path('price-board/', price_board, name='price-board'),
     
     # Notification URLs
     path('notifications/', UserNotificationListView.as_view(), name='notification-list'),
+    path('notifications/archive/', notification_archive, name='notification-archive'),
+    path('notifications/unread-count/', notification_unread_count, name='notification-unread-count'),
+    path('notifications/mark-read/', mark_notifications_read, name='mark-notifications-read'),
     path('notifications/<int:pk>/mark-read/', mark_notification_read, name='mark-notification-read'),
     
     # Subscription URLs
@@ -69,6 +79,8 @@ urlpatterns = [
     # Admin Currency Management
     path('admin/currencies/', AdminCurrencyManagementView.as_view(), name='admin-currencies'),
     path('admin/currencies/<int:pk>/', AdminCurrencyDetailView.as_view(), name='admin-currency-detail'),
+    path('admin/currencies/ingest/', admin_ingest_currencies, name='admin-ingest-currencies'),
+    path('admin/price-board/ingest/', admin_ingest_price_board, name='admin-ingest-price-board'),
     
     # Admin Bulk Actions
     path('admin/bulk-action/', admin_bulk_action, name='admin-bulk-action'),
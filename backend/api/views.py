@@ -1,25 +1,62 @@
 from rest_framework import generics, status, permissions
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
+from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
+from rest_framework.exceptions import ValidationError
 from rest_framework_simplejwt.tokens import RefreshToken
+from django.conf import settings
 from django.shortcuts import get_object_or_404
+from django.http import StreamingHttpResponse
+from django.core.handlers.asgi import ASGIRequest
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.contrib.auth import authenticate
 from django.db.models import QuerySet, Count, Sum, Avg, Q
 from django.db.models.functions import TruncDate
 from typing import Any, Dict
 from datetime import timedelta
-from .models import User, Auction, Bid, CurrencyRate, UserNotification
+from decimal import Decimal, InvalidOperation
+from .models import User, Auction, AuctionParticipation, Bid, ProxyBid, CurrencyRate, UserNotification
 from .serializers import (
-    UserSerializer, AuctionSerializer, BidSerializer,
-    CurrencyRateSerializer, UserNotificationSerializer,
+    UserSerializer, AuctionSerializer, BidSerializer, ProxyBidSerializer,
+    CurrencyRateSerializer, CurrencyRateCandleSerializer, UserNotificationSerializer, AuctionParticipationSerializer,
     UserLoginSerializer, UserRegistrationSerializer
 )
-from .permissions import IsAdminUser
+from .permissions import IsAdminUser, visible_auctions
+from .pagination import (
+    AuctionCursorPagination, BidCursorPagination, NotificationCursorPagination, ParticipationCursorPagination
+)
+from .bidding import place_bid, register_proxy_bid, BidRejected
+from .events import publish_status_changes
+from .exports import EXPORTS, FORMATS as EXPORT_FORMATS, export_stream, streaming_content
+from .renderers import CSVRenderer, FastJSONRenderer, NDJSONRenderer
+from .search import search_auctions
+from . import caching, history, ingest, notifications, participation, priceboard, retention, rollups, sync
+from .caching import CachedListMixin, ConditionalListMixin
+from .sparse import SparseFieldsViewMixin
 import jdatetime
 import datetime
 
+# بیشترین بازه فیلتر ending_within (ساعت)؛ مقدار بزرگ‌تر timedelta را سرریز می‌کند
+_MAX_ENDING_WITHIN_HOURS = 24 * 366
+
+
+def _decimal_param(params, name, minimum=None, maximum=None):
+    value = params.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        number = Decimal(value)
+    except InvalidOperation:
+        raise ValidationError({name: 'عدد نامعتبر است'})
+    # NaN و Infinity برای Decimal معتبرند ولی در فیلتر و timedelta خطای ۵۰۰ می‌دهند
+    if not number.is_finite():
+        raise ValidationError({name: 'عدد نامعتبر است'})
+    if (minimum is not None and number < minimum) or (maximum is not None and number > maximum):
+        raise ValidationError({name: f'مقدار باید بین {minimum} و {maximum} باشد'})
+    return number
+
 class UserRegistrationView(generics.CreateAPIView):
     queryset = User.objects.all()
     serializer_class = UserRegistrationSerializer
@@ -88,19 +125,100 @@ class ChangePasswordView(APIView):
             'refresh': str(refresh)
         }, status=status.HTTP_200_OK)
 
-class AuctionListCreateView(generics.ListCreateAPIView):
-    queryset = Auction.objects.all()  # type: ignore
+class AuctionListCreateView(ConditionalListMixin, CachedListMixin, SparseFieldsViewMixin, generics.ListCreateAPIView):
+    queryset = Auction.objects.select_related('creator', 'winner').all()  # type: ignore
     serializer_class = AuctionSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = AuctionCursorPagination
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+    cache_namespace = caching.AUCTIONS
+    time_dependent_params = ('ending_within',)
+    # ستون‌های ترتیب صفحه‌بندی cursor حتی اگر در ?fields= نباشند خوانده می‌شوند
+    sparse_extra_fields = ('created_at', 'end_date')
+
+    def get_queryset(self):
+        queryset = Auction.objects.select_related('creator', 'winner').all()  # type: ignore
+        params = self.request.query_params
+
+        status_filter = params.get('status')
+        if status_filter:
+            queryset = queryset.filter(status__in=status_filter.split(','))
+
+        for field in ('category', 'location', 'condition'):
+            value = params.get(field)
+            if value:
+                queryset = queryset.filter(**{field: value})
+
+        # نوع آگهی: مناقصه یا مزایده
+        listing_type = params.get('type')
+        if listing_type == 'tender':
+            queryset = queryset.filter(condition='tender')
+        elif listing_type == 'auction':
+            queryset = queryset.exclude(condition='tender')
+
+        min_price = _decimal_param(params, 'min_price')
+        if min_price is not None:
+            queryset = queryset.filter(current_price__gte=min_price)
+        max_price = _decimal_param(params, 'max_price')
+        if max_price is not None:
+            queryset = queryset.filter(current_price__lte=max_price)
+
+        # در حال اتمام: مزایده‌های فعالی که تا چند ساعت آینده تمام می‌شوند
+        ending_within = _decimal_param(params, 'ending_within', minimum=0, maximum=_MAX_ENDING_WITHIN_HOURS)
+        if ending_within is not None:
+            now = timezone.now()
+            queryset = queryset.filter(
+                status='active',
+                end_date__gt=now,
+                end_date__lte=now + timedelta(hours=float(ending_within))
+            )
+
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        since = request.query_params.get('updated_since')
+        if since is None:
+            return super().list(request, *args, **kwargs)
+        return self.delta(request, sync.parse_since(since))
+
+    def delta(self, request, since):
+        """
+        همگام‌سازی تغییرات: فقط مزایده‌هایی که پس از updated_since تغییر کرده‌اند،
+        به همراه شناسه‌های حذف‌شده و cursor درخواست بعدی.
+        """
+        try:
+            limit = int(request.query_params.get('page_size', 100))
+        except ValueError:
+            limit = 0
+        if limit < 1:
+            raise ValidationError({'page_size': 'عدد نامعتبر است'})
+        limit = min(limit, 1000)
+        base = AuctionSerializer.sparse_queryset(
+            Auction.objects.select_related('creator', 'winner'), request, extra=('updated_at', 'status')  # type: ignore
+        )
+        data = sync.changes(
+            base, since, limit,
+            lambda rows: self.get_serializer(rows, many=True).data,
+            visible=self.filter_queryset(self.get_queryset()),
+        )
+        if data.get('resync'):
+            return Response(
+                {'error': 'updated_since قدیمی‌تر از بازه نگهداری تغییرات است؛ فهرست کامل را دوباره دریافت کنید'},
+                status=status.HTTP_410_GONE
+            )
+        return Response(data)
 
     def perform_create(self, serializer):
         serializer.save(creator=self.request.user)
 
-class AuctionDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Auction.objects.all()  # type: ignore
+class AuctionDetailView(SparseFieldsViewMixin, generics.RetrieveUpdateDestroyAPIView):
+    queryset = Auction.objects.select_related('creator', 'winner').all()  # type: ignore
     serializer_class = AuctionSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
+    def get_queryset(self):
+        return visible_auctions(super().get_queryset(), self.request.user)
+
     def perform_update(self, serializer):
         if self.request.user != serializer.instance.creator:
             return Response(
@@ -113,37 +231,204 @@ class BidCreateView(generics.CreateAPIView):
     serializer_class = BidSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def perform_create(self, serializer):
-        auction = get_object_or_404(Auction, pk=self.kwargs['auction_pk'])
-        if auction.status != 'active' or auction.end_date < timezone.now():
-            return Response(
-                {"error": "This auction is not active"},
-                status=status.HTTP_400_BAD_REQUEST
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        # قیمت فعلی در موتور پیشنهاد به‌صورت اتمیک بررسی و به‌روزرسانی می‌شود
+        try:
+            bid = place_bid(self.kwargs['auction_pk'], request.user, serializer.validated_data['amount'])
+        except BidRejected as e:
+            return Response(e.as_response_data(), status=e.http_status)
+
+        return Response(self.get_serializer(bid).data, status=status.HTTP_201_CREATED)
+
+class AuctionBidListView(SparseFieldsViewMixin, generics.ListAPIView):
+    """تاریخچه پیشنهادهای یک مزایده با صفحه‌بندی keyset روی ایندکس (auction, amount)"""
+    serializer_class = BidSerializer
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = BidCursorPagination
+
+    def get_queryset(self):
+        return Bid.objects.filter(auction_id=self.kwargs['auction_pk']).select_related('bidder')  # type: ignore
+
+class AuctionLeaderboardView(APIView):
+    """پیشنهاددهندگان برتر یک مزایده (?limit= حداکثر LEADERBOARD_SIZE) از کش"""
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+
+    def get(self, request, auction_pk):
+        try:
+            limit = min(max(int(request.query_params.get('limit', settings.LEADERBOARD_SIZE)), 1),
+                        settings.LEADERBOARD_SIZE)
+        except ValueError:
+            raise ValidationError({'limit': 'عدد نامعتبر است'})
+        return Response({
+            'auction': auction_pk,
+            'results': participation.leaderboard(auction_pk)[:limit],
+        })
+
+class ProxyBidView(APIView):
+    """ثبت و مشاهده سقف پیشنهاد خودکار کاربر برای یک مزایده"""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, auction_pk):
+        proxy = get_object_or_404(ProxyBid, auction_id=auction_pk, bidder=request.user)
+        return Response(ProxyBidSerializer(proxy).data)
+
+    def post(self, request, auction_pk):
+        serializer = ProxyBidSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            proxy, current_price, leading = register_proxy_bid(
+                auction_pk, request.user, serializer.validated_data['max_amount']
             )
-        
-        bid = serializer.save(bidder=self.request.user, auction=auction)
-        auction.current_price = bid.amount
-        auction.save()
+        except BidRejected as e:
+            return Response(e.as_response_data(), status=e.http_status)
+
+        return Response({
+            'proxy_bid': ProxyBidSerializer(proxy).data,
+            'current_price': str(current_price),
+            'leading': leading
+        }, status=status.HTTP_200_OK)
+
+class AuctionSearchView(SparseFieldsViewMixin, generics.ListAPIView):
+    """جستجوی متنی عمومی در مزایده‌ها و مناقصه‌ها به ترتیب ارتباط"""
+    serializer_class = AuctionSerializer
+    permission_classes = [permissions.AllowAny]
+    # آگهی‌هایی که هنوز تایید نشده‌اند در جستجوی عمومی نمایش داده نمی‌شوند
+    hidden_statuses = ('pending_review', 'rejected')
 
-        # Create notification for auction creator
-        UserNotification.objects.create(  # type: ignore
-            user=auction.creator,
-            type='new_bid',
-            message=f'New bid of {bid.amount} on your auction {auction.title}'
+    def get_queryset(self):
+        params = self.request.query_params
+        query = params.get('q', '').strip()
+        if not query:
+            raise ValidationError({'q': 'عبارت جستجو الزامی است'})
+        try:
+            limit = min(max(int(params.get('limit', 20)), 1), 100)
+        except ValueError:
+            raise ValidationError({'limit': 'عدد نامعتبر است'})
+
+        queryset = Auction.objects.select_related('creator', 'winner').exclude(  # type: ignore
+            status__in=self.hidden_statuses
         )
+        status_filter = params.get('status')
+        if status_filter:
+            queryset = queryset.filter(status__in=status_filter.split(','))
+        listing_type = params.get('type')
+        if listing_type == 'tender':
+            queryset = queryset.filter(condition='tender')
+        elif listing_type == 'auction':
+            queryset = queryset.exclude(condition='tender')
+        return search_auctions(queryset, query, limit=limit)
+
+class AuctionTrendView(APIView):
+    """سری‌های امروز/دیروز/هفته/ماه و روند ماهانه آگهی‌ها از جدول خلاصه روزانه"""
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        params = request.query_params
+        try:
+            months = min(max(int(params.get('months', 6)), 1), 24)
+        except ValueError:
+            raise ValidationError({'months': 'عدد نامعتبر است'})
+        status_filter = params.get('status')
+        return Response(rollups.trend_series(
+            months=months,
+            category=params.get('category') or None,
+            status=status_filter.split(',') if status_filter else None,
+        ))
 
-class CurrencyRateListView(generics.ListAPIView):
+class CurrencyRateListView(ConditionalListMixin, CachedListMixin, SparseFieldsViewMixin, generics.ListAPIView):
     queryset = CurrencyRate.objects.all()  # type: ignore
     serializer_class = CurrencyRateSerializer
     permission_classes = [permissions.AllowAny]
+    cache_namespace = caching.CURRENCIES
 
-class UserNotificationListView(generics.ListAPIView):
+class CurrencyRateHistoryView(ConditionalListMixin, CachedListMixin, generics.ListAPIView):
+    """
+    سری OHLC نرخ یک ارز در بازه from تا to (پیش‌فرض: یک روز گذشته).
+
+    resolution یکی از minute/hour/day است؛ بدون آن ریزترین وضوحی انتخاب می‌شود
+    که تعداد نقاط از CURRENCY_HISTORY_MAX_POINTS بیشتر نشود. فقط جدول خلاصه‌ها
+    خوانده می‌شود، نه تیک‌های خام.
+    """
+    serializer_class = CurrencyRateCandleSerializer
+    permission_classes = [permissions.AllowAny]
+    pagination_class = None
+    cache_namespace = caching.CURRENCIES
+
+    def list_validators(self, request):
+        # بدون to انتهای بازه زمان فعلی است و پاسخ با گذر زمان تغییر می‌کند
+        if 'to' not in request.query_params:
+            return None
+        return super().list_validators(request)
+
+    def get_queryset(self):
+        get_object_or_404(CurrencyRate.objects.only('id'), pk=self.kwargs['pk'])  # type: ignore
+        params = self.request.query_params
+        end = _parse_time(params['to'], 'to') if params.get('to') else timezone.now()
+        start = _parse_time(params['from'], 'from') if params.get('from') else end - timedelta(days=1)
+        if start >= end:
+            raise ValidationError({'from': 'ابتدای بازه باید پیش از انتهای آن باشد'})
+        resolution = params.get('resolution') or history.choose_resolution(start, end)
+        if resolution not in history.RESOLUTIONS:
+            raise ValidationError({'resolution': f'یکی از {", ".join(history.RESOLUTIONS)}'})
+        if history.points(start, end, resolution) > settings.CURRENCY_HISTORY_MAX_POINTS:
+            raise ValidationError({'resolution': 'بازه برای این وضوح بیش از حد بزرگ است'})
+        return history.candles(self.kwargs['pk'], resolution, start, end)
+
+@api_view(['GET'])
+@permission_classes([permissions.AllowAny])
+def price_board(request):
+    """
+    تابلوی قیمت ضایعات به صورت یک snapshot نسخه‌دار؛ ETag و کلید کش snapshot
+    هر دو از نسخه تابلو در پایگاه داده ساخته می‌شوند، پس هر درخواست فقط یک
+    کوئری نسخه دارد و درخواست‌های دوره‌ای بدون تغییر پاسخ 304 می‌گیرند.
+    """
+    validators = caching.stamp(caching.PRICE_BOARD)
+    return caching.conditional_response(
+        request, validators, lambda: Response(priceboard.snapshot(validators[0]))
+    )
+
+class UserNotificationListView(ConditionalListMixin, generics.ListAPIView):
     serializer_class = UserNotificationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = NotificationCursorPagination
 
     def get_queryset(self):
         return UserNotification.objects.filter(user=self.request.user)  # type: ignore
 
+    def list_validators(self, request):
+        # نسخه اعلان‌های کاربر از جدول شمارنده؛ ایجاد، حذف و خوانده شدن آن را تغییر می‌دهد
+        counter = notifications.counter(request.user.pk)
+        # زمان ایجاد با خوانده شدن اعلان تغییر نمی‌کند، پس Last-Modified ارسال نمی‌شود
+        return f'{request.user.pk}:{counter["version"]}:{counter["unread"]}', None
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def notification_archive(request):
+    """
+    «اعلان‌های قدیمی‌تر»: یک دسته از بایگانی فشرده کاربر در هر درخواست؛
+    next آدرس دسته قبلی است.
+    """
+    before = request.query_params.get('before')
+    try:
+        before = int(before) if before else None
+    except ValueError:
+        raise ValidationError({'before': 'شناسه نامعتبر است'})
+    entries, next_before = retention.older(request.user.pk, before)
+    next_url = None
+    if next_before is not None:
+        next_url = request.build_absolute_uri(f'{request.path}?before={next_before}')
+    return Response({'results': entries, 'next': next_url})
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def notification_unread_count(request):
+    """تعداد اعلان‌های خوانده‌نشده از شمارنده کش‌شده، بدون COUNT روی جدول اعلان‌ها"""
+    return Response({'unread': notifications.counter(request.user.pk)['unread']})
+
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def mark_notification_read(request, pk):
@@ -152,18 +437,68 @@ def mark_notification_read(request, pk):
     notification.save()
     return Response(status=status.HTTP_200_OK)
 
-@api_view(['GET'])
+def _parse_time(value: str, field: str):
+    try:
+        return datetime.datetime.fromtimestamp(float(value), tz=datetime.timezone.utc)
+    except (ValueError, OverflowError, OSError):
+        pass
+    try:
+        parsed = parse_datetime(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValidationError({field: 'زمان نامعتبر است'})
+    return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+
+@api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
-def user_auctions(request):
-    created_auctions = Auction.objects.filter(creator=request.user)  # type: ignore
-    participated_auctions = Auction.objects.filter(bids__bidder=request.user).distinct()  # type: ignore
-    won_auctions = Auction.objects.filter(winner=request.user)  # type: ignore
+def mark_notifications_read(request):
+    """
+    خوانده کردن اعلان‌های کاربر با یک UPDATE: تا شناسه up_to_id و/یا ایجادشده
+    تا زمان before (ISO 8601 یا یونیکس)؛ بدون هیچ‌کدام همه اعلان‌ها.
+    """
+    queryset = UserNotification.objects.filter(user=request.user)  # type: ignore
+    up_to_id = request.data.get('up_to_id')
+    if up_to_id not in (None, ''):
+        try:
+            queryset = queryset.filter(id__lte=int(up_to_id))
+        except (TypeError, ValueError):
+            raise ValidationError({'up_to_id': 'شناسه نامعتبر است'})
+    before = request.data.get('before')
+    if before not in (None, ''):
+        queryset = queryset.filter(created_at__lte=_parse_time(str(before), 'before'))
+    updated = notifications.mark_read(queryset, request.user.pk)
+    return Response({'updated': updated, 'unread': notifications.counter(request.user.pk)['unread']})
+
+class MyAuctionsView(generics.ListAPIView):
+    """
+    مزایده‌های کاربر در تب‌های created / participated / won (?tab=).
+
+    فقط از نمایه مشارکت خوانده می‌شود (بدون JOIN و DISTINCT روی جدول پیشنهادها)
+    و با cursor صفحه‌بندی می‌شود؛ تعداد هر تب در counts برگردانده می‌شود.
+    """
+    serializer_class = AuctionParticipationSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = ParticipationCursorPagination
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
 
-    return Response({
-        'created_auctions': AuctionSerializer(created_auctions, many=True).data,
-        'participated_auctions': AuctionSerializer(participated_auctions, many=True).data,
-        'won_auctions': AuctionSerializer(won_auctions, many=True).data
-    })
+    def get_queryset(self):
+        params = self.request.query_params
+        tab = params.get('tab', 'participated')
+        if tab not in participation.TABS:
+            raise ValidationError({'tab': f'مقدارهای مجاز: {", ".join(participation.TABS)}'})
+        queryset = AuctionParticipation.objects.filter(  # type: ignore
+            user=self.request.user, **{participation.TABS[tab]: True}
+        ).select_related('auction__creator', 'auction__winner')
+        status_filter = params.get('status')
+        if status_filter:
+            queryset = queryset.filter(auction_status__in=status_filter.split(','))
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        response.data['counts'] = participation.tab_counts(request.user)
+        return response
 
 class UserLoginView(APIView):
     permission_classes = [permissions.AllowAny]
@@ -228,11 +563,9 @@ class SubscriptionPurchaseView(APIView):
         user.save()
         
         # ایجاد اعلان برای کاربر
-        UserNotification.objects.create(  # type: ignore
-            user=user,
-            type='auction_start',
-            message=f'اشتراک {subscription_type} شما با موفقیت فعال شد و تا {end_date.strftime("%Y-%m-%d")} معتبر است.',
-            read=False
+        notifications.notify(
+            [user.pk], 'auction_start',
+            f'اشتراک {subscription_type} شما با موفقیت فعال شد و تا {end_date.strftime("%Y-%m-%d")} معتبر است.'
         )
         
         return Response({
@@ -288,22 +621,10 @@ class CreateAuctionView(APIView):
             auction = Auction.objects.create(**auction_data)  # type: ignore
             
             # ایجاد اعلان برای کاربر
-            UserNotification.objects.create(  # type: ignore
-                user=user,
-                type='auction_created',
-                message=f'مزایده "{auction.title}" ایجاد شد و در انتظار تایید ادمین است',
-                read=False
-            )
+            notifications.notify([user.pk], 'auction_created', f'مزایده "{auction.title}" ایجاد شد و در انتظار تایید ادمین است')
             
-            # ایجاد اعلان برای ادمین‌ها
-            admin_users = User.objects.filter(is_admin=True)
-            for admin in admin_users:
-                UserNotification.objects.create(  # type: ignore
-                    user=admin,
-                    type='pending_approval',
-                    message=f'مزایده جدید "{auction.title}" برای تایید در انتظار است',
-                read=False
-            )
+            # اعلان ادمین‌ها در صف ثبت و خارج از درخواست پخش می‌شود
+            notifications.notify_admins('pending_approval', f'مزایده جدید "{auction.title}" برای تایید در انتظار است')
             
             return Response({
                 'message': 'مزایده با موفقیت ایجاد شد و در انتظار تایید ادمین است',
@@ -361,22 +682,10 @@ class CreateTenderView(APIView):
             tender = Auction.objects.create(**tender_data)  # type: ignore
             
             # ایجاد اعلان برای کاربر
-            UserNotification.objects.create(  # type: ignore
-                user=user,
-                type='tender_created',
-                message=f'مناقصه "{tender.title}" ایجاد شد و در انتظار تایید ادمین است',
-                read=False
-            )
+            notifications.notify([user.pk], 'tender_created', f'مناقصه "{tender.title}" ایجاد شد و در انتظار تایید ادمین است')
             
-            # ایجاد اعلان برای ادمین‌ها
-            admin_users = User.objects.filter(is_admin=True)
-            for admin in admin_users:
-                UserNotification.objects.create(  # type: ignore
-                    user=admin,
-                    type='pending_approval',
-                    message=f'مناقصه جدید "{tender.title}" برای تایید در انتظار است',
-                read=False
-            )
+            # اعلان ادمین‌ها در صف ثبت و خارج از درخواست پخش می‌شود
+            notifications.notify_admins('pending_approval', f'مناقصه جدید "{tender.title}" برای تایید در انتظار است')
             
             return Response({
                 'message': 'مناقصه با موفقیت ایجاد شد',
@@ -390,71 +699,69 @@ class CreateTenderView(APIView):
             )
 
 # Admin Views
+# بازه‌های مجاز آمار روزانه داشبورد (روز)
+DASHBOARD_WINDOWS = (7, 30, 90, 365)
+
 class AdminDashboardView(APIView):
     permission_classes = [IsAdminUser]
     
     def get(self, request):
         """آمار کلی سیستم برای داشبورد ادمین"""
         try:
-            # آمار کاربران
-            total_users = User.objects.count()
-            active_users = User.objects.filter(is_active=True).count()
-            premium_users = User.objects.filter(subscription_active=True).count()
-            
-            # آمار مزایده‌ها
-            total_auctions = Auction.objects.count()
-            active_auctions = Auction.objects.filter(status='active').count()
-            completed_auctions = Auction.objects.filter(status='completed').count()
-            
-            # آمار پیشنهادات
-            total_bids = Bid.objects.count()
-            total_bid_amount = Bid.objects.aggregate(total=Sum('amount'))['total'] or 0
-            
-            # آمار اعلان‌ها
-            total_notifications = UserNotification.objects.count()
-            unread_notifications = UserNotification.objects.filter(read=False).count()
-            
-            # آمار ارزها
-            total_currencies = CurrencyRate.objects.count()
-            
-            # آمار روزانه (آخرین 7 روز)
-            today = timezone.now().date()
+            days = int(request.query_params.get('days', 7))
+        except ValueError:
+            days = 0
+        if days not in DASHBOARD_WINDOWS:
+            return Response(
+                {'error': f'بازه نامعتبر است؛ مقادیر مجاز: {", ".join(map(str, DASHBOARD_WINDOWS))}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            # هر جدول با یک کوئری و شمارش شرطی خلاصه می‌شود
+            user_stats = User.objects.aggregate(
+                total=Count('id'),
+                active=Count('id', filter=Q(is_active=True)),
+                premium=Count('id', filter=Q(subscription_active=True)),
+            )
+            auction_stats = Auction.objects.aggregate(  # type: ignore
+                total=Count('id'),
+                active=Count('id', filter=Q(status='active')),
+                completed=Count('id', filter=Q(status='completed')),
+            )
+            bid_stats = Bid.objects.aggregate(total=Count('id'), total_amount=Sum('amount'))  # type: ignore
+            notification_stats = UserNotification.objects.aggregate(  # type: ignore
+                total=Count('id'),
+                unread=Count('id', filter=Q(read=False)),
+            )
+
+            # آمار روزانه از جدول‌های شمارنده؛ تعداد کوئری‌ها به طول بازه وابسته نیست
+            today = timezone.localdate()
+            totals = rollups.daily_totals(today - timedelta(days=days - 1), today)
             daily_stats = []
-            for i in range(7):
+            for i in range(days):
                 date = today - timedelta(days=i)
-                daily_users = User.objects.filter(created_at__date=date).count()
-                daily_auctions = Auction.objects.filter(created_at__date=date).count()
-                daily_bids = Bid.objects.filter(created_at__date=date).count()
+                point = totals.get(date, {})
                 daily_stats.append({
                     'date': date.strftime('%Y-%m-%d'),
-                    'users': daily_users,
-                    'auctions': daily_auctions,
-                    'bids': daily_bids
+                    'users': point.get('users', 0),
+                    'auctions': point.get('auctions', 0),
+                    'bids': point.get('bids', 0)
                 })
             
             return Response({
-                'users': {
-                    'total': total_users,
-                    'active': active_users,
-                    'premium': premium_users
-                },
-                'auctions': {
-                    'total': total_auctions,
-                    'active': active_auctions,
-                    'completed': completed_auctions
-                },
+                'users': user_stats,
+                'auctions': auction_stats,
                 'bids': {
-                    'total': total_bids,
-                    'total_amount': float(total_bid_amount)
-                },
-                'notifications': {
-                    'total': total_notifications,
-                    'unread': unread_notifications
+                    'total': bid_stats['total'],
+                    'total_amount': float(bid_stats['total_amount'] or 0)
                 },
+                'notifications': notification_stats,
                 'currencies': {
-                    'total': total_currencies
+                    'total': CurrencyRate.objects.count()  # type: ignore
                 },
-                'daily_stats': daily_stats
+                'daily_stats': daily_stats,
+                'window': days
             })
         except Exception as e:
             return Response(
@@ -462,7 +769,7 @@ class AdminDashboardView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
-class AdminUserManagementView(generics.ListCreateAPIView):
+class AdminUserManagementView(SparseFieldsViewMixin, generics.ListCreateAPIView):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAdminUser]
@@ -488,44 +795,52 @@ class AdminUserManagementView(generics.ListCreateAPIView):
         
         return queryset
 
-class AdminUserDetailView(generics.RetrieveUpdateDestroyAPIView):
+class AdminUserDetailView(SparseFieldsViewMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAdminUser]
 
-class AdminAuctionManagementView(generics.ListCreateAPIView):
-    queryset = Auction.objects.all()
+class AdminAuctionManagementView(SparseFieldsViewMixin, generics.ListCreateAPIView):
+    queryset = Auction.objects.select_related('creator', 'winner').all()
     serializer_class = AuctionSerializer
     permission_classes = [permissions.IsAdminUser]
     
     def get_queryset(self):
-        queryset = Auction.objects.all()
+        queryset = Auction.objects.select_related('creator', 'winner').all()
         search = self.request.query_params.get('search', None)
         status_filter = self.request.query_params.get('status', None)
         
-        if search:
-            queryset = queryset.filter(
-                models.Q(title__icontains=search) |
-                models.Q(description__icontains=search)
-            )
-        
         if status_filter:
             queryset = queryset.filter(status=status_filter)
         
+        if search:
+            # یک ردیف بیشتر از سقف تا قطع شدن فهرست در list مشخص شود
+            queryset = search_auctions(queryset, search, limit=settings.ADMIN_AUCTION_SEARCH_LIMIT + 1)
+        
         return queryset
 
-class AdminAuctionDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Auction.objects.all()
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        # فهرست مدیریت صفحه‌بندی ندارد؛ قطع شدن نتایج جستجو در سرآیند پاسخ اعلام می‌شود
+        limit = settings.ADMIN_AUCTION_SEARCH_LIMIT
+        if request.query_params.get('search') and len(response.data) > limit:
+            response.data = response.data[:limit]
+            response['X-Search-Truncated'] = str(limit)
+        return response
+
+class AdminAuctionDetailView(SparseFieldsViewMixin, generics.RetrieveUpdateDestroyAPIView):
+    queryset = Auction.objects.select_related('creator', 'winner').all()
     serializer_class = AuctionSerializer
     permission_classes = [permissions.IsAdminUser]
 
-class AdminBidManagementView(generics.ListAPIView):
-    queryset = Bid.objects.all()
+class AdminBidManagementView(SparseFieldsViewMixin, generics.ListAPIView):
+    queryset = Bid.objects.select_related('bidder').all()
     serializer_class = BidSerializer
     permission_classes = [permissions.IsAdminUser]
     
     def get_queryset(self):
-        queryset = Bid.objects.all()
+        # ترتیب کلید اصلی (جدیدترین) بدون مرتب‌سازی کل جدول پیشنهادها
+        queryset = Bid.objects.select_related('bidder').order_by('-id')
         auction_id = self.request.query_params.get('auction_id', None)
         bidder_id = self.request.query_params.get('bidder_id', None)
         
@@ -537,8 +852,8 @@ class AdminBidManagementView(generics.ListAPIView):
         
         return queryset
 
-class AdminBidDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Bid.objects.all()
+class AdminBidDetailView(SparseFieldsViewMixin, generics.RetrieveUpdateDestroyAPIView):
+    queryset = Bid.objects.select_related('bidder').all()
     serializer_class = BidSerializer
     permission_classes = [permissions.IsAdminUser]
 
@@ -579,6 +894,47 @@ class AdminCurrencyDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = CurrencyRateSerializer
     permission_classes = [permissions.IsAdminUser]
 
+@api_view(['POST'])
+@permission_classes([permissions.IsAdminUser])
+def admin_ingest_currencies(request):
+    """
+    به‌روزرسانی گروهی نرخ‌ها: فایل آپلودشده (file، JSON یا CSV) یا فهرست quotes
+    در بدنه JSON. فقط نرخ‌های تغییرکرده نوشته می‌شوند؛ dry_run فقط گزارش می‌دهد.
+    """
+    try:
+        upload = request.FILES.get('file')
+        if upload is not None:
+            quotes = ingest.parse(upload.read().decode('utf-8'))
+        elif isinstance(request.data.get('quotes'), list):
+            quotes = ingest.parse_rows(request.data['quotes'])
+        else:
+            return Response({'error': 'فایل یا فهرست نرخ‌ها ارسال نشده است'}, status=status.HTTP_400_BAD_REQUEST)
+    except UnicodeDecodeError:
+        return Response({'error': 'فایل باید UTF-8 باشد'}, status=status.HTTP_400_BAD_REQUEST)
+    except ingest.FeedError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    dry_run = str(request.data.get('dry_run', '')).lower() in ('1', 'true')
+    return Response(ingest.ingest(quotes, dry_run=dry_run))
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAdminUser])
+def admin_ingest_price_board(request):
+    """به‌روزرسانی گروهی تابلوی قیمت؛ فایل (file) یا فهرست prices، مانند admin_ingest_currencies"""
+    try:
+        upload = request.FILES.get('file')
+        if upload is not None:
+            prices = priceboard.parse(upload.read().decode('utf-8'))
+        elif isinstance(request.data.get('prices'), list):
+            prices = priceboard.parse_rows(request.data['prices'])
+        else:
+            return Response({'error': 'فایل یا فهرست قیمت‌ها ارسال نشده است'}, status=status.HTTP_400_BAD_REQUEST)
+    except UnicodeDecodeError:
+        return Response({'error': 'فایل باید UTF-8 باشد'}, status=status.HTTP_400_BAD_REQUEST)
+    except ingest.FeedError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    dry_run = str(request.data.get('dry_run', '')).lower() in ('1', 'true')
+    return Response(priceboard.ingest(prices, dry_run=dry_run))
+
 @api_view(['POST'])
 @permission_classes([permissions.IsAdminUser])
 def admin_bulk_action(request):
@@ -621,7 +977,13 @@ def admin_bulk_action(request):
             if model_type == 'user':
                 queryset.update(is_active=True)
             elif model_type == 'auction':
-                queryset.update(status='active')
+                rows = list(queryset.values('id', 'created_at', 'condition', 'category', 'status'))
+                auction_ids = [row['id'] for row in rows]
+                queryset.update(status='active', updated_at=timezone.now())
+                rollups.record_status_change(rows, 'active')
+                participation.record_status_change(auction_ids, 'active')
+                caching.invalidate(caching.AUCTIONS)
+                publish_status_changes(auction_ids, 'active')
             return Response({
                 'message': f'{queryset.count()} مورد فعال شد'
             })
@@ -629,15 +991,21 @@ def admin_bulk_action(request):
             if model_type == 'user':
                 queryset.update(is_active=False)
             elif model_type == 'auction':
-                queryset.update(status='inactive')
+                rows = list(queryset.values('id', 'created_at', 'condition', 'category', 'status'))
+                auction_ids = [row['id'] for row in rows]
+                queryset.update(status='inactive', updated_at=timezone.now())
+                rollups.record_status_change(rows, 'inactive')
+                participation.record_status_change(auction_ids, 'inactive')
+                caching.invalidate(caching.AUCTIONS)
+                publish_status_changes(auction_ids, 'inactive')
             return Response({
                 'message': f'{queryset.count()} مورد غیرفعال شد'
             })
         elif action == 'mark_read':
             if model_type == 'notification':
-                queryset.update(read=True)
+                updated = notifications.mark_read(queryset)
                 return Response({
-                    'message': f'{queryset.count()} اعلان خوانده شد'
+                    'message': f'{updated} اعلان خوانده شد'
                 })
         
         return Response(
@@ -660,7 +1028,8 @@ def admin_approve_auction(request, auction_id):
         action = request.data.get('action')  # 'approve' or 'reject'
         
         if action == 'approve':
-            auction.status = 'active'
+            # اگر زمان شروع نرسیده باشد، زمان‌بند چرخه عمر آن را در start_date فعال می‌کند
+            auction.status = 'scheduled' if auction.start_date > timezone.now() else 'active'
             notification_type = 'auction_approved' if auction.condition != 'tender' else 'tender_approved'
             message = f'مزایده "{auction.title}" تایید شد' if auction.condition != 'tender' else f'مناقصه "{auction.title}" تایید شد'
         elif action == 'reject':
@@ -676,12 +1045,7 @@ def admin_approve_auction(request, auction_id):
         auction.save()
         
         # ایجاد اعلان برای کاربر
-        UserNotification.objects.create(  # type: ignore
-            user=auction.creator,
-            type=notification_type,
-            message=message,
-            read=False
-        )
+        notifications.notify([auction.creator_id], notification_type, message)
         
         return Response({
             'message': message,
@@ -699,7 +1063,7 @@ def admin_approve_auction(request, auction_id):
 def admin_pending_approvals(request):
     """دریافت لیست مزایده‌ها و مناقصه‌های در انتظار تایید"""
     try:
-        pending_auctions = Auction.objects.filter(status='pending_review').order_by('-created_at')
+        pending_auctions = Auction.objects.select_related('creator', 'winner').filter(status='pending_review').order_by('-created_at')
         return Response({
             'pending_auctions': AuctionSerializer(pending_auctions, many=True).data
         }, status=status.HTTP_200_OK)
@@ -711,42 +1075,42 @@ def admin_pending_approvals(request):
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAdminUser])
+@renderer_classes([JSONRenderer, NDJSONRenderer, CSVRenderer])
 def admin_export_data(request):
-    """صادرات داده‌ها برای ادمین"""
+    """
+    صادرات داده‌ها برای ادمین به صورت جریانی.
+
+    format: json (پیش‌فرض)، ndjson یا csv؛ با gzip=1 خروجی فشرده می‌شود.
+    ردیف‌ها در دسته‌های EXPORT_CHUNK_SIZE تایی خوانده و بلافاصله ارسال می‌شوند.
+    """
     model_type = request.query_params.get('model_type')
     format_type = request.query_params.get('format', 'json')
+    compress = request.query_params.get('gzip') in ('1', 'true')
     
     if not model_type:
         return Response(
             {'error': 'نوع مدل مشخص نشده است'},
             status=status.HTTP_400_BAD_REQUEST
         )
-    
-    try:
-        if model_type == 'users':
-            data = UserSerializer(User.objects.all(), many=True).data
-        elif model_type == 'auctions':
-            data = AuctionSerializer(Auction.objects.all(), many=True).data
-        elif model_type == 'bids':
-            data = BidSerializer(Bid.objects.all(), many=True).data
-        elif model_type == 'notifications':
-            data = UserNotificationSerializer(UserNotification.objects.all(), many=True).data
-        elif model_type == 'currencies':
-            data = CurrencyRateSerializer(CurrencyRate.objects.all(), many=True).data
-        else:
-            return Response(
-                {'error': 'نوع مدل نامعتبر است'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        return Response({
-            'data': data,
-            'count': len(data),
-            'exported_at': timezone.now().isoformat()
-        })
-        
-    except Exception as e:
+    if model_type not in EXPORTS:
         return Response(
-            {'error': f'خطا در صادرات داده: {str(e)}'},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
\ No newline at end of file
+            {'error': 'نوع مدل نامعتبر است'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if format_type not in EXPORT_FORMATS:
+        return Response(
+            {'error': 'فرمت نامعتبر است'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    exported_at = timezone.now()
+    chunks = export_stream(model_type, format_type, exported_at.isoformat(), compress=compress)
+    response = StreamingHttpResponse(
+        streaming_content(chunks, asynchronous=isinstance(request._request, ASGIRequest)),
+        content_type='application/gzip' if compress else f'{EXPORT_FORMATS[format_type]}; charset=utf-8'
+    )
+    filename = f'{model_type}_{exported_at:%Y-%m-%d}.{format_type}' + ('.gz' if compress else '')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    # جلوگیری از بافر شدن کل پاسخ در پراکسی (nginx)
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 from datetime import timedelta
 
@@ -54,12 +55,102 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'backend.wsgi.application'
+ASGI_APPLICATION = 'backend.asgi.application'
+
+# Channels: کانال زنده مزایده‌ها و اعلان‌ها
+# بدون REDIS_URL از لایه درون‌حافظه‌ای استفاده می‌شود که فقط در یک پروسه کار می‌کند
+REDIS_URL = os.environ.get('REDIS_URL')
+if REDIS_URL:
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels_redis.core.RedisChannelLayer',
+            'CONFIG': {'hosts': [REDIS_URL]},
+        },
+    }
+else:
+    CHANNEL_LAYERS = {
+        'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'},
+    }
+
+# کش پاسخ endpointهای عمومی؛ با REDIS_URL بین پروسه‌ها مشترک است
+# LocMemCache پس از MAX_ENTRIES ورودی، بخشی از ورودی‌ها را حذف (cull) می‌کند
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'OPTIONS': {'MAX_ENTRIES': 1000, 'CULL_FREQUENCY': 4},
+        },
+    }
+
+# مدت تازه بودن پاسخ کش‌شده و مدتی که نسخه کهنه هنگام بازسازی ارائه می‌شود (ثانیه)
+RESPONSE_CACHE_TTL = 30
+RESPONSE_CACHE_STALE_TTL = 300
+
+# حداقل گام افزایش قیمت در پیشنهادهای خودکار (proxy)
+BID_INCREMENT = 1000
+
+# حداکثر تعداد رویدادی که هنگام ادامه از last_event_id دوباره ارسال می‌شود
+LIVE_EVENT_REPLAY_LIMIT = 500
+LIVE_EVENT_RETENTION_HOURS = 24
+
+# همگام‌سازی تغییرات مزایده‌ها (updated_since): همپوشانی پنجره برای تراکنش‌هایی که
+# دیرتر از زمان updated_at خود commit می‌شوند و مدت نگهداری نشانه‌های حذف
+DELTA_SYNC_OVERLAP_SECONDS = 5
+DELTA_SYNC_TOMBSTONE_DAYS = 30
+
+# حداکثر نتایج جستجوی فهرست مدیریت مزایده‌ها (بدون صفحه‌بندی)؛ قطع شدن فهرست با سرآیند
+# X-Search-Truncated اعلام می‌شود
+ADMIN_AUCTION_SEARCH_LIMIT = 500
+
+# جدول رتبه‌بندی پیشنهاددهندگان هر مزایده (با ثبت پیشنهاد بی‌اعتبار می‌شود)
+LEADERBOARD_SIZE = 10
+LEADERBOARD_CACHE_TTL = 30
+
+# پخش اعلان‌ها: فهرست گیرندگان تا INLINE_LIMIT در همان درخواست نوشته می‌شود و بیشتر از آن
+# (و اعلان ادمین‌ها یا پیشنهاددهندگان یک مزایده) در صف می‌رود تا run_notification_worker
+# آن را در دسته‌های BATCH_SIZE تایی بسازد
+NOTIFICATION_INLINE_LIMIT = 20
+NOTIFICATION_BATCH_SIZE = 1000
+# رویدادهای تکراری این انواع برای یک (کاربر، مزایده) در این بازه (ثانیه) در یک اعلان
+# خلاصه تجمیع می‌شوند؛ صفر یعنی بدون تجمیع
+NOTIFICATION_COALESCE_TYPES = ('new_bid', 'outbid')
+NOTIFICATION_COALESCE_WINDOW = 600
+# اعلان‌های خوانده‌شده قدیمی‌تر از این تعداد روز با archive_notifications به بایگانی فشرده
+# منتقل می‌شوند (BATCH_SIZE ردیف در هر تراکنش، حداکثر CHUNK_SIZE اعلان در هر ردیف بایگانی)
+NOTIFICATION_RETENTION_DAYS = 90
+NOTIFICATION_ARCHIVE_BATCH_SIZE = 1000
+NOTIFICATION_ARCHIVE_CHUNK_SIZE = 500
+
+# حداکثر نقاط سری تاریخچه نرخ در یک پاسخ؛ وضوح خودکار (دقیقه/ساعت/روز) بر این اساس انتخاب می‌شود
+CURRENCY_HISTORY_MAX_POINTS = 1000
+# منبع پیش‌فرض فایل نرخ‌ها برای ingest_currency_feed (مسیر محلی یا آدرس HTTP) و مهلت دریافت آن (ثانیه)
+CURRENCY_FEED_SOURCE = os.environ.get('CURRENCY_FEED_SOURCE')
+CURRENCY_FEED_TIMEOUT = 10
+
+# تابلوی قیمت ضایعات: مدت نگهداری snapshot نسخه‌دار در کش و منبع پیش‌فرض ingest_price_board
+PRICE_BOARD_CACHE_TTL = 3600
+PRICE_BOARD_FEED_SOURCE = os.environ.get('PRICE_BOARD_FEED_SOURCE')
+
+# تعداد ردیف‌هایی که خروجی ادمین در هر مرحله از پایگاه داده می‌خواند
+EXPORT_CHUNK_SIZE = 2000
 
 # Database
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # منتظر ماندن برای قفل نوشتن به‌جای خطای فوری در پیشنهادهای هم‌زمان؛ تراکنش‌های
+            # پیشنهاد قفل نوشتن را با اولین دستورشان می‌گیرند (api.bidding)
+            'timeout': 20,
+        },
     }
 }
 
@@ -144,6 +235,11 @@ CORS_ALLOW_HEADERS = [
     'x-requested-with',
 ]
 
+# سرآیند قطع شدن نتایج جستجوی فهرست مدیریت مزایده‌ها (ADMIN_AUCTION_SEARCH_LIMIT)
+CORS_EXPOSE_HEADERS = [
+    'x-search-truncated',
+]
+
 CORS_ALLOW_METHODS = [
     'GET',
     'POST',
@@ -1,9 +1,9 @@
 import api from './index';
 
 // Admin Dashboard API
-export const getAdminDashboard = async () => {
+export const getAdminDashboard = async (params = {}) => {
   try {
-    const response = await api.get('/admin/dashboard/');
+    const response = await api.get('/admin/dashboard/', { params });
     return response.data;
   } catch (error) {
     throw error;
@@ -195,6 +195,37 @@ export const deleteAdminCurrency = async (currencyId) => {
   }
 };
 
+// به‌روزرسانی گروهی نرخ‌ها از فایل JSON/CSV؛ فقط نرخ‌های تغییرکرده نوشته می‌شوند
+export const ingestAdminCurrencies = async (file, dryRun = false) => {
+  try {
+    const formData = new FormData();
+    formData.append('file', file);
+    formData.append('dry_run', dryRun ? 'true' : 'false');
+    // بدون این سرآیند axios به خاطر Content-Type پیش‌فرض، FormData را به JSON تبدیل می‌کند
+    const response = await api.post('/admin/currencies/ingest/', formData, {
+      headers: { 'Content-Type': 'multipart/form-data' },
+    });
+    return response.data;
+  } catch (error) {
+    throw error;
+  }
+};
+
+// به‌روزرسانی گروهی تابلوی قیمت ضایعات از فایل JSON/CSV (ستون‌ها: board, name, retail, wholesale)
+export const ingestAdminPriceBoard = async (file, dryRun = false) => {
+  try {
+    const formData = new FormData();
+    formData.append('file', file);
+    formData.append('dry_run', dryRun ? 'true' : 'false');
+    const response = await api.post('/admin/price-board/ingest/', formData, {
+      headers: { 'Content-Type': 'multipart/form-data' },
+    });
+    return response.data;
+  } catch (error) {
+    throw error;
+  }
+};
+
 // Admin Bulk Actions API
 export const adminBulkAction = async (action, modelType, ids) => {
   try {
@@ -210,13 +241,16 @@ export const adminBulkAction = async (action, modelType, ids) => {
 };
 
 // Admin Export Data API
-export const adminExportData = async (modelType, format = 'json') => {
+// خروجی به صورت فایل (Blob) دریافت می‌شود؛ format: json | ndjson | csv
+export const adminExportData = async (modelType, format = 'json', gzip = false) => {
   try {
     const response = await api.get('/admin/export-data/', {
       params: {
         model_type: modelType,
-        format
-      }
+        format,
+        ...(gzip ? { gzip: 1 } : {})
+      },
+      responseType: 'blob'
     });
     return response.data;
   } catch (error) {
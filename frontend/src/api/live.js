@@ -0,0 +1,86 @@
+// Live channel for bids, prices, auction status and notifications.
+// One WebSocket is shared by every subscriber; after a reconnect each stream
+// resumes from the last event id it has seen.
+
+const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000/api';
+const WS_URL = API_URL.replace(/^http/, 'ws').replace(/\/api\/?$/, '') + '/ws/live/';
+const RECONNECT_DELAY = 3000;
+
+let socket = null;
+let reconnectTimer = null;
+const listeners = new Map(); // stream -> Set(callback)
+const lastEventIds = new Map(); // stream -> id
+
+const send = (message) => {
+  if (socket && socket.readyState === WebSocket.OPEN) {
+    socket.send(JSON.stringify(message));
+  }
+};
+
+const subscribeMessage = (stream) => {
+  const message = { action: 'subscribe', stream };
+  if (lastEventIds.has(stream)) {
+    message.last_event_id = lastEventIds.get(stream);
+  }
+  return message;
+};
+
+const dispatch = (stream, message) => {
+  (listeners.get(stream) || []).forEach((callback) => callback(message));
+};
+
+const connect = () => {
+  reconnectTimer = null;
+  const token = localStorage.getItem('accessToken');
+  socket = new WebSocket(token ? `${WS_URL}?token=${encodeURIComponent(token)}` : WS_URL);
+
+  socket.onopen = () => {
+    listeners.forEach((_, stream) => send(subscribeMessage(stream)));
+  };
+
+  socket.onmessage = (e) => {
+    const message = JSON.parse(e.data);
+    if (message.type === 'event') {
+      if (message.id <= (lastEventIds.get(message.stream) || 0)) return;
+      lastEventIds.set(message.stream, message.id);
+      dispatch(message.stream, message);
+    } else if (message.type === 'resync') {
+      dispatch(message.stream, message);
+    }
+  };
+
+  socket.onclose = () => {
+    socket = null;
+    if (listeners.size > 0) {
+      reconnectTimer = setTimeout(connect, RECONNECT_DELAY);
+    }
+  };
+};
+
+export const subscribe = (stream, callback) => {
+  if (!listeners.has(stream)) {
+    listeners.set(stream, new Set());
+    send(subscribeMessage(stream));
+  }
+  listeners.get(stream).add(callback);
+  if (!socket && !reconnectTimer) {
+    connect();
+  }
+
+  return () => {
+    const callbacks = listeners.get(stream);
+    if (!callbacks) return;
+    callbacks.delete(callback);
+    if (callbacks.size === 0) {
+      listeners.delete(stream);
+      send({ action: 'unsubscribe', stream });
+    }
+    if (listeners.size === 0 && socket) {
+      clearTimeout(reconnectTimer);
+      reconnectTimer = null;
+      socket.close();
+    }
+  };
+};
+
+export default { subscribe };
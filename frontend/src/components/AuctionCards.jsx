@@ -4,6 +4,10 @@ import { useTheme } from "../context/ThemeContext";
 import LoadingSpinner from "./LoadingSpinner";
 import ErrorMessage from "./ErrorMessage";
 
+// فقط فیلدهای لازم کارت‌ها؛ سرور ستون‌ها و JOIN کاربران را هم حذف می‌کند
+const CARD_FIELDS =
+  "id,title,start_date,end_date,status,category,description,starting_price,current_price,location";
+
 const CARDS_TO_SHOW = 3;
 const SLIDE_INTERVAL = 5000;
 const ANIMATION_DURATION = 700;
@@ -29,6 +33,8 @@ const AuctionCards = () => {
         return "لغو شده";
       case "pending_review":
         return "در حال بررسی";
+      case "scheduled":
+        return "زمان‌بندی شده";
       case "rejected":
         return "رد شده";
       default:
@@ -69,7 +75,7 @@ const AuctionCards = () => {
         setLoading(true);
         setError(null);
         const { default: api } = await import("../api/index");
-        const res = await api.get("/auctions/");
+        const res = await api.get("/auctions/", { params: { fields: CARD_FIELDS } });
         const data = Array.isArray(res.data) ? res.data : res.data?.results || [];
         const mapped = data.map((a) => {
           const catFa = categoryFa(a.category);
@@ -117,7 +123,7 @@ const AuctionCards = () => {
     setLoading(true);
     try {
       const { default: api } = await import("../api/index");
-      const res = await api.get("/auctions/");
+      const res = await api.get("/auctions/", { params: { fields: CARD_FIELDS } });
       const data = Array.isArray(res.data) ? res.data : res.data?.results || [];
       const mapped = data.map((a) => {
         const catFa = categoryFa(a.category);
@@ -143,7 +143,7 @@ const AuctionTrendCharts = () => {
   });
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState(null);
-  const [auctions, setAuctions] = useState([]);
+  const [trends, setTrends] = useState(null);
 
   useEffect(() => {
     let cancelled = false;
@@ -152,11 +152,9 @@ const AuctionTrendCharts = () => {
       setError(null);
       try {
         const { default: api } = await import("../api/index");
-        const res = await api.get("/auctions/", { params: { page_size: 1000 } });
-        const data = Array.isArray(res.data)
-          ? res.data
-          : res.data?.results || [];
-        if (!cancelled) setAuctions(data);
+        // سری‌های از پیش محاسبه‌شده؛ به‌جای دریافت کل فهرست آگهی‌ها
+        const res = await api.get("/auctions/trends/", { params: { months: 6 } });
+        if (!cancelled) setTrends(res.data);
       } catch (e) {
         if (!cancelled) setError("خطا در دریافت داده‌های نمودار");
       } finally {
@@ -169,99 +167,37 @@ const AuctionTrendCharts = () => {
     };
   }, []);
 
-  const classifyType = (a) => {
-    const cond = String(a.condition || "").toLowerCase();
-    if (cond === "tender") return "مناقصه";
-    return "مزایده";
-  };
-
-  const withinRange = (dt, start, end) => {
-    const t = new Date(dt).getTime();
-    return t >= start && t <= end;
-  };
-
-  const startOfDay = (d) => {
-    const x = new Date(d);
-    x.setHours(0, 0, 0, 0);
-    return x.getTime();
-  };
-
-  const endOfDay = (d) => {
-    const x = new Date(d);
-    x.setHours(23, 59, 59, 999);
-    return x.getTime();
-  };
-
-  const todayRange = useMemo(() => {
-    const now = new Date();
-    return { s: startOfDay(now), e: endOfDay(now) };
-  }, []);
-
-  const yesterdayRange = useMemo(() => {
-    const y = new Date();
-    y.setDate(y.getDate() - 1);
-    return { s: startOfDay(y), e: endOfDay(y) };
-  }, []);
-
   const todayData = useMemo(() => {
-    if (!auctions.length) return INITIAL_TODAY;
-    const counts = { مناقصه: 0, مزایده: 0, استعلام: 0 };
-    auctions.forEach((a) => {
-      const created = a.created_at || a.start_date;
-      if (!created) return;
-      if (withinRange(created, todayRange.s, todayRange.e)) {
-        const t = classifyType(a);
-        counts[t] += 1;
-      }
-    });
+    if (!trends) return INITIAL_TODAY;
+    const { today } = trends;
     return [
-      { name: "مناقصه", value: counts.مناقصه },
-      { name: "مزایده", value: counts.مزایده },
-      { name: "استعلام", value: counts.استعلام },
+      { name: "مناقصه", value: today.tender },
+      { name: "مزایده", value: today.auction },
+      { name: "استعلام", value: today.inquiry },
     ];
-  }, [auctions, todayRange]);
+  }, [trends]);
 
   const yesterdayData = useMemo(() => {
-    if (!auctions.length) return INITIAL_YESTERDAY;
-    let tenders = 0;
-    let inquiries = 0;
-    auctions.forEach((a) => {
-      const created = a.created_at || a.start_date;
-      if (!created) return;
-      if (withinRange(created, yesterdayRange.s, yesterdayRange.e)) {
-        const t = classifyType(a);
-        if (t === "مناقصه") tenders += 1;
-      }
-    });
+    if (!trends) return INITIAL_YESTERDAY;
+    const { yesterday } = trends;
     return [
-      { name: "مناقصات دیروز", value: tenders },
-      { name: "استعلام های دیروز", value: inquiries },
+      { name: "مناقصات دیروز", value: yesterday.tender },
+      { name: "استعلام های دیروز", value: yesterday.inquiry },
     ];
-  }, [auctions, yesterdayRange]);
+  }, [trends]);
 
   const areaData = useMemo(() => {
-    if (!auctions.length) return INITIAL_SIX_MONTH;
-    const months = Array.from({ length: 6 }, (_, i) => {
-      const d = new Date();
-      d.setMonth(d.getMonth() - (5 - i));
-      const start = new Date(d.getFullYear(), d.getMonth(), 1).getTime();
-      const end = new Date(d.getFullYear(), d.getMonth() + 1, 0, 23, 59, 59, 999).getTime();
-      return { label: monthLabel(d), start, end };
-    });
-    const rows = months.map((m) => ({ name: m.label, مناقصه: 0, مزایده: 0, استعلام: 0 }));
-    auctions.forEach((a) => {
-      const created = a.created_at || a.start_date;
-      if (!created) return;
-      const ts = new Date(created).getTime();
-      const t = classifyType(a);
-      months.forEach((m, idx) => {
-        if (ts >= m.start && ts <= m.end) {
-          rows[idx][t] += 1;
-        }
-      });
+    if (!trends) return INITIAL_SIX_MONTH;
+    return trends.months.map((m) => {
+      const [year, month] = m.month.split("-").map(Number);
+      return {
+        name: monthLabel(new Date(year, month - 1, 1)),
+        مناقصه: m.tender,
+        مزایده: m.auction,
+        استعلام: m.inquiry,
+      };
     });
-    return rows;
-  }, [auctions]);
+  }, [trends]);
 
   // Helper for toggling selection
   const handleSelect = (current, setCurrent) => (idx) => {
@@ -14,7 +14,9 @@ const CurrencyRates = () => {
     const loadRates = async () => {
       try {
         const { default: api } = await import("../api/index");
-        const res = await api.get("/currency-rates/");
+        const res = await api.get("/currency-rates/", {
+          params: { fields: "code,name,rate,change" },
+        });
         const data = Array.isArray(res.data) ? res.data : res.data?.results || [];
         const mapped = data.map((r, i) => ({
           name: r.name || r.code,
@@ -21,6 +21,7 @@ import {
   FaFileAlt,
 } from "react-icons/fa";
 import ThemeToggle from "./ThemeToggle";
+import { subscribe } from "../api/live";
 
 const Header = () => {
   const [isMenuOpen, setIsMenuOpen] = useState(false);
@@ -49,10 +50,13 @@ const Header = () => {
       try {
         if (!user) return;
         const { default: api } = await import("../api/index");
-        const res = await api.get("/notifications/");
-        const items = Array.isArray(res.data) ? res.data : [];
-        setNotifications(items.slice(0, 5));
-        setUnreadCount(items.filter((n) => !n.read).length);
+        // فقط پنج اعلان اخیر و شمارنده خوانده‌نشده‌ها، نه کل فهرست
+        const [list, count] = await Promise.all([
+          api.get("/notifications/", { params: { page_size: 5 } }),
+          api.get("/notifications/unread-count/"),
+        ]);
+        setNotifications(list.data?.results || []);
+        setUnreadCount(count.data?.unread || 0);
       } catch (e) {
         console.error(e);
       }
@@ -60,6 +64,21 @@ const Header = () => {
     fetchNotifications();
   }, [user]);
 
+  useEffect(() => {
+    if (!user?.id) return;
+    const unsubscribe = subscribe(`user.${user.id}`, (message) => {
+      if (message.event !== "notification") return;
+      // اعلان خلاصه (count > 1) همان ردیف خوانده‌نشده قبلی است و شمارنده را بالا نمی‌برد
+      setNotifications((prev) =>
+        [message.payload, ...prev.filter((n) => n.id !== message.payload.id)].slice(0, 5)
+      );
+      if (!message.payload.read && (message.payload.count || 1) === 1) {
+        setUnreadCount((prev) => prev + 1);
+      }
+    });
+    return unsubscribe;
+  }, [user?.id]);
+
   const handleSearch = (e) => {
     e.preventDefault();
     if (searchQuery.trim()) {
@@ -110,63 +110,60 @@ const CardTable = ({ title, date, prices, unit, slideInterval = 2000 }) => {
   );
 };
 
-// Example data for each card
-const nonMetal = [
-  { type: "نایلون درجه یک", retail: 18846, wholesale: 24693 },
-  { type: "سبد در هم", retail: 12646, wholesale: 18183 },
-  { type: "فلّه کارتن", retail: 13780, wholesale: 16134 },
-  { type: "کاغذ سفید / فرم", retail: 17028, wholesale: 20359 },
-  { type: "روزنامه باطله نو", retail: 20500, wholesale: 25500 },
-  { type: "پت هاتواش، زیر ۲۰۰", retail: 48750, wholesale: 48900 },
-  { type: "پت زنده درجه یک", retail: 18789, wholesale: 20479 },
-  { type: "پت زنده درجه دو", retail: 15940, wholesale: 17249 },
-];
-const metal = [
-  { type: "آهن سوپر ویژه", retail: 17949, wholesale: 20042 },
-  { type: "آهن درجه یک", retail: 15592, wholesale: 17949 },
-  { type: "آهن درجه دو", retail: 13859, wholesale: 15846 },
-  { type: "چدن درشت بار", retail: 15140, wholesale: 17879 },
-  { type: "آلومینیوم نرم", retail: 15140, wholesale: 17879 },
-  { type: "آلومینیوم خشک", retail: 17249, wholesale: 20479 },
-  { type: "مس کابل قرمز", retail: 95987, wholesale: 112478 },
-];
-const electronic = [
-  { type: "پی سی بی اس", retail: 86650, wholesale: 96466 },
-  { type: "برد موبایل اصل", retail: 559200, wholesale: 703700 },
-  { type: "برد موبایل در هم", retail: 155000, wholesale: 203700 },
-  { type: "سی پی یو - CPU", retail: 150000, wholesale: 186467 },
-  { type: "مادر برد (دو چیپ)", retail: 80000, wholesale: 120000 },
-  { type: "برد سبز", retail: 35000, wholesale: 45000 },
-  { type: "کارتن خشک - ایرانی", retail: 25000, wholesale: 30000 },
-];
+// فاصله به‌روزرسانی تابلو؛ پاسخ سرور ETag دارد و درخواست بدون تغییر 304 می‌گیرد
+const POLL_INTERVAL = 60000;
+// سرعت چرخش ردیف‌های هر تابلو
+const SLIDE_INTERVALS = { electronic: 2000, non_metal: 5000, metal: 8000 };
 
-const NonMetalScrapPrices = () => (
-  <div className="w-full flex flex-col md:flex-row gap-4 md:gap-6 justify-center items-stretch my-4 md:my-8 px-2 md:px-0">
-    <CardTable
-      title="قیمت طلا و ارز"
-      color="bg-blue-500"
-      date="۱۴۰۴/۰۳/۰۵"
-      prices={electronic}
-      unit="تومان"
-      slideInterval={2000}
-    />
-    <CardTable
-      title="بازار ارز دیجیتال"
-      color="bg-blue-500"
-      date="۱۴۰۴/۰۳/۰۵"
-      prices={nonMetal}
-      unit="تومان"
-      slideInterval={5000}
-    />
-    <CardTable
-      title="بازار فلزات پایه"
-      color="bg-blue-500"
-      date="۱۴۰۴/۰۳/۰۵"
-      prices={metal}
-      unit="تومان"
-      slideInterval={8000}
-    />
-  </div>
-);
+const formatDate = (value) =>
+  value ? new Date(value).toLocaleDateString("fa-IR") : "";
+
+const NonMetalScrapPrices = () => {
+  const [boards, setBoards] = useState([]);
+
+  useEffect(() => {
+    let version = null;
+    const loadBoards = async () => {
+      try {
+        const { default: api } = await import("../api/index");
+        const res = await api.get("/price-board/");
+        if (res.data?.version === version) return;
+        version = res.data?.version;
+        setBoards(
+          (res.data?.boards || [])
+            .filter((board) => board.prices.length > 0)
+            .map((board) => ({
+              ...board,
+              prices: board.prices.map((p) => ({
+                type: p.name,
+                retail: Number(p.retail),
+                wholesale: Number(p.wholesale),
+              })),
+            }))
+        );
+      } catch (e) {
+        console.error(e);
+      }
+    };
+    loadBoards();
+    const interval = setInterval(loadBoards, POLL_INTERVAL);
+    return () => clearInterval(interval);
+  }, []);
+
+  return (
+    <div className="w-full flex flex-col md:flex-row gap-4 md:gap-6 justify-center items-stretch my-4 md:my-8 px-2 md:px-0">
+      {boards.map((board) => (
+        <CardTable
+          key={board.board}
+          title={board.title}
+          date={formatDate(board.updated_at)}
+          prices={board.prices}
+          unit="تومان"
+          slideInterval={SLIDE_INTERVALS[board.board] || 5000}
+        />
+      ))}
+    </div>
+  );
+};
 
 export default NonMetalScrapPrices;
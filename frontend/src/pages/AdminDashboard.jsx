@@ -109,7 +109,7 @@ const AdminDashboard = () => {
     currencies: false,
   });
   // Chart controls
-  const [chartRange, setChartRange] = useState(30); // days: 7, 30, 90
+  const [chartRange, setChartRange] = useState(30); // days: 7, 30, 90, 365
   const [showMA, setShowMA] = useState(true); // moving average overlay
   const [lastShortcutKey, setLastShortcutKey] = useState(null);
   const [shortcutTimer, setShortcutTimer] = useState(null);
@@ -168,7 +168,7 @@ const AdminDashboard = () => {
   const loadDashboardData = async () => {
     try {
       setLoading(true);
-      const data = await getAdminDashboard();
+      const data = await getAdminDashboard({ days: chartRange });
       setDashboardData(data);
       setLastUpdated(new Date());
     } catch (error) {
@@ -178,6 +178,16 @@ const AdminDashboard = () => {
     }
   };
 
+  // تغییر بازه نمودار: فقط آمار روزانه همان بازه از سرور دریافت می‌شود
+  useEffect(() => {
+    if (!dashboardData) return;
+    getAdminDashboard({ days: chartRange })
+      .then(setDashboardData)
+      .catch((error) =>
+        console.error("خطا در بارگذاری داده‌های داشبورد:", error)
+      );
+  }, [chartRange]);
+
   const loadUsers = async () => {
     setListLoading((prev) => ({ ...prev, users: true }));
     try {
@@ -295,11 +305,7 @@ const AdminDashboard = () => {
 
   const handleExportData = async (modelType) => {
     try {
-      const data = await adminExportData(modelType);
-
-      const blob = new Blob([JSON.stringify(data.data, null, 2)], {
-        type: "application/json",
-      });
+      const blob = await adminExportData(modelType);
       const url = window.URL.createObjectURL(blob);
       const a = document.createElement("a");
       a.href = url;
@@ -1061,6 +1067,7 @@ const AdminDashboard = () => {
                         { label: "۷روز", value: 7 },
                         { label: "۳۰روز", value: 30 },
                         { label: "۹۰روز", value: 90 },
+                        { label: "۳۶۵روز", value: 365 },
                       ].map((r) => (
                         <button
                           key={r.value}
@@ -1501,6 +1508,7 @@ const AdminDashboard = () => {
                     <option value="all">همه وضعیت‌ها</option>
                     <option value="active">فعال</option>
                     <option value="pending_review">در انتظار بررسی</option>
+                    <option value="scheduled">زمان‌بندی شده</option>
                     <option value="completed">تکمیل شده</option>
                     <option value="inactive">غیرفعال</option>
                   </select>
@@ -1790,6 +1798,7 @@ const AdminDashboard = () => {
                     <option value="all">همه وضعیت‌ها</option>
                     <option value="active">فعال</option>
                     <option value="pending_review">در انتظار بررسی</option>
+                    <option value="scheduled">زمان‌بندی شده</option>
                     <option value="completed">تکمیل شده</option>
                     <option value="inactive">غیرفعال</option>
                   </select>
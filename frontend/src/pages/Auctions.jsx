@@ -1,4 +1,4 @@
-import React, { useEffect, useState } from "react";
+import React, { useEffect, useRef, useState } from "react";
 import { useParams, useNavigate, useSearchParams } from "react-router-dom";
 import PersianDateTime from "../components/PersianDateTime";
 import { useTheme } from "../context/ThemeContext";
@@ -43,6 +43,7 @@ const Auctions = () => {
 
   const [searchQuery, setSearchQuery] = useState("");
   const [debouncedQuery, setDebouncedQuery] = useState("");
+  const [searchResults, setSearchResults] = useState(null);
   const [activeStatKey, setActiveStatKey] = useState(null);
   const [sortKey, setSortKey] = useState("deadline_desc");
   const [pageSize, setPageSize] = useState(6);
@@ -52,12 +53,17 @@ const Auctions = () => {
     const loadAuctions = async () => {
       try {
         const { default: api } = await import("../api/index");
-        const res = await api.get("/auctions/");
+        const res = await api.get("/auctions/", { params: { page_size: 100 } });
         const data = Array.isArray(res.data) ? res.data : res.data?.results || [];
         setAuctions(data);
         if (id) {
           const found = data.find((a) => a.id === Number(id));
-          setSelectedAuction(found || null);
+          if (found) {
+            setSelectedAuction(found);
+          } else {
+            const detail = await api.get(`/auctions/${id}/`);
+            setSelectedAuction(detail.data || null);
+          }
         }
       } catch (e) {
         console.error(e);
@@ -66,12 +72,55 @@ const Auctions = () => {
     loadAuctions();
   }, [id]);
 
+  // همگام‌سازی دوره‌ای: فقط آگهی‌های تغییرکرده از سرور دریافت و در فهرست ادغام می‌شوند
+  const syncCursor = useRef(null);
+  useEffect(() => {
+    if (syncCursor.current || auctions.length === 0) return;
+    const latest = auctions.reduce(
+      (max, a) => (a.updated_at && a.updated_at > max ? a.updated_at : max),
+      ""
+    );
+    if (latest) syncCursor.current = latest;
+  }, [auctions]);
+
+  useEffect(() => {
+    const poll = setInterval(async () => {
+      if (!syncCursor.current) return;
+      try {
+        const { default: api } = await import("../api/index");
+        const res = await api.get("/auctions/", {
+          params: { updated_since: syncCursor.current, page_size: 100 },
+        });
+        const { results = [], deleted = [], cursor } = res.data || {};
+        if (results.length || deleted.length) {
+          const removed = new Set(deleted);
+          const changed = new Map(results.map((a) => [a.id, a]));
+          setAuctions((prev) => {
+            const merged = prev
+              .filter((a) => !removed.has(a.id))
+              .map((a) => changed.get(a.id) || a);
+            const known = new Set(merged.map((a) => a.id));
+            return [...results.filter((a) => !known.has(a.id)), ...merged];
+          });
+        }
+        if (cursor) syncCursor.current = cursor;
+      } catch (e) {
+        // 410: بازه نگهداری تغییرات گذشته است؛ همگام‌سازی تا بارگذاری کامل بعدی متوقف می‌شود
+        if (e.response?.status === 410) syncCursor.current = null;
+        else console.error(e);
+      }
+    }, 30000);
+    return () => clearInterval(poll);
+  }, []);
+
   const [searchParams] = useSearchParams();
   useEffect(() => {
     const cat = searchParams.get("category");
     const kind = searchParams.get("type");
+    const search = searchParams.get("search");
     if (cat) setCategoryFilter(cat);
     if (kind) setTypeFilter(kind);
+    if (search) setSearchQuery(search);
   }, [searchParams]);
 
   useEffect(() => {
@@ -79,6 +128,31 @@ const Auctions = () => {
     return () => clearTimeout(t);
   }, [searchQuery]);
 
+  // جستجوی متنی سمت سرور (نمایه FTS با یکسان‌سازی حروف فارسی)
+  useEffect(() => {
+    const query = debouncedQuery.trim();
+    if (!query) {
+      setSearchResults(null);
+      return;
+    }
+    let cancelled = false;
+    const search = async () => {
+      try {
+        const { default: api } = await import("../api/index");
+        const res = await api.get("/auctions/search/", {
+          params: { q: query, limit: 100 },
+        });
+        if (!cancelled) setSearchResults(res.data);
+      } catch (e) {
+        console.error(e);
+      }
+    };
+    search();
+    return () => {
+      cancelled = true;
+    };
+  }, [debouncedQuery]);
+
   useEffect(() => {
     setCurrentPage(1);
   }, [debouncedQuery, filter, sortKey]);
@@ -128,8 +202,7 @@ const Auctions = () => {
     }
   };
 
-  const q = debouncedQuery.trim().toLowerCase();
-  const visibleAuctions = auctions
+  const visibleAuctions = (searchResults || auctions)
     .filter((a) => !filter || a.status === filter)
     .filter((a) => {
       const c = String(a.condition || "").toLowerCase();
@@ -138,13 +211,7 @@ const Auctions = () => {
     })
     .filter((a) =>
       !categoryFilter || String(a.category || "").toLowerCase().includes(String(categoryFilter).toLowerCase())
-    )
-    .filter((a) => {
-      const hay = [a.title, a.description, a.location, a.category, a.condition]
-        .filter(Boolean)
-        .map((v) => String(v).toLowerCase());
-      return !q || hay.some((v) => v.includes(q));
-    });
+    );
 
   const toEnglishDigits = (str) =>
     String(str)
@@ -56,10 +56,16 @@ const Dashboard = () => {
     const loadData = async () => {
       try {
         const { default: api } = await import("../api/index");
-        const res = await api.get("/profile/auctions/");
-        const created = res.data?.created_auctions || [];
-        const participated = res.data?.participated_auctions || [];
-        const won = res.data?.won_auctions || [];
+        // هر تب جداگانه و صفحه‌بندی‌شده از نمایه مشارکت خوانده می‌شود
+        const tabs = await Promise.all(
+          ["created", "participated", "won"].map((tab) =>
+            api.get("/profile/auctions/", { params: { tab, page_size: 50 } })
+          )
+        );
+        const [created, participated, won] = tabs.map((res) =>
+          (res.data?.results || []).map((item) => item.auction)
+        );
+        const counts = tabs[0].data?.counts || {};
 
         const wonIds = new Set(won.map((a) => a.id));
         const normalize = (a) => ({
@@ -85,13 +91,13 @@ const Dashboard = () => {
         setAllAuctions(auctionsData);
         setFilteredAuctions(auctionsData.slice(0, 3));
 
-        const totalWon = won.length;
+        const totalWon = counts.won ?? won.length;
         const totalSpent = won.reduce((sum, a) => sum + Number(a.current_price || a.starting_price || 0), 0);
         const activeAuctions = auctionsData.filter((a) => a.status === "active").length;
         const monthlySpending = totalSpent; // simplify for now
 
         setFinancialData({
-          totalBids: participated.length,
+          totalBids: counts.participated ?? participated.length,
           totalWon,
           totalSpent,
           activeAuctions,
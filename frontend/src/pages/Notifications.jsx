@@ -9,16 +9,37 @@ const Notifications = () => {
   const [search, setSearch] = useState("");
   const [typeFilter, setTypeFilter] = useState("all");
   const [showOnlyUnread, setShowOnlyUnread] = useState(false);
-  const [page, setPage] = useState(1);
-  const pageSize = 10;
+  // آدرس صفحه بعد (cursor) از پاسخ صفحه‌بندی‌شده سرور
+  const [nextUrl, setNextUrl] = useState(null);
+  // اعلان‌های بایگانی‌شده پس از پایان صفحه‌های اصلی؛ null یعنی همه بارگذاری شده‌اند
+  const [archiveUrl, setArchiveUrl] = useState("/notifications/archive/");
+  const pageSize = 20;
 
-  const load = async () => {
+  const load = async (url = null) => {
     setLoading(true);
     try {
       const { default: api } = await import("../api/index");
-      const res = await api.get("/notifications/");
-      const data = Array.isArray(res.data) ? res.data : [];
-      setItems(data);
+      const res = url
+        ? await api.get(url)
+        : await api.get("/notifications/", { params: { page_size: pageSize } });
+      const data = res.data?.results || [];
+      setItems((prev) => (url ? [...prev, ...data] : data));
+      setNextUrl(res.data?.next || null);
+      if (!url) setArchiveUrl("/notifications/archive/");
+    } catch (e) {
+      console.error(e);
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  const loadArchive = async () => {
+    setLoading(true);
+    try {
+      const { default: api } = await import("../api/index");
+      const res = await api.get(archiveUrl);
+      setItems((prev) => [...prev, ...(res.data?.results || [])]);
+      setArchiveUrl(res.data?.next || null);
     } catch (e) {
       console.error(e);
     } finally {
@@ -63,9 +84,6 @@ const Notifications = () => {
     return data;
   }, [items, typeFilter, showOnlyUnread, search]);
 
-  const totalPages = Math.max(1, Math.ceil(filtered.length / pageSize));
-  const currentPageItems = filtered.slice((page - 1) * pageSize, page * pageSize);
-
   const markRead = async (id) => {
     try {
       const { default: api } = await import("../api/index");
@@ -77,11 +95,13 @@ const Notifications = () => {
   };
 
   const markAllRead = async () => {
-    const unread = items.filter((n) => !n.read).map((n) => n.id);
+    if (items.length === 0) return;
+    // یک درخواست برای همه اعلان‌ها تا جدیدترین اعلان نمایش‌داده‌شده
+    const upToId = Math.max(...items.map((n) => n.id));
     try {
       const { default: api } = await import("../api/index");
-      await Promise.all(unread.map((id) => api.post(`/notifications/${id}/mark-read/`)));
-      setItems((prev) => prev.map((n) => ({ ...n, read: true })));
+      await api.post("/notifications/mark-read/", { up_to_id: upToId });
+      setItems((prev) => prev.map((n) => (n.id <= upToId ? { ...n, read: true } : n)));
     } catch (e) {
       console.error(e);
     }
@@ -160,7 +180,7 @@ const Notifications = () => {
             <span className={`${isDarkMode ? "text-white" : "text-gray-900"}`}>در حال بارگذاری...</span>
           </div>
         )}
-        {!loading && currentPageItems.length === 0 && (
+        {!loading && filtered.length === 0 && (
           <div className="p-6 text-center">
             <div className="flex flex-col items-center gap-2">
               <FaInbox className={`${isDarkMode ? "text-white" : "text-gray-600"}`} />
@@ -169,13 +189,13 @@ const Notifications = () => {
           </div>
         )}
         <ul className="divide-y divide-gray-200">
-          {currentPageItems.map((n) => (
+          {filtered.map((n) => (
             <li key={n.id} className={`p-4 flex items-start gap-3 ${isDarkMode ? "hover:bg-white/5" : "hover:bg-gray-50"}`}>
               <div className={`mt-1 w-2 h-2 rounded-full ${n.read ? "bg-gray-300" : "bg-red-500"}`} />
               <div className="flex-1">
                 <div className="flex items-center justify-between">
                   <div className={`${isDarkMode ? "text-white" : "text-gray-900"} text-sm font-semibold`}>{types.find((t) => t.value === n.type)?.label || n.type}</div>
-                  <div className={`${isDarkMode ? "text-gray-400" : "text-gray-500"} text-xs`}>{n.created_at ? new Date(n.created_at).toLocaleString("fa-IR") : ""}</div>
+                  <div className={`${isDarkMode ? "text-gray-400" : "text-gray-500"} text-xs`}>{(n.last_event_at || n.created_at) ? new Date(n.last_event_at || n.created_at).toLocaleString("fa-IR") : ""}</div>
                 </div>
                 <div className={`${isDarkMode ? "text-gray-300" : "text-gray-700"} text-sm mt-1`}>{n.message}</div>
               </div>
@@ -190,25 +210,17 @@ const Notifications = () => {
             </li>
           ))}
         </ul>
-        <div className="flex items-center justify-between p-4">
-          <span className={`${isDarkMode ? "text-gray-300" : "text-gray-700"} text-xs`}>صفحه {page} از {totalPages}</span>
-          <div className="flex items-center gap-2">
+        {(nextUrl || archiveUrl) && (
+          <div className="flex items-center justify-center p-4">
             <button
-              onClick={() => setPage((p) => Math.max(1, p - 1))}
-              disabled={page === 1}
+              onClick={() => (nextUrl ? load(nextUrl) : loadArchive())}
+              disabled={loading}
               className={`px-3 py-1 rounded text-xs disabled:opacity-50 ${isDarkMode ? "bg-white/10 text-white" : "bg-gray-200 text-gray-800"}`}
             >
-              قبل
-            </button>
-            <button
-              onClick={() => setPage((p) => Math.min(totalPages, p + 1))}
-              disabled={page === totalPages}
-              className={`px-3 py-1 rounded text-xs disabled:opacity-50 ${isDarkMode ? "bg-white/10 text-white" : "bg-gray-200 text-gray-800"}`}
-            >
-              بعد
+              {nextUrl ? "نمایش اعلان‌های قدیمی‌تر" : "نمایش اعلان‌های بایگانی‌شده"}
             </button>
           </div>
-        </div>
+        )}
       </div>
     </div>
   );
@@ -16,6 +16,8 @@ const statusFa = (s) => {
       return "لغو شده";
     case "pending_review":
       return "در حال بررسی";
+    case "scheduled":
+      return "زمان‌بندی شده";
     case "rejected":
       return "رد شده";
     default:
@@ -100,9 +102,8 @@ const Trend = () => {
     const loadTenders = async () => {
       try {
         const { default: api } = await import("../api/index");
-        const res = await api.get("/auctions/");
-        const data = Array.isArray(res.data) ? res.data : res.data?.results || [];
-        const tenders = data.filter((a) => String(a.condition || "").toLowerCase() === "tender");
+        const res = await api.get("/auctions/", { params: { type: "tender", page_size: 100 } });
+        const tenders = Array.isArray(res.data) ? res.data : res.data?.results || [];
         const mapped = tenders.map((a) => ({
           id: a.id,
           title: a.title,